@@ -1,7 +1,39 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import datetime
 from typing import List, Dict, Any
+from market_classifier import KeywordMatcher, first_label
+
+# Keyword groups for the sports filter and get_sport_category, matched in a single scan
+SPORT_KEYWORD_GROUPS = {
+    "sports": [
+        # Basketball terms
+        "nba", "basketball", "lakers", "celtics", "warriors", "knicks", "bulls",
+        
+        # Baseball terms
+        "mlb", "baseball", "yankees", "dodgers", "red sox", 
+        
+        # Football terms 
+        "nfl", "football", "chiefs", "eagles", "cowboys", "super bowl",
+        
+        # Soccer terms
+        "soccer", "premier league", "uefa", "champions league", "fifa", "world cup",
+        
+        # Other sports
+        "tennis", "golf", "boxing", "ufc", "mma", "hockey", "nhl", "olympics"
+    ],
+    "Basketball": ["nba", "basketball"],
+    "Baseball": ["mlb", "baseball"],
+    "Football": ["nfl", "football", "super bowl"],
+    "Soccer": ["soccer", "premier league", "fifa", "uefa", "manchester", "liverpool"],
+    "Tennis": ["tennis", "atp", "wta"],
+    "Combat Sports": ["ufc", "mma", "boxing", "fight"],
+    "Hockey": ["nhl", "hockey"],
+    "Golf": ["golf", "pga"],
+    "soccer_mention": ["soccer"],
+}
+SPORT_CATEGORY_ORDER = ["Basketball", "Baseball", "Football", "Soccer", "Tennis", "Combat Sports", "Hockey", "Golf"]
+SPORT_MATCHER = KeywordMatcher(SPORT_KEYWORD_GROUPS)
 
 def get_sports_markets() -> List[Dict[str, Any]]:
     """
@@ -18,14 +50,9 @@ def get_sports_markets() -> List[Dict[str, Any]]:
         "active": True  # Get active markets
     }
     
-    # Request headers
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
-    
     try:
         # Make API request
-        response = requests.get(url, params=params, headers=headers)
+        response = http_client.get(url, params=params)
         
         # Check response status
         if response.status_code != 200:
@@ -44,23 +71,6 @@ def get_sports_markets() -> List[Dict[str, Any]]:
         
         # Filter for sports-related markets
         sports_markets = []
-        sports_terms = [
-            # Basketball terms
-            "nba", "basketball", "lakers", "celtics", "warriors", "knicks", "bulls",
-            
-            # Baseball terms
-            "mlb", "baseball", "yankees", "dodgers", "red sox", 
-            
-            # Football terms 
-            "nfl", "football", "chiefs", "eagles", "cowboys", "super bowl",
-            
-            # Soccer terms
-            "soccer", "premier league", "uefa", "champions league", "fifa", "world cup",
-            
-            # Other sports
-            "tennis", "golf", "boxing", "ufc", "mma", "hockey", "nhl", "olympics"
-        ]
-        
         for market in markets:
             question = market.get("question", "").lower()
             description = market.get("description", "").lower()
@@ -70,7 +80,7 @@ def get_sports_markets() -> List[Dict[str, Any]]:
             market_text = f"{question} {description} {category}"
             
             # Check if any sports term is in the market text
-            if any(term in market_text for term in sports_terms):
+            if "sports" in SPORT_MATCHER.scan(market_text):
                 sports_markets.append(market)
         
         print(f"Found {len(sports_markets)} sports-related markets")
@@ -82,26 +92,13 @@ def get_sports_markets() -> List[Dict[str, Any]]:
 
 def get_sport_category(market_text: str) -> str:
     """Classify market into sport category"""
-    market_text = market_text.lower()
+    hits = SPORT_MATCHER.scan(market_text.lower())
     
-    if any(x in market_text for x in ["nba", "basketball"]):
-        return "Basketball"
-    elif any(x in market_text for x in ["mlb", "baseball"]):
-        return "Baseball"
-    elif any(x in market_text for x in ["nfl", "football", "super bowl"]) and "soccer" not in market_text:
-        return "Football"
-    elif any(x in market_text for x in ["soccer", "premier league", "fifa", "uefa", "manchester", "liverpool"]):
-        return "Soccer"
-    elif any(x in market_text for x in ["tennis", "atp", "wta"]):
-        return "Tennis"
-    elif any(x in market_text for x in ["ufc", "mma", "boxing", "fight"]):
-        return "Combat Sports"
-    elif any(x in market_text for x in ["nhl", "hockey"]):
-        return "Hockey"
-    elif any(x in market_text for x in ["golf", "pga"]):
-        return "Golf"
+    # Football keywords only count when the market is not about soccer
+    if "soccer_mention" in hits:
+        hits = hits - {"Football"}
     
-    return "Other Sports"
+    return first_label(hits, SPORT_CATEGORY_ORDER, "Other Sports")
 
 def format_date(date_str: str) -> str:
     """Format ISO date string to readable format"""
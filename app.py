@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 import logging
+from data_cache import RefreshingCache
+from http_caching import init_http_caching
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +30,7 @@ if missing_vars:
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv("FLASK_SECRET_KEY", "default-dev-key")
+init_http_caching(app)
 
 # Initialize OpenAI client
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -124,10 +127,15 @@ Be extremely precise and thorough in your search."""
         'current_year': datetime.now().year
     }
 
+# Market payload shared by every request; rebuilt in the background once it is
+# older than MARKET_DATA_TTL seconds while the previous payload keeps being served
+MARKET_DATA_TTL = float(os.getenv("MARKET_DATA_TTL", "300"))
+market_data_cache = RefreshingCache(get_market_data, ttl=MARKET_DATA_TTL, name="market data")
+
 @app.route('/')
 def home():
     # Get market data
-    data = get_market_data()
+    data = market_data_cache.get()
     
     # Render the template with data
     return render_template('index.html', **data)
@@ -135,7 +143,7 @@ def home():
 @app.route('/api/markets')
 def api_markets():
     """API endpoint to get market data as JSON"""
-    data = get_market_data()
+    data = market_data_cache.get()
     return jsonify(data)
 
 @app.route('/setup')
@@ -163,5 +171,8 @@ if __name__ == '__main__':
         print("\nStarting the app anyway, but some features may not work properly.")
     
     print("Starting PollyPicks Flask app...")
+    # Load in the serving process only, not in the debug reloader's watcher
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        market_data_cache.warm()
     print("Visit http://127.0.0.1:5001 in your browser")
     app.run(debug=True, port=5001) 
\ No newline at end of file
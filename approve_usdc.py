@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import json
 import os
 from dotenv import load_dotenv
 from web3 import Web3
 from eth_account import Account
+from multicall import read_balance_and_allowance, web3_transport
+from nonce_manager import nonce_manager_for
+from tx_tracker import TxTracker, rpc_batch, print_outcome
+from gas_fees import GasOracle
 
 # Load environment variables
 load_dotenv()
@@ -34,7 +38,7 @@ def approve_usdc_spending():
     
     # Connect to Polygon network
     rpc_url = "https://polygon-rpc.com"
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = Web3(Web3.HTTPProvider(rpc_url, session=http_client.get_session(rpc_url)))
     
     if not w3.is_connected():
         print("Failed to connect to Polygon network")
@@ -88,17 +92,13 @@ def approve_usdc_spending():
         # Create contract instance
         usdc_contract = w3.eth.contract(address=usdc_contract_address, abi=usdc_abi)
         
-        # Check USDC balance
-        balance = usdc_contract.functions.balanceOf(wallet_address).call()
+        # Check USDC balance and current allowance in one Multicall3 eth_call
+        reads = read_balance_and_allowance(web3_transport(w3), usdc_contract_address, wallet_address, polymarket_exchange)
+        balance, current_allowance = reads.values
         balance_usdc = balance / 10**6  # USDC has 6 decimals
         
-        print(f"USDC balance: {balance_usdc} USDC")
+        print(f"USDC balance: {balance_usdc} USDC (block {reads.block_number})")
         
-        # Check current allowance
-        current_allowance = usdc_contract.functions.allowance(
-            wallet_address, 
-            polymarket_exchange
-        ).call()
         current_allowance_usdc = current_allowance / 10**6
         
         print(f"Current Polymarket allowance: {current_allowance_usdc} USDC")
@@ -125,31 +125,36 @@ def approve_usdc_spending():
         max_uint256 = 2**256 - 1
         
         # Build approval transaction
-        approve_txn = usdc_contract.functions.approve(
-            polymarket_exchange,
-            max_uint256
-        ).build_transaction({
+        approve_txn = {
             'from': wallet_address,
-            'gas': 100000,  # Gas limit
-            'gasPrice': w3.to_wei('50', 'gwei'),  # Gas price in gwei
-            'nonce': w3.eth.get_transaction_count(wallet_address),
-        })
+            'to': usdc_contract_address,
+            'data': usdc_contract.encode_abi("approve", args=[polymarket_exchange, max_uint256]),
+            'value': 0,
+        }
         
-        # Sign and send transaction
-        signed_txn = w3.eth.account.sign_transaction(approve_txn, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        # Gas limit from an estimate plus margin, EIP-1559 fees from recent fee history
+        gas_oracle = GasOracle(rpc_batch(rpc_url))
+        approve_txn, gas_estimate, fee_quote = gas_oracle.fill_transaction(approve_txn)
+        print(gas_oracle.describe(fee_quote, gas_estimate))
+        
+        # Sign and send transaction; the nonce comes from the wallet's local counter
+        tx_hash = nonce_manager_for(w3, wallet_address).send_transaction(approve_txn, private_key)
+        gas_oracle.report.record(tx_hash, gas_estimate, fee_quote)
         
         print(f"Approval transaction sent! Transaction hash: {tx_hash.hex()}")
         print(f"View on PolygonScan: https://polygonscan.com/tx/{tx_hash.hex()}")
         
         # Wait for transaction to be mined
         print("\nWaiting for transaction to be confirmed...")
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        outcome = TxTracker(rpc_batch(rpc_url)).track(tx_hash).result()
+        gas_oracle.report.observe(outcome)
         
-        if tx_receipt['status'] == 1:
+        if outcome.status == "confirmed":
             print("✅ Transaction confirmed! You can now place bets on Polymarket.")
-        else:
+        elif outcome.status == "failed":
             print("❌ Transaction failed. Please check PolygonScan for details.")
+        else:
+            print_outcome(outcome)
         
     except Exception as e:
         print(f"Error: {str(e)}")
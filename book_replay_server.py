@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional, Set
+import websockets
+from book_stream import BookStream
+
+REPLAY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book_stream_sample.jsonl")
+REPLAY_INTERVAL = 0.05  # Seconds between replayed messages
+
+def load_recording(path: str = REPLAY_FILE) -> List[str]:
+    """Load a recording: one raw market-channel message per line"""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+def _filter_events(raw: str, assets: Set[str]) -> Optional[str]:
+    """Keep only the events (and price changes) for subscribed assets"""
+    payload = json.loads(raw)
+    events = payload if isinstance(payload, list) else [payload]
+    kept = []
+
+    for event in events:
+        if "price_changes" in event:
+            changes = [change for change in event["price_changes"] if str(change.get("asset_id")) in assets]
+            if changes:
+                kept.append(dict(event, price_changes=changes))
+        elif str(event.get("asset_id")) in assets:
+            kept.append(event)
+
+    if not kept:
+        return None
+    return json.dumps(kept if isinstance(payload, list) else kept[0])
+
+def _recorded_snapshots(messages: List[str], assets: Set[str]) -> List[str]:
+    """First recorded book snapshot of each asset"""
+    snapshots = {}
+    for raw in messages:
+        payload = json.loads(raw)
+        for event in payload if isinstance(payload, list) else [payload]:
+            asset_id = str(event.get("asset_id"))
+            if event.get("event_type") == "book" and asset_id in assets and asset_id not in snapshots:
+                snapshots[asset_id] = json.dumps(event)
+    return list(snapshots.values())
+
+class ReplayServer:
+    """
+    Local stand-in for the CLOB market channel
+
+    Every connection waits for a subscribe message, then replays the recorded
+    messages for the subscribed assets in order, answers PING with PONG, and
+    stays open. Assets subscribed later get their first recorded snapshot
+    straight away, then the rest of the replay. With ``drop_after`` set, the first connection is closed after
+    that many messages so a client's reconnect and resubscribe can be tested;
+    later connections replay the whole recording from its first snapshot.
+    """
+
+    def __init__(
+        self,
+        messages: List[str],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        interval: float = REPLAY_INTERVAL,
+        drop_after: Optional[int] = None
+    ):
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.drop_after = drop_after
+        self.connections = 0
+
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handler(self, socket: Any) -> None:
+        self.connections += 1
+        drop_after = self.drop_after if self.connections == 1 else None
+
+        subscribe = json.loads(await socket.recv())
+        assets = {str(asset) for asset in subscribe.get("assets_ids", [])}
+
+        async def answer_pings() -> None:
+            async for message in socket:
+                if message == "PING":
+                    await socket.send("PONG")
+                else:
+                    # Dynamic subscribe: answer with the recorded snapshots of the new assets
+                    request = json.loads(message)
+                    added = {str(asset) for asset in request.get("assets_ids", [])} - assets
+                    assets.update(added)
+                    for snapshot in _recorded_snapshots(self.messages, added):
+                        await socket.send(snapshot)
+
+        responder = asyncio.ensure_future(answer_pings())
+        try:
+            sent = 0
+            for raw in self.messages:
+                message = _filter_events(raw, assets)
+                if message is None:
+                    continue
+                if drop_after is not None and sent >= drop_after:
+                    await socket.close()
+                    return
+                await socket.send(message)
+                sent += 1
+                await asyncio.sleep(self.interval)
+
+            await responder
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            responder.cancel()
+
+    async def _serve(self, started: threading.Event) -> None:
+        self._stop = asyncio.Event()
+        async with websockets.serve(self._handler, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            started.set()
+            await self._stop.wait()
+
+    def start(self) -> "ReplayServer":
+        """Serve in a background thread; ``url`` is valid once this returns"""
+        started = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._serve(started))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="book-replay", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(5)
+        self._thread = None
+
+def recorded_assets(messages: List[str]) -> List[str]:
+    """Asset IDs that have a book snapshot in the recording"""
+    assets: Dict[str, None] = {}
+    for raw in messages:
+        payload = json.loads(raw)
+        for event in payload if isinstance(payload, list) else [payload]:
+            if event.get("event_type") == "book":
+                assets[str(event["asset_id"])] = None
+    return list(assets)
+
+def check_replay(path: str = REPLAY_FILE, drop_after: int = 3) -> bool:
+    """
+    Stream a recording through BookStream against the replay server, offline
+
+    The first connection is dropped part-way through, so the stream has to
+    reconnect and resubscribe. The live books must then match the books built
+    by applying the recording directly.
+    """
+    messages = load_recording(path)
+    token_ids = recorded_assets(messages)
+
+    expected = BookStream(token_ids)
+    for raw in messages:
+        expected.handle_message(raw)
+
+    server = ReplayServer(messages, interval=0.01, drop_after=drop_after).start()
+    stream = BookStream(token_ids, url=server.url, reconnect_delay=0.1)
+
+    def books_match() -> bool:
+        for token_id in token_ids:
+            live = stream.latest_book(token_id)
+            if live is None or live.to_json() != expected.latest_book(token_id).to_json():
+                return False
+        return True
+
+    matches = False
+    try:
+        stream.start()
+        deadline = time.monotonic() + 10
+        # The reconnect replays the recording from its first snapshot
+        while time.monotonic() < deadline:
+            if stream.connections >= 2 and books_match():
+                matches = True
+                break
+            time.sleep(0.05)
+    finally:
+        stream.stop()
+        server.stop()
+
+    print(f"Replayed {len(messages)} messages for {len(token_ids)} tokens over {stream.connections} connections")
+    for token_id in token_ids:
+        book = stream.latest_book(token_id)
+        if book is not None:
+            print(f"  {token_id[:10]}...{token_id[-10:]}: bid {book.best_bid} / ask {book.best_ask} "
+                  f"({len(book.bids)} bid levels, {len(book.asks)} ask levels)")
+    print("Books match the recording" if matches else "Books DO NOT match the recording")
+    return matches
+
+def main() -> None:
+    """
+    Usage:
+        python book_replay_server.py [--port 8765] [--drop-after N] [recording.jsonl]
+        python book_replay_server.py --check [recording.jsonl]
+    """
+    import sys
+
+    args = sys.argv[1:]
+
+    def option(name: str, default: Optional[str]) -> Optional[str]:
+        if name in args:
+            position = args.index(name)
+            value = args[position + 1]
+            del args[position:position + 2]
+            return value
+        return default
+
+    port = int(option("--port", "8765"))
+    drop_after = option("--drop-after", None)
+
+    if "--check" in args:
+        args.remove("--check")
+        sys.exit(0 if check_replay(args[0] if args else REPLAY_FILE) else 1)
+
+    path = args[0] if args else REPLAY_FILE
+    server = ReplayServer(
+        load_recording(path),
+        port=port,
+        drop_after=int(drop_after) if drop_after is not None else None
+    ).start()
+    print(f"Replaying {path} on {server.url} (Ctrl+C to stop)")
+    print(f"Try: python book_stream.py --url {server.url} {' '.join(recorded_assets(server.messages))}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Any, Optional, Iterable
+import websockets
+from order_book import OrderBook
+
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+PING_INTERVAL = 10  # Seconds between keep-alive PINGs; the server drops idle sockets
+RECONNECT_DELAY = 1  # Initial reconnect back-off in seconds, doubled per failure
+MAX_RECONNECT_DELAY = 30
+
+class BookStream:
+    """
+    Live order books for a set of tokens from the CLOB market channel
+
+    A background thread runs an asyncio loop that holds one WebSocket
+    connection, subscribes to the tokens, and applies ``book`` snapshots and
+    ``price_change`` deltas to in-memory OrderBooks. When the connection drops
+    it reconnects with back-off and subscribes again; the server answers with
+    fresh snapshots, which replace the books. Deltas missed while disconnected
+    would leave the old books wrong, so they are dropped on disconnect and
+    ``latest_book`` returns None until the new snapshot arrives.
+
+    ``latest_book`` returns a copy of the current book without touching the
+    network, so it can be called from any thread as often as needed.
+
+    Example:
+        with BookStream(token_ids) as stream:
+            stream.wait_for_books(timeout=10)
+            book = stream.latest_book(token_ids[0])
+    """
+
+    def __init__(
+        self,
+        token_ids: Iterable[str],
+        url: str = MARKET_WS_URL,
+        reconnect_delay: float = RECONNECT_DELAY
+    ):
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self._token_ids = list(dict.fromkeys(str(token_id) for token_id in token_ids))
+        self._books: Dict[str, OrderBook] = {}
+        self._lock = threading.Lock()
+        self._books_changed = threading.Condition(self._lock)
+
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._socket = None
+
+        self.connections = 0  # Successful connects, including reconnects
+        self.messages = 0  # Book events applied
+
+    def start(self) -> "BookStream":
+        """Start the background connection thread"""
+        if self._thread is not None:
+            return self
+
+        started = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._stop = asyncio.Event()
+            started.set()
+            try:
+                self._loop.run_until_complete(self._run())
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="book-stream", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self, timeout: float = 5) -> None:
+        """Close the connection and wait for the background thread to exit"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self) -> "BookStream":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def subscribe(self, token_ids: Iterable[str]) -> None:
+        """Add tokens to the stream; they are also sent again after every reconnect"""
+        # The stream thread reads the token list on every reconnect, so change it under the lock
+        with self._lock:
+            new_ids = [str(token_id) for token_id in dict.fromkeys(token_ids) if str(token_id) not in self._token_ids]
+            if not new_ids:
+                return
+            self._token_ids = self._token_ids + new_ids
+            connected = self._loop is not None and self._socket is not None
+
+        if connected:
+            message = json.dumps({"assets_ids": new_ids, "operation": "subscribe"})
+            asyncio.run_coroutine_threadsafe(self._send(message), self._loop)
+
+    def latest_book(self, token_id: str) -> Optional[OrderBook]:
+        """Copy of the current book for a token, or None before its first snapshot"""
+        with self._lock:
+            book = self._books.get(str(token_id))
+            return book.snapshot() if book is not None else None
+
+    def wait_for_books(self, token_ids: Optional[Iterable[str]] = None, timeout: float = 10) -> bool:
+        """
+        Block until every token (default: all subscribed tokens) has a snapshot
+
+        Returns:
+            True if all books arrived before the timeout
+        """
+        deadline = time.monotonic() + timeout
+
+        with self._books_changed:
+            wanted = [str(token_id) for token_id in (token_ids or self._token_ids)]
+            while not all(token_id in self._books for token_id in wanted):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._books_changed.wait(remaining)
+        return True
+
+    def handle_message(self, raw: str) -> None:
+        """
+        Apply one raw market-channel message to the books
+
+        Messages are a single event or a list of events. ``book`` events
+        replace a token's book; ``price_change`` events update levels of a
+        book that already has a snapshot. Other events are ignored.
+        """
+        if raw == "PONG":
+            return
+
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            print(f"Ignoring non-JSON market message: {raw[:80]}")
+            return
+
+        events = payload if isinstance(payload, list) else [payload]
+
+        with self._books_changed:
+            for event in events:
+                if not isinstance(event, dict):
+                    continue
+                event_type = event.get("event_type")
+
+                if event_type == "book":
+                    self._apply_snapshot(event)
+                elif event_type == "price_change":
+                    self._apply_price_change(event)
+                else:
+                    continue
+
+                self.messages += 1
+
+            self._books_changed.notify_all()
+
+    def _apply_snapshot(self, event: Dict[str, Any]) -> None:
+        data = dict(event)
+        # Older channel versions name the sides buys/sells
+        data.setdefault("bids", event.get("buys"))
+        data.setdefault("asks", event.get("sells"))
+
+        book = OrderBook.from_json(data)
+        if book.asset_id:
+            self._books[book.asset_id] = book
+
+    def _apply_price_change(self, event: Dict[str, Any]) -> None:
+        # Current format: one event with a price_changes list, each carrying its asset_id;
+        # older format: one asset_id per event with a changes list
+        changes = event.get("price_changes")
+        if changes is None:
+            changes = [dict(change, asset_id=event.get("asset_id")) for change in event.get("changes", [])]
+
+        for change in changes:
+            book = self._books.get(str(change.get("asset_id")))
+            if book is None:
+                continue  # No snapshot yet; the snapshot will include this change
+            try:
+                book.update_level(change["side"], change["price"], change["size"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if event.get("timestamp"):
+                book.timestamp = event["timestamp"]
+            if change.get("hash") or event.get("hash"):
+                book.hash = change.get("hash") or event.get("hash")
+
+    async def _send(self, message: str) -> None:
+        if self._socket is not None:
+            await self._socket.send(message)
+
+    async def _keepalive(self, socket: Any) -> None:
+        try:
+            while True:
+                await asyncio.sleep(PING_INTERVAL)
+                await socket.send("PING")
+        except websockets.exceptions.ConnectionClosed:
+            return  # The receive loop notices the closed socket and reconnects
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self.url, ping_interval=None) as socket:
+                    # Tokens subscribed from now on are sent on this socket; the rest go in the first message
+                    with self._lock:
+                        self._socket = socket
+                        token_ids = list(self._token_ids)
+                    self.connections += 1
+                    delay = self.reconnect_delay
+
+                    await socket.send(json.dumps({"assets_ids": token_ids, "type": "market"}))
+                    keepalive = asyncio.ensure_future(self._keepalive(socket))
+                    stopping = asyncio.ensure_future(self._stop.wait())
+
+                    try:
+                        while not self._stop.is_set():
+                            receiving = asyncio.ensure_future(socket.recv())
+                            done, _ = await asyncio.wait(
+                                [receiving, stopping], return_when=asyncio.FIRST_COMPLETED
+                            )
+                            if receiving not in done:
+                                receiving.cancel()
+                                break
+                            self.handle_message(receiving.result())
+                    finally:
+                        keepalive.cancel()
+                        stopping.cancel()
+                        with self._books_changed:
+                            self._socket = None
+                            # Keep the last books after a deliberate stop; otherwise wait for fresh snapshots
+                            if not self._stop.is_set():
+                                self._books.clear()
+
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                if self._stop.is_set():
+                    break
+                print(f"Market channel disconnected ({e}); reconnecting in {delay}s")
+
+            if self._stop.is_set():
+                break
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+def main() -> None:
+    """
+    Stream books for token IDs given on the command line and print the top of book
+
+    Usage: python book_stream.py [--url ws://localhost:8765] TOKEN_ID [TOKEN_ID ...]
+    """
+    import sys
+
+    args = sys.argv[1:]
+    url = MARKET_WS_URL
+    if "--url" in args:
+        position = args.index("--url")
+        url = args[position + 1]
+        del args[position:position + 2]
+
+    if not args:
+        print(main.__doc__)
+        return
+
+    with BookStream(args, url=url) as stream:
+        if not stream.wait_for_books(timeout=15):
+            print("Timed out waiting for book snapshots")
+
+        try:
+            while True:
+                for token_id in args:
+                    book = stream.latest_book(token_id)
+                    token_short = f"{token_id[:10]}...{token_id[-10:]}" if len(token_id) > 20 else token_id
+                    if book is None:
+                        print(f"{token_short}: no book yet")
+                    else:
+                        print(f"{token_short}: bid {book.best_bid} / ask {book.best_ask}")
+                print("-" * 50)
+                time.sleep(2)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,15 @@ import openai
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
+from llm_cache import ResponseCache, make_backend, cache_flag, print_cache_status
+from llm_batch import run_batch, batch_queries, LLM_CONCURRENCY
 
 # Load environment variables
 load_dotenv()
 
 # Initialize OpenAI client
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+response_cache = ResponseCache(client, make_backend())
 
 def search_polymarket_markets_ending_tomorrow():
     """
@@ -24,7 +27,7 @@ def search_polymarket_markets_ending_tomorrow():
         print("=" * 80)
         
         # Create a response with web search enabled
-        response = client.responses.create(
+        response, cached = response_cache.create(
             model="gpt-4.1",
             tools=[{
                 "type": "web_search_preview",
@@ -55,6 +58,7 @@ def search_polymarket_markets_ending_tomorrow():
             
             Please search thoroughly on Polymarket.com and provide the most current information available."""
         )
+        print_cache_status("Markets ending tomorrow", cached)
         
         # Display the results
         print(f"\n🎯 POLYMARKET MARKETS ENDING TOMORROW ({tomorrow})")
@@ -97,22 +101,17 @@ def search_polymarket_markets_ending_tomorrow():
         print("3. Check your OpenAI usage limits and billing")
         print("4. Verify internet connection for web search")
 
-def search_specific_polymarket_category(category):
+def category_request(category, tomorrow):
     """
-    Search for a specific category of Polymarket markets ending tomorrow
+    Build the responses.create arguments for a category search
     """
-    try:
-        tomorrow = (datetime.now() + timedelta(days=1)).strftime('%B %d, %Y')
-        
-        print(f"🎯 Searching for {category} markets ending tomorrow ({tomorrow})...")
-        
-        response = client.responses.create(
-            model="gpt-4.1",
-            tools=[{
-                "type": "web_search_preview",
-                "search_context_size": "high"
-            }],
-            input=f"""Search Polymarket.com specifically for {category} prediction markets that end tomorrow ({tomorrow}).
+    return {
+        "model": "gpt-4.1",
+        "tools": [{
+            "type": "web_search_preview",
+            "search_context_size": "high"
+        }],
+        "input": f"""Search Polymarket.com specifically for {category} prediction markets that end tomorrow ({tomorrow}).
             
             Provide detailed information including:
             - Current odds and probabilities
@@ -120,25 +119,69 @@ def search_specific_polymarket_category(category):
             - Recent price movements
             - Key factors affecting the market
             - Analysis of potential outcomes"""
-        )
+    }
+
+def print_category_results(category, response):
+    """
+    Print the text of a category search response
+    """
+    print(f"\n📊 {category.upper()} MARKETS ENDING TOMORROW")
+    print("=" * 60)
+    
+    for item in response.output:
+        if item.type == "message":
+            for content in item.content:
+                if content.type == "output_text":
+                    print(content.text)
+
+def search_specific_polymarket_category(category):
+    """
+    Search for a specific category of Polymarket markets ending tomorrow
+    """
+    try:
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime('%B %d, %Y')
         
-        print(f"\n📊 {category.upper()} MARKETS ENDING TOMORROW")
-        print("=" * 60)
+        print(f"🎯 Searching for {category} markets ending tomorrow ({tomorrow})...")
         
-        for item in response.output:
-            if item.type == "message":
-                for content in item.content:
-                    if content.type == "output_text":
-                        print(content.text)
+        response, cached = response_cache.create(**category_request(category, tomorrow))
+        print_cache_status(f"{category} markets", cached)
+        
+        print_category_results(category, response)
         
     except Exception as e:
         print(f"❌ Error searching for {category} markets: {str(e)}")
 
+def search_categories_batch(categories):
+    """
+    Search several categories concurrently, printing each as soon as it completes
+    """
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime('%B %d, %Y')
+    print(f"🎯 Searching {len(categories)} categories ending tomorrow ({tomorrow}), "
+          f"up to {LLM_CONCURRENCY} at a time...")
+    
+    def on_result(category, response, cached, error):
+        if error is not None:
+            print(f"❌ Error searching for {category} markets: {str(error)}")
+            return
+        print_cache_status(f"{category} markets", cached)
+        print_category_results(category, response)
+    
+    requests = [(category, category_request(category, tomorrow)) for category in categories]
+    run_batch(requests, on_result, cache=response_cache)
+
 if __name__ == "__main__":
     # Check for command line arguments for specific categories
     import sys
     
-    if len(sys.argv) > 1:
+    # --no-cache always calls OpenAI; --memory-cache keeps responses for this run only
+    response_cache.backend = cache_flag(sys.argv)
+    
+    # --batch "crypto, weather, NBA" searches every category concurrently
+    categories = batch_queries(sys.argv[1:])
+    
+    if categories is not None:
+        search_categories_batch(categories)
+    elif len(sys.argv) > 1:
         # Search for specific category
         category = " ".join(sys.argv[1:])
         search_specific_polymarket_category(category)
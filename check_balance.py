@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import os
 from dotenv import load_dotenv
 from eth_account import Account
@@ -41,7 +41,7 @@ def check_wallet_balance():
             "tag": "latest"
         }
         
-        response = requests.get(polygon_api_url, params=params)
+        response = http_client.get(polygon_api_url, params=params)
         data = response.json()
         
         if data.get("status") == "1":
@@ -66,7 +66,7 @@ def check_wallet_balance():
             "tag": "latest"
         }
         
-        response = requests.get(polygon_api_url, params=params)
+        response = http_client.get(polygon_api_url, params=params)
         data = response.json()
         
         if data.get("status") == "1":
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
-import requests
-import json
 import os
 from dotenv import load_dotenv
 from eth_account import Account
+from wallet_state import read_wallet_state, USDC_CONTRACTS
 
 # Load environment variables
 load_dotenv()
@@ -29,62 +28,30 @@ def check_usdc_balance():
         print(f"Error getting wallet address: {e}")
         return
     
-    # Multiple USDC contract addresses on Polygon
-    usdc_contracts = {
-        "USDC (PoS)": "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",  # Most common
-        "USDC.e (Bridged)": "0xA0b86a33E6441c8C4D86Fc4DebFd8B4cE3d80b7B",  # Bridged from Ethereum
-        "Native USDC": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"   # Native Circle USDC
-    }
-    
-    # Polygon RPC URL
-    rpc_url = "https://polygon-rpc.com"
+    # Balances, allowances and MATIC for every USDC contract in one batch request
+    try:
+        snapshot = read_wallet_state(wallet_address, USDC_CONTRACTS)
+    except Exception as e:
+        print(f"Error reading wallet state: {e}")
+        return
     
     total_usdc = 0.0
     found_balances = []
     
-    for name, contract_address in usdc_contracts.items():
-        try:
-            print(f"\nChecking {name} at {contract_address}...")
-            
-            # Create ERC20 balanceOf function call data
-            function_signature = "0x70a08231"  # keccak256("balanceOf(address)") first 4 bytes
-            address_param = wallet_address[2:].lower().zfill(64)  # Remove 0x and pad to 32 bytes
-            data = function_signature + address_param
-            
-            # Create JSON-RPC request
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "eth_call",
-                "params": [
-                    {
-                        "to": contract_address,
-                        "data": data
-                    },
-                    "latest"
-                ],
-                "id": 1
-            }
-            
-            # Make request
-            response = requests.post(rpc_url, json=payload)
-            result = response.json()
-            
-            if "result" in result:
-                # Convert hex result to decimal and divide by 10^6 (USDC has 6 decimals)
-                balance_hex = result["result"]
-                balance_int = int(balance_hex, 16)
-                balance_usdc = balance_int / 10**6
-                
-                print(f"  Balance: {balance_usdc} USDC")
-                
-                if balance_usdc > 0:
-                    total_usdc += balance_usdc
-                    found_balances.append((name, balance_usdc, contract_address))
-            else:
-                print(f"  Error: {result.get('error')}")
-                
-        except Exception as e:
-            print(f"  Error checking {name}: {e}")
+    for token in snapshot.tokens:
+        print(f"\nChecking {token.name} at {token.contract}...")
+        if token.balance is None:
+            print(f"  Error checking {token.name} balance")
+            continue
+        
+        print(f"  Balance: {token.balance} USDC")
+        
+        if token.balance > 0:
+            total_usdc += token.balance
+            found_balances.append(token)
+    
+    for error in snapshot.errors:
+        print(f"  Error: {error}")
     
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -93,54 +60,30 @@ def check_usdc_balance():
     if found_balances:
         print(f"Total USDC found: {total_usdc} USDC")
         print("\nBreakdown by contract:")
-        for name, balance, contract in found_balances:
-            print(f"  {name}: {balance} USDC ({contract})")
+        for token in found_balances:
+            print(f"  {token.name}: {token.balance} USDC ({token.contract})")
         
         print(f"\nGreat! You have USDC in your wallet.")
         print("Now you need to approve the Polymarket Exchange to spend it.")
         print("Run 'python approve_usdc.py' to approve spending.")
         
-        # Check current allowances
-        print("\nChecking current allowances for Polymarket...")
-        polymarket_exchange = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
+        # Allowances for Polymarket came back in the same batch
+        print(f"\nCurrent allowances for Polymarket (block {snapshot.block_number}):")
         
-        for name, balance, contract in found_balances:
-            try:
-                # Check allowance
-                function_signature = "0xdd62ed3e"  # allowance(owner,spender)
-                owner_param = wallet_address[2:].lower().zfill(64)
-                spender_param = polymarket_exchange[2:].lower().zfill(64)
-                data = function_signature + owner_param + spender_param
-                
-                payload = {
-                    "jsonrpc": "2.0",
-                    "method": "eth_call",
-                    "params": [
-                        {
-                            "to": contract,
-                            "data": data
-                        },
-                        "latest"
-                    ],
-                    "id": 1
-                }
-                
-                response = requests.post(rpc_url, json=payload)
-                result = response.json()
-                
-                if "result" in result:
-                    allowance_hex = result["result"]
-                    allowance_int = int(allowance_hex, 16)
-                    allowance_usdc = allowance_int / 10**6
-                    
-                    print(f"  {name} allowance: {allowance_usdc} USDC")
-                    
-                    if allowance_usdc >= balance:
-                        print(f"    ✅ Sufficient allowance for {name}")
-                    else:
-                        print(f"    ❌ Need to approve {name} for spending")
-            except Exception as e:
-                print(f"  Error checking allowance for {name}: {e}")
+        for token in found_balances:
+            if token.allowance is None:
+                print(f"  Error checking allowance for {token.name}")
+                continue
+            
+            print(f"  {token.name} allowance: {token.allowance} USDC")
+            
+            if token.allowance >= token.balance:
+                print(f"    ✅ Sufficient allowance for {token.name}")
+            else:
+                print(f"    ❌ Need to approve {token.name} for spending")
+        
+        if snapshot.matic is not None:
+            print(f"\nMATIC balance for gas: {snapshot.matic} MATIC")
                 
     else:
         print("No USDC found in any of the checked contracts.")
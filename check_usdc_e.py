@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
-import requests
-import json
 import os
 from dotenv import load_dotenv
 from eth_account import Account
+from wallet_state import read_wallet_state
 
 # Load environment variables
 load_dotenv()
@@ -39,66 +38,20 @@ def check_usdc_e_balance():
         # USDC.e contract address on Polygon
         usdc_e_contract = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"  # Same as USDC on Polygon
         
-        # Polygon RPC URL - using public endpoint
-        rpc_url = "https://polygon-rpc.com"
+        # USDC balance and MATIC (for gas fees) in one batch request
+        snapshot = read_wallet_state(wallet_address, {"USDC": usdc_contract})
         
-        # Create ERC20 balanceOf function call data
-        # Function signature: balanceOf(address)
-        function_signature = "0x70a08231"  # keccak256("balanceOf(address)") first 4 bytes
-        address_param = wallet_address[2:].lower().zfill(64)  # Remove 0x and pad to 32 bytes
-        data = function_signature + address_param
-        
-        # Check USDC balance
-        payload_usdc = {
-            "jsonrpc": "2.0",
-            "method": "eth_call",
-            "params": [
-                {
-                    "to": usdc_contract,
-                    "data": data
-                },
-                "latest"
-            ],
-            "id": 1
-        }
-        
-        # Make request for USDC
-        response_usdc = requests.post(rpc_url, json=payload_usdc)
-        result_usdc = response_usdc.json()
-        
-        usdc_balance = 0
-        if "result" in result_usdc:
-            # Convert hex result to decimal and divide by 10^6 (USDC has 6 decimals)
-            balance_hex = result_usdc["result"]
-            balance_int = int(balance_hex, 16)
-            usdc_balance = balance_int / 10**6
+        usdc_balance = snapshot.tokens[0].balance
+        if usdc_balance is not None:
             print(f"USDC balance: {usdc_balance} USDC")
         else:
-            print(f"Error getting USDC balance: {result_usdc.get('error')}")
+            usdc_balance = 0
         
-        # Let's also check for any native MATIC (for gas fees)
-        payload_matic = {
-            "jsonrpc": "2.0",
-            "method": "eth_getBalance",
-            "params": [
-                wallet_address,
-                "latest"
-            ],
-            "id": 1
-        }
+        if snapshot.matic is not None:
+            print(f"MATIC balance: {snapshot.matic} MATIC")
         
-        # Make request for MATIC
-        response_matic = requests.post(rpc_url, json=payload_matic)
-        result_matic = response_matic.json()
-        
-        if "result" in result_matic:
-            # Convert hex result to decimal and divide by 10^18 (MATIC has 18 decimals)
-            balance_hex = result_matic["result"]
-            balance_int = int(balance_hex, 16)
-            matic_balance = balance_int / 10**18
-            print(f"MATIC balance: {matic_balance} MATIC")
-        else:
-            print(f"Error getting MATIC balance: {result_matic.get('error')}")
+        for error in snapshot.errors:
+            print(f"Error getting {error}")
         
         # Summary of findings
         print("\n--- SUMMARY ---")
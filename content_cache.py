@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CONTENT_CACHE_PATH = os.getenv("CONTENT_CACHE_PATH", "content_cache.db")
+CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", "21600"))  # Seconds an entry stays fresh
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CONTENT_CACHE_NEGATIVE_TTL = float(os.getenv("CONTENT_CACHE_NEGATIVE_TTL", "3600"))  # Seconds an empty result is kept
+LRU_TOUCH_INTERVAL = 300  # Seconds before a hit writes a newer used_ts to disk again
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_cache (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_ts REAL NOT NULL,
+    used_ts REAL NOT NULL,
+    ttl REAL
+);
+CREATE INDEX IF NOT EXISTS idx_content_cache_used_ts ON content_cache (used_ts);
+"""
+
+def cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    """Stable key for a request: the namespace plus a hash of its parameters"""
+    encoded = json.dumps(params, sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.sha1(encoded.encode('utf-8')).hexdigest()}"
+
+class ContentCache:
+    """
+    On-disk cache for API responses (Exa searches, Firecrawl scrapes)
+
+    Entries are JSON values in a SQLite table, keyed by namespace and request
+    parameters. An entry is served for ``ttl`` seconds after it was stored;
+    when the stored values grow past ``max_bytes``, the least recently used
+    entries are evicted. The whole table is loaded into memory on first use
+    (or by ``warm``), so hits never touch the disk except to refresh an
+    entry's LRU timestamp once it is older than LRU_TOUCH_INTERVAL. Entries
+    can be stored with their own, shorter ttl, e.g. to remember empty
+    results for a while without keeping them as long as real ones.
+    """
+
+    def __init__(
+        self,
+        path: str = CONTENT_CACHE_PATH,
+        ttl: float = CONTENT_CACHE_TTL,
+        max_bytes: int = CONTENT_CACHE_MAX_BYTES
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> (value, size, created_ts, ttl, used_ts), least recently used first
+        self._entries: "OrderedDict[str, Tuple[Any, int, float, float, float]]" = OrderedDict()
+        self._size = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(content_cache)")}
+            if "ttl" not in columns:
+                # Tables created before per-entry TTLs
+                self._conn.execute("ALTER TABLE content_cache ADD COLUMN ttl REAL")
+        return self._conn
+
+    def warm(self) -> int:
+        """
+        Load every unexpired entry into memory, dropping expired ones from disk
+
+        Returns:
+            Number of entries loaded
+        """
+        with self._lock:
+            if self._conn is not None:
+                return len(self._entries)
+
+            conn = self._connect()
+            conn.execute("DELETE FROM content_cache WHERE created_ts + COALESCE(ttl, ?) < ?", (self.ttl, time.time()))
+            conn.commit()
+
+            rows = conn.execute(
+                "SELECT key, value, size, created_ts, ttl, used_ts FROM content_cache ORDER BY used_ts"
+            ).fetchall()
+            for key, value, size, created_ts, ttl, used_ts in rows:
+                self._entries[key] = (json.loads(value), size, created_ts, self.ttl if ttl is None else ttl, used_ts)
+                self._size += size
+
+            self._evict()
+            return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for a key, or None when missing or expired"""
+        with self._lock:
+            self.warm()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, created_ts, ttl, used_ts = entry
+            now = time.time()
+            if now - created_ts >= ttl:
+                self._delete(key)
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            # The in-memory order is exact; the disk copy only orders the next warm, so it may lag a little
+            if now - used_ts >= LRU_TOUCH_INTERVAL:
+                self._entries[key] = (value, size, created_ts, ttl, now)
+                self._conn.execute("UPDATE content_cache SET used_ts = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a JSON-serialisable value, evicting old entries if over the size limit
+
+        Args:
+            ttl: Seconds this entry stays fresh, if not the cache's ttl
+        """
+        encoded = json.dumps(value)
+        size = len(encoded)
+        now = time.time()
+
+        with self._lock:
+            self.warm()
+            if key in self._entries:
+                self._delete(key)
+
+            self._entries[key] = (value, size, now, self.ttl if ttl is None else ttl, now)
+            self._size += size
+            self._conn.execute(
+                "INSERT OR REPLACE INTO content_cache (key, namespace, value, size, created_ts, used_ts, ttl) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, key.split(":", 1)[0], encoded, size, now, now, ttl)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def fetch(self, namespace: str, params: Dict[str, Any], loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for a request, calling ``loader`` on a miss
+
+        The loader's result is stored unless it is None or empty, so failed
+        lookups are retried on the next call.
+        """
+        key = cache_key(namespace, params)
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value:
+                self.set(key, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _delete(self, key: str) -> None:
+        """Drop one entry from memory and disk; caller holds the lock and commits"""
+        size = self._entries.pop(key)[1]
+        self._size -= size
+        self._conn.execute("DELETE FROM content_cache WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until under max_bytes; caller holds the lock"""
+        while self._size > self.max_bytes and self._entries:
+            self._delete(next(iter(self._entries)))
+            self.evictions += 1
+
+content_cache = ContentCache()
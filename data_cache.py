@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class RefreshingCache:
+    """
+    Single-value cache with a TTL, single-flight loads and stale-while-revalidate
+
+    - The first ``get`` loads the value; concurrent callers wait for that one
+      load instead of each running the loader.
+    - Once warm, ``get`` never blocks: a fresh value is returned as is, and a
+      value older than ``ttl`` is returned immediately while one background
+      thread reloads it.
+    - If a load fails, the previous value (if any) keeps being served and no
+      new load starts until ``retry_interval`` seconds have passed; a cold
+      cache raises the last error until then.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        ttl: float,
+        name: Optional[str] = None,
+        retry_interval: float = 30
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.name = name or getattr(loader, "__name__", "cache")
+
+        self._lock = threading.Lock()
+        self._loaded = threading.Condition(self._lock)
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._loading = False
+        self._last_error: Optional[BaseException] = None
+        self._failed_at: Optional[float] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the cached value was loaded, or None when cold"""
+        loaded_at = self._loaded_at
+        return None if loaded_at is None else time.monotonic() - loaded_at
+
+    def _load(self) -> None:
+        """Run the loader once and publish the result; called by the single loader thread"""
+        started = time.perf_counter()
+        try:
+            value = self.loader()
+        except Exception as e:
+            logger.error(f"Refreshing {self.name} failed: {e}")
+            with self._loaded:
+                self._last_error = e
+                self._failed_at = time.monotonic()
+                self._loading = False
+                self._loaded.notify_all()
+            return
+
+        with self._loaded:
+            self._value = value
+            self._loaded_at = time.monotonic()
+            self._last_error = None
+            self._failed_at = None
+            self._loading = False
+            self._loaded.notify_all()
+
+        logger.info(f"Refreshed {self.name} in {time.perf_counter() - started:.2f}s")
+
+    def _retry_pending(self) -> bool:
+        """True while the last failed load is too recent to try again; caller holds the lock"""
+        return self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_interval
+
+    def _start_refresh(self) -> None:
+        """Start a background reload unless one is running or a failure is too recent; caller holds the lock"""
+        if self._loading or self._retry_pending():
+            return
+        self._loading = True
+        threading.Thread(target=self._load, name=f"refresh-{self.name}", daemon=True).start()
+
+    def warm(self) -> None:
+        """Start loading in the background so the first request finds a value"""
+        with self._lock:
+            if self._loaded_at is None:
+                self._start_refresh()
+
+    def get(self) -> Any:
+        """
+        Return the cached value, loading or refreshing it as needed
+
+        Raises:
+            The loader's exception if the cache is cold and the load fails
+        """
+        with self._loaded:
+            if self._loaded_at is not None:
+                if time.monotonic() - self._loaded_at >= self.ttl:
+                    self._start_refresh()
+                return self._value
+
+            # Cold: wait for a single load shared by every caller
+            if self._retry_pending():
+                raise self._last_error
+            self._start_refresh()
+            while self._loading:
+                self._loaded.wait()
+
+            if self._loaded_at is None:
+                raise self._last_error or RuntimeError(f"Loading {self.name} failed")
+            return self._value
+
+    def invalidate(self) -> None:
+        """Mark the value stale so the next get triggers a refresh"""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._loaded_at = float("-inf")
+
+class PeriodicRefresher:
+    """
+    Rebuild a value on a fixed schedule in a background thread
+
+    Readers call ``latest`` and get whatever the last successful build
+    produced: a plain attribute read with no locking or I/O. A failed build
+    is logged and retried after ``retry_interval`` while the previous value
+    stays in place.
+    """
+
+    def __init__(
+        self,
+        builder: Callable[[], Any],
+        interval: float,
+        retry_interval: float = 30,
+        name: Optional[str] = None
+    ):
+        self.builder = builder
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.name = name or getattr(builder, "__name__", "refresher")
+
+        self._value: Any = None
+        self._built_at: Optional[float] = None
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def start(self) -> "PeriodicRefresher":
+        """Start the refresh thread; calling it again is a no-op"""
+        with self._start_lock:
+            thread = self._thread
+            if thread is not None and self._stopped:
+                # Let a stopping thread finish its current build so only one thread ever runs
+                thread.join()
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name=f"refresh-{self.name}", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wake.set()
+
+    def refresh_now(self) -> None:
+        """Wake the thread to rebuild immediately instead of at the next interval"""
+        self._wake.set()
+
+    def latest(self) -> Any:
+        """The most recently built value, or None before the first build"""
+        return self._value
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful build, or None before the first one"""
+        built_at = self._built_at
+        return None if built_at is None else time.monotonic() - built_at
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first build has finished"""
+        return self._ready.wait(timeout)
+
+    def _run(self) -> None:
+        while not self._stopped:
+            started = time.perf_counter()
+            try:
+                value = self.builder()
+            except Exception as e:
+                logger.error(f"Rebuilding {self.name} failed: {e}")
+                delay = self.retry_interval
+            else:
+                self._value = value
+                self._built_at = time.monotonic()
+                self._ready.set()
+                logger.info(f"Rebuilt {self.name} in {time.perf_counter() - started:.2f}s")
+                delay = self.interval
+
+            self._wake.wait(delay)
+            self._wake.clear()
+
+        self._thread = None
+
+def check_refreshing_cache() -> bool:
+    """Single-flight loads, stale-while-revalidate and retry_interval, offline"""
+    checks = {}
+    calls = []
+    fail = threading.Event()
+
+    def loader() -> int:
+        calls.append(time.monotonic())
+        time.sleep(0.2)
+        if fail.is_set():
+            raise RuntimeError("upstream down")
+        return len(calls)
+
+    # Step 1: Concurrent cold gets share one load
+    cache = RefreshingCache(loader, ttl=0.5, name="check", retry_interval=0.5)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    checks["single_flight"] = len(calls) == 1 and results == [1] * 8
+
+    # Step 2: A stale value is served without waiting while one reload runs
+    time.sleep(0.5)
+    started = time.monotonic()
+    stale = [cache.get() for _ in range(5)]
+    checks["stale_while_revalidate"] = stale == [1] * 5 and time.monotonic() - started < 0.1
+    time.sleep(0.3)
+    checks["reloaded_once"] = len(calls) == 2 and cache.get() == 2
+
+    # Step 3: A failed reload keeps the old value and is not retried before retry_interval
+    fail.set()
+    cache.invalidate()
+    cache.get()
+    time.sleep(0.3)
+    checks["failure_keeps_value"] = cache.get() == 2 and len(calls) == 3
+    cache.get()
+    checks["retry_waits"] = len(calls) == 3
+    time.sleep(0.5)
+    cache.get()
+    time.sleep(0.3)
+    checks["retry_after_interval"] = len(calls) == 4
+
+    # Step 4: A cold cache raises the failure, then the last error until retry_interval passes
+    cold = RefreshingCache(loader, ttl=10, name="cold", retry_interval=0.5)
+    errors = 0
+    for _ in range(2):
+        try:
+            cold.get()
+        except RuntimeError:
+            errors += 1
+    checks["cold_failure_raises"] = errors == 2 and len(calls) == 5
+    fail.clear()
+    time.sleep(0.5)
+    checks["cold_recovers"] = cold.get() == 6
+
+    failed = [name for name, passed in checks.items() if not passed]
+    print(f"Ran {len(checks)} RefreshingCache checks with {len(calls)} loads")
+    print("RefreshingCache works as expected" if not failed else f"RefreshingCache checks FAILED: {failed}")
+    return not failed
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if check_refreshing_cache() else 1)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+import time
+from bisect import bisect_left, insort
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from market_parsing import parse_timestamp
+
+DAY_SECONDS = 24 * 60 * 60
+
+class EndDateIndex:
+    """
+    Sorted index of markets by end date
+
+    Markets are kept in a list of (end epoch seconds, market id) pairs sorted
+    with bisect, so time-window queries cost O(log n) to locate plus the size
+    of the result. Open (not closed) markets are also kept in their own sorted
+    list so "ended but not resolved" lookups skip resolved markets entirely.
+
+    ``update`` replaces markets by id, so the index can follow a changing
+    market set (e.g. the output of a store sync) without being rebuilt.
+    Markets without a parseable endDate are held but never match a window.
+    """
+
+    def __init__(self, markets: Iterable[Dict[str, Any]] = ()):
+        self._markets: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, Tuple[float, str]] = {}
+        self._all: List[Tuple[float, str]] = []
+        self._open: List[Tuple[float, str]] = []
+        self.update(markets)
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def __contains__(self, market_id: object) -> bool:
+        return str(market_id) in self._markets
+
+    def _unlink(self, market_id: str) -> None:
+        key = self._keys.pop(market_id, None)
+        if key is None:
+            return
+        for keys in (self._all, self._open):
+            position = bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+
+    def _bulk_load(self, markets: Iterable[Dict[str, Any]]) -> None:
+        """Fill an empty index with one sort instead of an insort per market"""
+        for market in markets:
+            market_id = market.get("id")
+            if market_id is not None:
+                self._markets[str(market_id)] = market
+
+        open_ids = set()
+        for market_id, market in self._markets.items():
+            end_ts = parse_timestamp(market.get("endDate"))
+            if end_ts is not None:
+                self._keys[market_id] = (end_ts, market_id)
+                if not market.get("closed"):
+                    open_ids.add(market_id)
+
+        self._all = sorted(self._keys.values())
+        self._open = [key for key in self._all if key[1] in open_ids]
+
+    def update(self, markets: Iterable[Dict[str, Any]]) -> None:
+        """Insert markets, replacing any already indexed under the same id"""
+        if not self._markets:
+            self._bulk_load(markets)
+            return
+
+        for market in markets:
+            market_id = market.get("id")
+            if market_id is None:
+                continue
+            market_id = str(market_id)
+
+            self._unlink(market_id)
+            self._markets[market_id] = market
+
+            end_ts = parse_timestamp(market.get("endDate"))
+            if end_ts is None:
+                continue
+
+            key = (end_ts, market_id)
+            self._keys[market_id] = key
+            insort(self._all, key)
+            if not market.get("closed"):
+                insort(self._open, key)
+
+    def remove(self, market_id: str) -> None:
+        """Drop a market from the index"""
+        market_id = str(market_id)
+        self._unlink(market_id)
+        self._markets.pop(market_id, None)
+
+    def _window(self, keys: List[Tuple[float, str]], start: float, end: float) -> List[Dict[str, Any]]:
+        # (t,) sorts before every (t, id), so these bounds give [start, end)
+        low = bisect_left(keys, (start,))
+        high = bisect_left(keys, (end,))
+        return [self._markets[market_id] for _, market_id in keys[low:high]]
+
+    def ending_between(self, start: float, end: float, include_closed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Markets ending in [start, end), soonest first
+
+        Args:
+            start: Window start (epoch seconds, inclusive)
+            end: Window end (epoch seconds, exclusive)
+            include_closed: Also return markets that are already closed
+        """
+        return self._window(self._all if include_closed else self._open, start, end)
+
+    def ending_within(self, seconds: float = DAY_SECONDS, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Open markets ending in the next ``seconds`` (default 24h)"""
+        now = time.time() if now is None else now
+        return self.ending_between(now, now + seconds)
+
+    def ended_unresolved(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Markets whose end date has passed but which are not closed yet, oldest first"""
+        now = time.time() if now is None else now
+        return self._window(self._open, float("-inf"), now)
+
+    def by_end_date(self, descending: bool = False) -> List[Dict[str, Any]]:
+        """
+        Every market ordered by end date
+
+        Markets without an end date come last in either direction.
+        """
+        keys = reversed(self._all) if descending else self._all
+        ordered = [self._markets[market_id] for _, market_id in keys]
+        undated = [market for market_id, market in self._markets.items() if market_id not in self._keys]
+        return ordered + undated
+
+    def latest_end(self) -> Optional[float]:
+        """The latest end date in the index (epoch seconds)"""
+        return self._all[-1][0] if self._all else None
+
+def load_local_index(**filters: Any) -> EndDateIndex:
+    """
+    Sync the local market store and index the markets matching the filters
+    """
+    from market_store import load_local_markets
+    return EndDateIndex(load_local_markets(**filters))
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import time
 import datetime
+from end_date_index import EndDateIndex
+from market_parsing import parse_timestamp
 
 def fetch_current_markets():
     """Fetch current markets from Polymarket using timestamp to avoid cached data"""
@@ -21,7 +23,6 @@ def fetch_current_markets():
     
     # Headers with up-to-date user agent
     headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
         "Accept": "application/json",
         "Cache-Control": "no-cache"
     }
@@ -29,7 +30,7 @@ def fetch_current_markets():
     try:
         # Make the request
         print(f"Fetching markets with timestamp: {current_timestamp}")
-        response = requests.get(url, params=params, headers=headers)
+        response = http_client.get(url, params=params, headers=headers)
         
         if response.status_code != 200:
             print(f"Error: Failed to fetch markets (Status code: {response.status_code})")
@@ -44,41 +45,34 @@ def fetch_current_markets():
             print(f"Received object instead of array: {markets}")
             return
             
-        # Sort markets by end date (newest first)
-        try:
-            markets.sort(key=lambda x: x.get("endDate", ""), reverse=True)
-        except:
-            print("Could not sort markets by end date")
+        # Index markets by parsed end date (newest first, undated markets last)
+        index = EndDateIndex(markets)
+        markets = index.by_end_date(descending=True)
             
         # Print each market with end date
         print(f"Found {len(markets)} markets on Polymarket:\n")
         
-        newest_end_date = None
-        
         for i, market in enumerate(markets, 1):
             question = market.get('question', 'Unknown')
-            end_date = market.get('endDate', 'Unknown')
+            end_ts = parse_timestamp(market.get('endDate'))
             
             # Format date if available
             formatted_date = "Unknown"
-            if end_date != 'Unknown':
-                try:
-                    date_obj = datetime.datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-                    formatted_date = date_obj.strftime("%Y-%m-%d %H:%M")
-                    
-                    # Track the newest date
-                    if newest_end_date is None or date_obj > newest_end_date:
-                        newest_end_date = date_obj
-                except:
-                    pass
+            if end_ts is not None:
+                formatted_date = datetime.datetime.fromtimestamp(end_ts, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M")
             
             # Print market details
             print(f"{i}. {question}")
             print(f"   End Date: {formatted_date}")
             print()
             
+        print(f"Markets ending in the next 24h: {len(index.ending_within())}")
+        print(f"Markets ended but not resolved: {len(index.ended_unresolved())}")
+        
         # Print the newest end date
-        if newest_end_date:
+        latest_end = index.latest_end()
+        if latest_end is not None:
+            newest_end_date = datetime.datetime.fromtimestamp(latest_end, datetime.timezone.utc)
             print(f"Newest market end date: {newest_end_date.strftime('%Y-%m-%d %H:%M')}")
             # Make today timezone-aware to match newest_end_date
             today = datetime.datetime.now(datetime.timezone.utc)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-import requests
+import http_client
+from order_book import OrderBook
 
 def fetch_order_book():
     """
@@ -18,14 +19,13 @@ def fetch_order_book():
     
     # Headers
     headers = {
-        "Accept": "application/json",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        "Accept": "application/json"
     }
     
     try:
         # Make the request
         print(f"Fetching order book for token ID: {token_id[:10]}...{token_id[-10:]}")
-        response = requests.get(url, params=params, headers=headers)
+        response = http_client.get(url, params=params, headers=headers)
         
         if response.status_code != 200:
             print(f"Error: Failed to fetch order book (Status code: {response.status_code})")
@@ -33,20 +33,17 @@ def fetch_order_book():
             return
         
         # Parse order book
-        book = response.json()
+        book = OrderBook.from_json(response.json())
         
         print("\nOrder Book for 'Will Donald Trump win the 2024 US Presidential Election?' - YES token\n")
         
         # Display bid orders (buy orders)
-        bids = book.get("bids", [])
-        if bids:
+        if book.bids:
             print("BID ORDERS (Buying YES tokens):")
             print("-" * 40)
             print("Price    |  Size  ")
             print("-" * 40)
-            for bid in bids[:10]:  # Show top 10 bids
-                price = float(bid.get("price", 0))
-                size = float(bid.get("size", 0))
+            for price, size in book.bid_levels(10):  # Show top 10 bids
                 print(f"{price:.4f}   |  {size:.1f}")
         else:
             print("No bid orders found.")
@@ -54,24 +51,21 @@ def fetch_order_book():
         print()
         
         # Display ask orders (sell orders)
-        asks = book.get("asks", [])
-        if asks:
+        if book.asks:
             print("ASK ORDERS (Selling YES tokens):")
             print("-" * 40)
             print("Price    |  Size  ")
             print("-" * 40)
-            for ask in asks[:10]:  # Show top 10 asks
-                price = float(ask.get("price", 0))
-                size = float(ask.get("size", 0))
+            for price, size in book.ask_levels(10):  # Show top 10 asks
                 print(f"{price:.4f}   |  {size:.1f}")
         else:
             print("No ask orders found.")
             
         # Calculate and display market implied probability
-        if bids and asks:
-            best_bid = float(bids[0].get("price", 0))
-            best_ask = float(asks[0].get("price", 0))
-            mid_price = (best_bid + best_ask) / 2
+        if book.bids and book.asks:
+            best_bid = book.best_bid
+            best_ask = book.best_ask
+            mid_price = book.mid
             
             print("\nMARKET SUMMARY:")
             print(f"Best Bid: {best_bid:.4f} (Buying YES at {best_bid*100:.1f}%)")
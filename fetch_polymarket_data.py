@@ -5,11 +5,159 @@ from firecrawl import FirecrawlApp
 import time
 import random
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
+from content_cache import content_cache, cache_key, CONTENT_CACHE_NEGATIVE_TTL
 
 # Load environment variables
 load_dotenv()
 
+FIRECRAWL_CONCURRENCY = 4  # Pages scraped at the same time
+FIRECRAWL_URL_TIMEOUT = 15  # Seconds allowed per page
+FIRECRAWL_DEADLINE = 30  # Seconds allowed for the whole enrichment stage
+
+# Exa query for active markets; also the cache key of its results
+EXA_SEARCH_PARAMS = {
+    "query": "active prediction markets betting polymarket.com",
+    "type": "neural",  # Use neural search for better semantic matching
+    "num_results": 15,
+    "include_domains": ["polymarket.com"],
+    "start_published_date": "2025-05-01",  # Only recent content
+    "text": True  # Include text content
+}
+
+def extract_description(content: str) -> str:
+    """Pick the first meaningful paragraph of scraped markdown as a description"""
+    for line in content.split('\n'):
+        if len(line.strip()) > 50 and not line.startswith('#'):
+            return line.strip()[:200] + "..."
+    return ""
+
+def _scrape_content(firecrawl: Any, url: str, timeout: float) -> str:
+    """Scrape one page's main content as markdown"""
+    scrape_result = firecrawl.scrape_url(
+        url,
+        formats=['markdown'],
+        only_main_content=True,
+        timeout=int(timeout * 1000)
+    )
+    if isinstance(scrape_result, dict):
+        return scrape_result.get('markdown') or scrape_result.get('content') or ""
+    return getattr(scrape_result, 'markdown', None) or ""
+
+def scrape_descriptions(
+    urls: List[str],
+    api_key: str,
+    max_workers: int = FIRECRAWL_CONCURRENCY,
+    url_timeout: float = FIRECRAWL_URL_TIMEOUT,
+    deadline: float = FIRECRAWL_DEADLINE
+) -> List[Optional[str]]:
+    """
+    Scrape descriptions for many pages concurrently with one Firecrawl client
+    
+    Pages are scraped on a bounded thread pool. A page that runs longer than
+    url_timeout seconds, or is still pending when the overall deadline
+    passes, is abandoned, so one slow page cannot hold up the caller.
+    
+    Returns:
+        Descriptions in the same order as urls: "" where the page was scraped
+        but had no description, None where scraping failed, timed out or was
+        skipped at the deadline
+    """
+    descriptions: List[Optional[str]] = [None] * len(urls)
+    if not urls:
+        return descriptions
+    
+    firecrawl = FirecrawlApp(api_key=api_key)
+    started_at = {}
+    
+    def scrape(index: int) -> str:
+        started_at[index] = time.monotonic()
+        return extract_description(_scrape_content(firecrawl, urls[index], url_timeout))
+    
+    stage_deadline = time.monotonic() + deadline
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {executor.submit(scrape, index): index for index in range(len(urls))}
+    
+    try:
+        while pending:
+            now = time.monotonic()
+            if now >= stage_deadline:
+                print(f"Firecrawl deadline reached, skipping {len(pending)} pages")
+                break
+            
+            # Wake up for the next completion, per-page timeout or the deadline
+            expiries = [started_at[index] + url_timeout for index in pending.values() if index in started_at]
+            wake_at = min(expiries + [stage_deadline])
+            done, _ = wait(pending, timeout=max(0, wake_at - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    descriptions[index] = future.result()
+                except Exception as e:
+                    print(f"Firecrawl error for {urls[index]}: {e}")
+            
+            now = time.monotonic()
+            for future, index in list(pending.items()):
+                if index in started_at and now - started_at[index] >= url_timeout:
+                    print(f"Firecrawl timed out for {urls[index]}")
+                    del pending[future]
+    finally:
+        # Abandon whatever is left; running scrapes finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return descriptions
+
+def search_market_pages(exa_api_key: str) -> List[Dict[str, str]]:
+    """
+    Search Polymarket pages with Exa, served from the content cache when fresh
+
+    Returns:
+        List of results with url, title and text, in search order
+    """
+    def search() -> List[Dict[str, str]]:
+        exa = Exa(api_key=exa_api_key)
+        search_results = exa.search_and_contents(**EXA_SEARCH_PARAMS)
+        return [
+            {
+                "url": getattr(result, 'url', None) or "",
+                "title": getattr(result, 'title', None) or "",
+                "text": getattr(result, 'text', None) or ""
+            }
+            for result in search_results.results
+        ]
+
+    return content_cache.fetch("exa", EXA_SEARCH_PARAMS, search)
+
+def cached_descriptions(urls: List[str], api_key: str) -> Dict[str, str]:
+    """
+    Firecrawl descriptions for pages, scraping only those not in the content cache
+
+    Returns:
+        Dict of url -> description ("" where scraping failed or found nothing)
+    """
+    descriptions = {}
+    missing = []
+    for url in urls:
+        cached = content_cache.get(cache_key("firecrawl", {"url": url}))
+        if cached is None:
+            missing.append(url)
+        else:
+            descriptions[url] = cached
+
+    for url, description in zip(missing, scrape_descriptions(missing, api_key)):
+        descriptions[url] = description or ""
+        # Failed scrapes are not cached so the next build retries them; pages that
+        # scraped fine but had no description are cached for a shorter time
+        if description is None:
+            continue
+        ttl = None if description else CONTENT_CACHE_NEGATIVE_TTL
+        content_cache.set(cache_key("firecrawl", {"url": url}), description, ttl=ttl)
+
+    return descriptions
+
 def fetch_polymarket_data():
     """
     Fetch real Polymarket data using Exa Search API and Firecrawl for content enhancement.
@@ -30,56 +178,40 @@ def fetch_polymarket_data():
         return fetch_fallback_data()
     
     try:
-        # Initialize Exa client
-        exa = Exa(api_key=exa_api_key)
-        
-        # Search for current active markets on Polymarket
-        search_results = exa.search_and_contents(
-            query="active prediction markets betting polymarket.com",
-            type="neural",  # Use neural search for better semantic matching
-            num_results=15,
-            include_domains=["polymarket.com"],
-            start_published_date="2025-05-01",  # Only recent content
-            text=True  # Include text content
-        )
+        # Search for current active markets on Polymarket (cached between builds)
+        search_results = search_market_pages(exa_api_key)
         
         # Process the results to get market data
         markets = []
         
-        for result in search_results.results:
+        # Keep the event pages, in search order
+        entries = []
+        for result in search_results:
             # Skip if no URL
-            if not hasattr(result, 'url') or not result.url:
+            if not result["url"]:
                 continue
                 
-            url = result.url
-            title = getattr(result, 'title', '')
-            text_content = getattr(result, 'text', '')
+            url = result["url"]
+            title = result["title"]
+            text_content = result["text"]
             
             # Skip non-event pages
             if "/event/" not in url:
                 continue
-                
+            
+            entries.append((url, title, text_content))
+        
+        # Use Firecrawl to get better content for thin pages, all pages at once
+        scraped = {}
+        if firecrawl_api_key:
+            thin_urls = [url for url, _, text_content in entries if len(text_content) < 100]
+            scraped = cached_descriptions(thin_urls, firecrawl_api_key)
+        
+        for url, title, text_content in entries:
             # Extract market question and create structured data
             question = title.replace(" | Polymarket", "").strip()
             
-            # Use Firecrawl to get better content if available
-            description = ""
-            if firecrawl_api_key and len(text_content) < 100:
-                try:
-                    firecrawl = FirecrawlApp(api_key=firecrawl_api_key)
-                    scrape_result = firecrawl.scrape_url(url, params={
-                        'formats': ['markdown'],
-                        'onlyMainContent': True
-                    })
-                    if scrape_result and 'content' in scrape_result:
-                        # Extract first meaningful paragraph as description
-                        content_lines = scrape_result['content'].split('\n')
-                        for line in content_lines:
-                            if len(line.strip()) > 50 and not line.startswith('#'):
-                                description = line.strip()[:200] + "..."
-                                break
-                except Exception as e:
-                    print(f"Firecrawl error for {url}: {e}")
+            description = scraped.get(url, "")
             
             # Fallback to Exa text content for description
             if not description and text_content:
@@ -236,6 +368,9 @@ def fetch_polymarket_data():
         total_expected_profit = sum(float(market["expected_profit"].replace("$", "")) for market in top_markets)
         roi_percentage = round((total_expected_profit / total_bet_amount) * 100, 1)
         
+        stats = content_cache.stats()
+        print(f"Content cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        
         # Return the data
         return {
             "markets": top_markets,
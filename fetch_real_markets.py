@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import datetime
 
 def fetch_current_polymarket_markets():
@@ -17,14 +17,13 @@ def fetch_current_polymarket_markets():
     
     # Headers
     headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
         "Accept": "application/json"
     }
     
     try:
         # Make the request
         print("Fetching current markets from Polymarket...")
-        response = requests.get(url, params=params, headers=headers)
+        response = http_client.get(url, params=params, headers=headers)
         
         if response.status_code != 200:
             print(f"Error: Failed to fetch markets (Status code: {response.status_code})")
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+from statistics import median
+from typing import Any, Dict, List, Optional, Tuple, Union
+from hexbytes import HexBytes
+from web3 import Web3
+from tx_tracker import BatchTransport, TxOutcome, rpc_batch
+
+GAS_TARGET_BLOCKS = int(os.getenv("GAS_TARGET_BLOCKS", "3"))  # Aim for inclusion within this many blocks
+GAS_LIMIT_MARGIN = float(os.getenv("GAS_LIMIT_MARGIN", "1.2"))  # Gas limit = estimate x margin
+MIN_PRIORITY_FEE = int(float(os.getenv("MIN_PRIORITY_FEE_GWEI", "30")) * 10**9)  # Polygon validators ignore smaller tips
+MAX_FEE_PER_GAS = int(float(os.getenv("MAX_FEE_GWEI", "1000")) * 10**9)  # Refuse to send above this fee cap
+FEE_HISTORY_BLOCKS = 20  # Recent blocks the priority fee is taken from
+PRIORITY_FEE_PERCENTILES = [10, 25, 50, 75, 90]
+BLOCK_TIME = 2.0  # Seconds per Polygon block; fee history younger than this is reused without asking
+BASE_FEE_MAX_CHANGE = 1.125  # EIP-1559: the base fee rises at most 12.5% per block
+
+# eth_feeHistory for the blocks up to newest_block; base_fees has one more entry, the next block's
+FeeHistory = namedtuple("FeeHistory", ["newest_block", "base_fees", "gas_used_ratios", "rewards"])
+
+# EIP-1559 fees for one send, chosen from the fee history at block_number
+FeeQuote = namedtuple("FeeQuote", ["block_number", "base_fee", "max_priority_fee", "max_fee", "target_blocks"])
+
+# eth_estimateGas result and the gas limit sent; error is set instead when the call would revert
+GasEstimate = namedtuple("GasEstimate", ["estimated", "gas_limit", "error"])
+
+# Planned versus actual gas and fee for one mined transaction
+GasUsage = namedtuple("GasUsage", ["tx_hash", "estimated", "gas_limit", "gas_used", "max_fee", "effective_gas_price"])
+
+def priority_percentile(target_blocks: int) -> int:
+    """Priority fee percentile of recent blocks to pay: the sooner the target, the higher"""
+    if target_blocks <= 1:
+        return 90
+    if target_blocks == 2:
+        return 75
+    if target_blocks <= 4:
+        return 50
+    if target_blocks <= 8:
+        return 25
+    return 10
+
+def _quantity(value: Any) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+def _rpc_tx(tx: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a web3 transaction dict eth_estimateGas needs, as JSON-RPC hex"""
+    call = {}
+    for key in ("from", "to", "data", "value"):
+        value = tx.get(key)
+        if value is None:
+            continue
+        if isinstance(value, int):
+            value = hex(value)
+        elif isinstance(value, (bytes, bytearray)):
+            value = "0x" + bytes(value).hex()
+        call[key] = value
+    return call
+
+def parse_fee_history(history: Dict[str, Any]) -> FeeHistory:
+    ratios = list(history["gasUsedRatio"])
+    return FeeHistory(
+        _quantity(history["oldestBlock"]) + len(ratios) - 1,
+        [_quantity(fee) for fee in history["baseFeePerGas"]],
+        ratios,
+        [[_quantity(fee) for fee in fees] for fees in history.get("reward") or []]
+    )
+
+def quote_fees(history: FeeHistory, target_blocks: int = GAS_TARGET_BLOCKS) -> FeeQuote:
+    """
+    Pick a max fee and priority fee to be included within ``target_blocks``
+
+    The priority fee is the median, over recent non-empty blocks, of the
+    tip paid at priority_percentile(target_blocks). The max fee covers the
+    next block's base fee rising by the EIP-1559 maximum for every target
+    block (one more than strictly needed, for a block passing before the
+    transaction reaches the node), plus the priority fee.
+
+    Raises:
+        ValueError if the max fee would exceed MAX_FEE_PER_GAS
+    """
+    column = PRIORITY_FEE_PERCENTILES.index(priority_percentile(target_blocks))
+    tips = [
+        fees[column] for fees, ratio in zip(history.rewards, history.gas_used_ratios)
+        if ratio > 0 and len(fees) > column
+    ]
+    priority_fee = max(int(median(tips)) if tips else 0, MIN_PRIORITY_FEE)
+
+    base_fee = history.base_fees[-1]
+    max_fee = math.ceil(base_fee * BASE_FEE_MAX_CHANGE ** target_blocks) + priority_fee
+    if max_fee > MAX_FEE_PER_GAS:
+        raise ValueError(
+            f"Network fees too high: max fee {max_fee / 10**9:.1f} gwei is above the "
+            f"{MAX_FEE_PER_GAS / 10**9:.0f} gwei cap (MAX_FEE_GWEI)"
+        )
+    return FeeQuote(history.newest_block, base_fee, priority_fee, max_fee, target_blocks)
+
+class GasReport:
+    """Compare the gas and fees planned for sent transactions with their receipts"""
+
+    def __init__(self):
+        self._planned: Dict[str, Tuple[GasEstimate, FeeQuote]] = {}
+        self.usage: List[GasUsage] = []
+        self._lock = threading.Lock()
+
+    def record(self, tx_hash: Union[str, bytes], estimate: GasEstimate, quote: FeeQuote) -> None:
+        with self._lock:
+            self._planned[Web3.to_hex(HexBytes(tx_hash)).lower()] = (estimate, quote)
+
+    def observe(self, outcome: TxOutcome) -> Optional[GasUsage]:
+        """
+        Match a settled transaction's receipt against its plan and print the comparison
+
+        Returns:
+            GasUsage, or None if the transaction was not recorded or never mined
+        """
+        with self._lock:
+            planned = self._planned.pop(outcome.tx_hash, None)
+        if planned is None or outcome.receipt is None:
+            return None
+
+        estimate, quote = planned
+        receipt = outcome.receipt
+        usage = GasUsage(
+            outcome.tx_hash, estimate.estimated, estimate.gas_limit,
+            receipt["gasUsed"], quote.max_fee, receipt.get("effectiveGasPrice", quote.max_fee)
+        )
+        with self._lock:
+            self.usage.append(usage)
+
+        print(f"Gas used {usage.gas_used:,} of {usage.estimated:,} estimated ({usage.gas_used / usage.estimated:.0%}), "
+              f"limit {usage.gas_limit:,}; paid {usage.effective_gas_price / 10**9:.1f} gwei "
+              f"of a {usage.max_fee / 10**9:.1f} gwei cap")
+        if usage.gas_used >= usage.gas_limit:
+            print(f"⚠️ Transaction {usage.tx_hash} used its whole gas limit; consider raising GAS_LIMIT_MARGIN")
+        return usage
+
+    def summary(self) -> str:
+        with self._lock:
+            usage = list(self.usage)
+        if not usage:
+            return "No mined transactions to compare gas estimates with"
+
+        ratios = [item.gas_used / item.estimated for item in usage]
+        paid = sum(item.gas_used * item.effective_gas_price for item in usage)
+        capped = sum(item.gas_used * item.max_fee for item in usage)
+        return (
+            f"Gas over {len(usage)} transaction(s): used {sum(ratios) / len(ratios):.0%} of estimate on average "
+            f"(range {min(ratios):.0%}-{max(ratios):.0%}); fees paid {paid / 10**18:.6f} POL, "
+            f"{paid / capped:.0%} of the max fee"
+        )
+
+class GasOracle:
+    """
+    EIP-1559 fees and gas limits from the node instead of fixed values
+
+    Each ``prepare`` is one JSON-RPC batch: the head block number, one
+    eth_estimateGas per transaction and, unless the cached history is
+    younger than a block, eth_feeHistory. The fee history is cached per
+    head block, so sends within the same block reuse it.
+    """
+
+    def __init__(
+        self,
+        batch: Optional[BatchTransport] = None,
+        target_blocks: int = GAS_TARGET_BLOCKS,
+        margin: float = GAS_LIMIT_MARGIN,
+        block_time: float = BLOCK_TIME
+    ):
+        self.batch = batch or rpc_batch()
+        self.target_blocks = target_blocks
+        self.margin = margin
+        self.block_time = block_time
+        self.report = GasReport()
+        self.requests = 0
+        self.fee_history_fetches = 0
+
+        self._history: Optional[FeeHistory] = None
+        self._history_fetched = 0.0
+        self._chain_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _send(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        self.requests += 1
+        return self.batch(calls)
+
+    def _fee_history_call(self) -> Tuple[str, List[Any]]:
+        return "eth_feeHistory", [hex(FEE_HISTORY_BLOCKS), "latest", PRIORITY_FEE_PERCENTILES]
+
+    def _store_history(self, result: Any) -> FeeHistory:
+        if isinstance(result, Exception):
+            raise result
+        history = parse_fee_history(result)
+        with self._lock:
+            self._history, self._history_fetched = history, time.monotonic()
+            self.fee_history_fetches += 1
+        return history
+
+    def prepare(
+        self,
+        txs: List[Dict[str, Any]],
+        target_blocks: Optional[int] = None
+    ) -> Tuple[FeeQuote, List[GasEstimate]]:
+        """
+        Fees for the current block and a gas estimate for each transaction
+
+        Args:
+            txs: Web3 transaction dicts (from, to, data, value)
+            target_blocks: Blocks to aim for inclusion within (defaults to the oracle's)
+
+        Returns:
+            (FeeQuote, one GasEstimate per transaction)
+
+        Raises:
+            ValueError if fees exceed MAX_FEE_PER_GAS; the node's error if
+            the batch or the fee history failed
+        """
+        target_blocks = target_blocks or self.target_blocks
+
+        # Step 1: One batch with the head, chain ID (first time), fee history (if it may be stale) and estimates
+        with self._lock:
+            history = self._history
+            refresh = history is None or time.monotonic() - self._history_fetched >= self.block_time
+            need_chain_id = self._chain_id is None
+
+        calls = [("eth_blockNumber", [])]
+        if need_chain_id:
+            calls.append(("eth_chainId", []))
+        if refresh:
+            calls.append(self._fee_history_call())
+        estimate_start = len(calls)
+        calls.extend(("eth_estimateGas", [_rpc_tx(tx)]) for tx in txs)
+        results = self._send(calls)
+
+        if isinstance(results[0], Exception):
+            raise results[0]
+        head = _quantity(results[0])
+        if need_chain_id and not isinstance(results[1], Exception):
+            with self._lock:
+                self._chain_id = _quantity(results[1])
+        if refresh:
+            history = self._store_history(results[estimate_start - 1])
+
+        # Step 2: The head moved past the cached history within one block time; fetch it for this block
+        if history.newest_block < head:
+            history = self._store_history(self._send([self._fee_history_call()])[0])
+
+        # Step 3: Fees from the history, gas limits from the estimates plus the margin
+        quote = quote_fees(history, target_blocks)
+        estimates = []
+        for result in results[estimate_start:]:
+            if isinstance(result, Exception):
+                estimates.append(GasEstimate(None, None, str(result)))
+            else:
+                estimated = _quantity(result)
+                estimates.append(GasEstimate(estimated, math.ceil(estimated * self.margin), None))
+        return quote, estimates
+
+    def quote(self, target_blocks: Optional[int] = None) -> FeeQuote:
+        return self.prepare([], target_blocks)[0]
+
+    def apply(self, tx: Dict[str, Any], quote: FeeQuote, estimate: GasEstimate) -> Dict[str, Any]:
+        """
+        A copy of ``tx`` as an EIP-1559 transaction with the quoted fees and estimated gas limit
+
+        Raises:
+            ValueError if the gas estimate failed (the transaction would revert)
+        """
+        if estimate.error is not None:
+            raise ValueError(f"Gas estimation failed, the transaction would revert: {estimate.error}")
+        filled = {key: value for key, value in tx.items() if key != "gasPrice"}
+        filled.update(
+            type=2,
+            gas=estimate.gas_limit,
+            maxFeePerGas=quote.max_fee,
+            maxPriorityFeePerGas=quote.max_priority_fee
+        )
+        with self._lock:
+            chain_id = self._chain_id
+        if chain_id is not None:
+            filled.setdefault("chainId", chain_id)
+        return filled
+
+    def fill_transaction(
+        self,
+        tx: Dict[str, Any],
+        target_blocks: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], GasEstimate, FeeQuote]:
+        """
+        Set gas and fees on one transaction with a single batched request
+
+        Returns:
+            (filled transaction, its GasEstimate, the FeeQuote used), for GasReport.record
+
+        Raises:
+            ValueError if gas estimation failed or fees exceed the cap
+        """
+        quote, (estimate,) = self.prepare([tx], target_blocks)
+        return self.apply(tx, quote, estimate), estimate, quote
+
+    def describe(self, quote: FeeQuote, estimate: GasEstimate) -> str:
+        return (f"Gas: limit {estimate.gas_limit:,} (estimate {estimate.estimated:,}), max fee "
+                f"{quote.max_fee / 10**9:.1f} gwei, priority {quote.max_priority_fee / 10**9:.1f} gwei "
+                f"(base {quote.base_fee / 10**9:.1f} gwei, target {quote.target_blocks} block(s))")
+
+def check_against_local_chain(count: int = 30) -> bool:
+    """
+    Send transactions with oracle fees and gas limits to a LocalChain, offline
+
+    Blocks are filled past the gas target first so the base fee climbs. The
+    transactions use more gas the longer their calldata; all must be mined
+    in the block after they are sent, and the fee history must be fetched
+    once per head block.
+    A reverting transaction must fail estimation instead of being sent.
+    """
+    from eth_account import Account
+    from local_chain import LocalChain, Revert, intrinsic_gas
+    from tx_tracker import TxTracker
+
+    chain = LocalChain()
+    account, busy = Account.create(), Account.create()
+    oracle = GasOracle(chain.batch, target_blocks=2, block_time=60)  # Only a new head refreshes the history
+    tracker = TxTracker(chain.batch, poll_interval=0.02, timeout=5.0)
+
+    def gas_used(data: bytes) -> int:
+        if data == b"\xde\xad":
+            raise Revert("always reverts")
+        return intrinsic_gas(data) + 3_000 * len(data)
+
+    chain.gas_used = gas_used
+
+    # Step 1: Fill 30 blocks well past the gas target so the base fee climbs
+    for nonce in range(30):
+        tx = {
+            "type": 2, "to": busy.address, "value": 0, "data": b"\x01" * 8192, "gas": 30_000_000,
+            "maxFeePerGas": 10**12, "maxPriorityFeePerGas": 40 * 10**9, "nonce": nonce, "chainId": 137
+        }
+        chain.send_raw_transaction(Account.sign_transaction(tx, busy.key).raw_transaction)
+        chain.mine()
+    congested_base_fee = chain.base_fee
+
+    # Step 2: Send with oracle fees and gas limits, mining a block every 10 sends
+    futures, heads = [], set()
+    for nonce in range(count):
+        tx = {"from": account.address, "to": busy.address, "value": 0, "data": "0x" + "ab" * (nonce + 1)}
+        filled, estimate, quote = oracle.fill_transaction(tx)
+        heads.add(quote.block_number)
+        signed = Account.sign_transaction(dict(filled, nonce=nonce), account.key)
+        tx_hash = chain.send_raw_transaction(signed.raw_transaction)
+        oracle.report.record(tx_hash, estimate, quote)
+        futures.append(tracker.track(tx_hash))
+        if nonce % 10 == 9:
+            chain.mine()
+    last_block = chain.block_number
+
+    outcomes = [future.result(5) for future in futures]
+    tracker.stop()
+    for outcome in outcomes:
+        oracle.report.observe(outcome)
+    quote, (reverting,) = oracle.prepare([{"from": account.address, "to": busy.address, "data": "0xdead"}])
+    heads.add(quote.block_number)
+
+    checks = [
+        congested_base_fee > 30 * 10**9,
+        all(outcome.status == "confirmed" for outcome in outcomes),
+        all(outcome.receipt["blockNumber"] <= last_block for outcome in outcomes),
+        len(oracle.report.usage) == count,
+        all(usage.gas_used < usage.gas_limit for usage in oracle.report.usage),
+        oracle.fee_history_fetches == len(heads),
+        reverting.error is not None,
+    ]
+    print(f"Base fee rose to {congested_base_fee / 10**9:.1f} gwei; {count} sends took {oracle.requests} batched "
+          f"requests and {oracle.fee_history_fetches} fee history fetches")
+    print(oracle.report.summary())
+    print("Fee and gas estimates are correct" if all(checks) else f"Fee and gas estimates are WRONG: {checks}")
+    return all(checks)
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if check_against_local_chain() else 1)
@@ -1,21 +1,21 @@
 #!/usr/bin/env python3
 from fetch_polymarket_data import fetch_polymarket_data
 import datetime
+import random
+import time
+from functools import lru_cache
+from typing import Dict, Any, Tuple
 
-def generate_html():
-    """Generate HTML using real Polymarket data"""
-    # Get the data
-    data = fetch_polymarket_data()
-    markets = data["markets"]
-    total_bet_amount = data["total_bet_amount"]
-    total_expected_profit = data["total_expected_profit"]
-    roi_percentage = data["roi_percentage"]
-    
-    # Get current date for display
-    current_date = datetime.datetime.now().strftime("%B %d, %Y")
-    
-    # Generate the HTML
-    html = f"""<!DOCTYPE html>
+CARD_CACHE_SIZE = 4096  # Rendered cards kept before the cache is reset
+RANK_LABELS = ["TOP PICK", "HIGH YIELD", "HIGH CONFIDENCE", "TRENDING", "UNDERVALUED"]
+DEFAULT_RANK_LABEL = "PICK"  # Label for cards past the named ranks
+
+# Market fields shown on a card; with the rank they form the card's cache key
+CARD_FIELDS = ("icon", "name", "confidence", "description", "yes_odds", "no_odds",
+               "bet_amount", "expected_profit", "recommendation", "url")
+
+# Static part of the page (styles and header) up to the update date
+PAGE_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -23,7 +23,7 @@ def generate_html():
     <title>PollyPicks: Top 5 Polymarket Opportunities</title>
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap" rel="stylesheet">
     <style>
-        :root {{
+        :root {
             --primary-color: #6366f1;
             --primary-dark: #4f46e5;
             --secondary-color: #10b981;
@@ -36,36 +36,36 @@ def generate_html():
             --success-color: #10b981;
             --warning-color: #f59e0b;
             --danger-color: #ef4444;
-        }}
+        }
         
-        * {{
+        * {
             box-sizing: border-box;
             margin: 0;
             padding: 0;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Inter', sans-serif;
             background-color: var(--background-color);
             color: var(--text-color);
             line-height: 1.5;
-        }}
+        }
         
-        .container {{
+        .container {
             width: 100%;
             max-width: 1200px;
             margin: 0 auto;
             padding: 2rem;
-        }}
+        }
         
-        header {{
+        header {
             background: linear-gradient(to right, var(--primary-color), var(--primary-dark));
             color: white;
             padding: 1.5rem 0;
             box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .header-content {{
+        .header-content {
             width: 100%;
             max-width: 1200px;
             margin: 0 auto;
@@ -73,25 +73,25 @@ def generate_html():
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
+        }
         
-        .logo {{
+        .logo {
             display: flex;
             align-items: center;
             gap: 0.5rem;
             font-size: 1.75rem;
             font-weight: 700;
-        }}
+        }
         
-        .date-display {{
+        .date-display {
             font-size: 1rem;
             font-weight: 500;
             padding: 0.5rem 1rem;
             background-color: rgba(255, 255, 255, 0.2);
             border-radius: 9999px;
-        }}
+        }
         
-        .section-header {{
+        .section-header {
             font-size: 1.5rem;
             font-weight: 700;
             margin: 2rem 0 1.5rem;
@@ -99,38 +99,38 @@ def generate_html():
             align-items: center;
             gap: 0.75rem;
             color: var(--primary-dark);
-        }}
+        }
         
-        .markets-grid {{
+        .markets-grid {
             display: grid;
             grid-template-columns: 1fr;
             gap: 1.5rem;
-        }}
+        }
         
-        .market-card {{
+        .market-card {
             background-color: var(--card-color);
             border-radius: 12px;
             overflow: hidden;
             box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
             transition: transform 0.2s, box-shadow 0.2s;
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .market-card:hover {{
+        .market-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 12px 24px rgba(0, 0, 0, 0.12);
-        }}
+        }
         
-        .market-header {{
+        .market-header {
             padding: 1.5rem;
             background: linear-gradient(to right, #f1f5f9, #ffffff);
             border-bottom: 1px solid var(--border-color);
             display: flex;
             align-items: center;
             gap: 1rem;
-        }}
+        }
         
-        .market-icon {{
+        .market-icon {
             font-size: 1.75rem;
             display: flex;
             align-items: center;
@@ -140,13 +140,13 @@ def generate_html():
             background-color: rgba(99, 102, 241, 0.1);
             border-radius: 10px;
             flex-shrink: 0;
-        }}
+        }
         
-        .market-title-wrapper {{
+        .market-title-wrapper {
             flex: 1;
-        }}
+        }
         
-        .market-rank {{
+        .market-rank {
             font-size: 0.8rem;
             font-weight: 700;
             color: var(--primary-color);
@@ -156,9 +156,9 @@ def generate_html():
             display: flex;
             align-items: center;
             gap: 0.5rem;
-        }}
+        }
         
-        .market-rank span {{
+        .market-rank span {
             display: inline-flex;
             align-items: center;
             justify-content: center;
@@ -168,16 +168,16 @@ def generate_html():
             color: white;
             border-radius: 999px;
             font-size: 0.75rem;
-        }}
+        }
         
-        .market-title {{
+        .market-title {
             margin: 0;
             font-size: 1.25rem;
             font-weight: 600;
             color: var(--text-color);
-        }}
+        }
         
-        .confidence-badge {{
+        .confidence-badge {
             display: flex;
             align-items: center;
             gap: 0.35rem;
@@ -188,47 +188,47 @@ def generate_html():
             background-color: #dcfce7;
             color: #166534;
             white-space: nowrap;
-        }}
+        }
         
-        .market-body {{
+        .market-body {
             padding: 1.5rem;
-        }}
+        }
         
-        .market-description {{
+        .market-description {
             color: var(--text-muted);
             margin-bottom: 1.5rem;
             font-size: 0.95rem;
             padding: 0 1.5rem;
             padding-top: 1.5rem;
-        }}
+        }
         
-        .market-details {{
+        .market-details {
             display: grid;
             grid-template-columns: repeat(2, 1fr);
             gap: 1rem;
             padding: 0 1.5rem;
-        }}
+        }
         
-        .market-detail {{
+        .market-detail {
             display: flex;
             flex-direction: column;
-        }}
+        }
         
-        .detail-label {{
+        .detail-label {
             font-size: 0.8rem;
             color: var(--text-muted);
             text-transform: uppercase;
             letter-spacing: 0.05em;
             margin-bottom: 0.25rem;
-        }}
+        }
         
-        .detail-value {{
+        .detail-value {
             font-weight: 600;
             font-size: 1.1rem;
             color: var(--text-color);
-        }}
+        }
         
-        .recommendation {{
+        .recommendation {
             margin: 1.5rem;
             padding: 1.25rem;
             background-color: #f8fafc;
@@ -237,27 +237,27 @@ def generate_html():
             align-items: center;
             justify-content: space-between;
             border: 1px dashed var(--border-color);
-        }}
+        }
         
-        .recommendation-info {{
+        .recommendation-info {
             display: flex;
             flex-direction: column;
             gap: 0.5rem;
-        }}
+        }
         
-        .recommendation-label {{
+        .recommendation-label {
             font-size: 0.85rem;
             color: var(--text-muted);
             font-weight: 500;
-        }}
+        }
         
-        .recommendation-value {{
+        .recommendation-value {
             font-weight: 800;
             font-size: 1.5rem;
             color: var(--success-color);
-        }}
+        }
         
-        .bet-button {{
+        .bet-button {
             display: inline-flex;
             align-items: center;
             justify-content: center;
@@ -272,13 +272,13 @@ def generate_html():
             cursor: pointer;
             transition: background-color 0.2s;
             text-decoration: none;
-        }}
+        }
         
-        .bet-button:hover {{
+        .bet-button:hover {
             background-color: var(--primary-dark);
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             background-color: var(--card-color);
             border-radius: 12px;
             padding: 2rem;
@@ -286,24 +286,24 @@ def generate_html():
             margin-bottom: 2rem;
             box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .summary-header {{
+        .summary-header {
             font-size: 1.25rem;
             font-weight: 700;
             margin-bottom: 1.5rem;
             padding-bottom: 0.75rem;
             border-bottom: 1px solid var(--border-color);
             color: var(--primary-dark);
-        }}
+        }
         
-        .summary-details {{
+        .summary-details {
             display: grid;
             grid-template-columns: repeat(3, 1fr);
             gap: 1.5rem;
-        }}
+        }
         
-        .summary-item {{
+        .summary-item {
             display: flex;
             flex-direction: column;
             align-items: center;
@@ -311,22 +311,22 @@ def generate_html():
             padding: 1.25rem;
             background-color: #f8fafc;
             border-radius: 10px;
-        }}
+        }
         
-        .summary-value {{
+        .summary-value {
             font-size: 1.75rem;
             font-weight: 800;
             color: var(--primary-color);
             margin-bottom: 0.5rem;
-        }}
+        }
         
-        .summary-label {{
+        .summary-label {
             font-size: 0.9rem;
             color: var(--text-muted);
             font-weight: 500;
-        }}
+        }
         
-        .chat-prompt {{
+        .chat-prompt {
             background-color: var(--card-color);
             border-radius: 12px;
             padding: 1.5rem;
@@ -334,22 +334,22 @@ def generate_html():
             box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
             border: 1px solid var(--border-color);
             text-align: center;
-        }}
+        }
         
-        .chat-title {{
+        .chat-title {
             font-size: 1.2rem;
             font-weight: 700;
             margin-bottom: 1rem;
             color: var(--primary-dark);
-        }}
+        }
         
-        .chat-description {{
+        .chat-description {
             font-size: 0.95rem;
             color: var(--text-muted);
             margin-bottom: 1.5rem;
-        }}
+        }
         
-        .chat-button {{
+        .chat-button {
             display: inline-flex;
             align-items: center;
             justify-content: center;
@@ -363,31 +363,31 @@ def generate_html():
             font-size: 1rem;
             cursor: pointer;
             transition: background-color 0.2s;
-        }}
+        }
         
-        .chat-button:hover {{
+        .chat-button:hover {
             background-color: var(--primary-dark);
-        }}
+        }
         
-        @media (min-width: 768px) {{
-            .markets-grid {{
+        @media (min-width: 768px) {
+            .markets-grid {
                 grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
+            }
+        }
         
-        @media (min-width: 1024px) {{
-            .markets-grid {{
+        @media (min-width: 1024px) {
+            .markets-grid {
                 grid-template-columns: repeat(3, 1fr);
-            }}
-        }}
+            }
+        }
         
-        footer {{
+        footer {
             text-align: center;
             padding: 2rem 0;
             color: var(--text-muted);
             border-top: 1px solid var(--border-color);
             margin-top: 3rem;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -397,7 +397,20 @@ def generate_html():
                 <span>🔮</span>
                 PollyPicks
             </div>
-            <div class="date-display">Updated: {current_date}</div>
+            <div class="date-display">Updated: """
+
+# (rank, card field values) -> rendered card
+_card_cache: Dict[Tuple[Any, ...], str] = {}
+
+@lru_cache(maxsize=8)
+def render_shell(current_date: str, year: int) -> Tuple[str, str]:
+    """
+    Render the page around the market cards
+
+    Returns:
+        Tuple of (everything before the first card, everything after the summary)
+    """
+    top = PAGE_HEAD + current_date + """</div>
         </div>
     </header>
     
@@ -408,18 +421,33 @@ def generate_html():
         
         <div class="markets-grid">
 """
+    bottom = f"""        <div class="chat-prompt">
+            <div class="chat-title">Need More Analysis?</div>
+            <p class="chat-description">Chat with our AI analyst for deeper insights on these markets or to find custom opportunities tailored to your preferences.</p>
+            <button class="chat-button">
+                <span>💬</span>
+                Chat with PollyPicks AI
+            </button>
+        </div>
+    </div>
     
-    # Add market cards
-    for i, market in enumerate(markets):
-        rank_labels = ["TOP PICK", "HIGH YIELD", "HIGH CONFIDENCE", "TRENDING", "UNDERVALUED"]
-        
-        html += f"""
-            <!-- Market {i+1} -->
+    <footer>
+        <p>PollyPicks © {year} | Real-time prediction market analytics</p>
+        <p><small>Not financial advice. Always do your own research before placing bets.</small></p>
+    </footer>
+</body>
+</html>
+"""
+    return top, bottom
+
+def _render_card(rank: int, rank_label: str, market: Dict[str, Any]) -> str:
+    return f"""
+            <!-- Market {rank} -->
             <div class="market-card">
                 <div class="market-header">
                     <div class="market-icon">{market['icon']}</div>
                     <div class="market-title-wrapper">
-                        <div class="market-rank"><span>{i+1}</span> {rank_labels[i]}</div>
+                        <div class="market-rank"><span>{rank}</span> {rank_label}</div>
                         <h2 class="market-title">{market['name']}</h2>
                     </div>
                     <div class="confidence-badge">
@@ -462,9 +490,29 @@ def generate_html():
                 </div>
             </div>
 """
-    
-    # Add summary and chat sections
-    html += f"""
+
+def render_card(index: int, market: Dict[str, Any]) -> str:
+    """
+    Render one market card, reusing the cached fragment for unchanged content
+
+    The cache key is the card's position plus every market field shown on it,
+    so any change to what the card displays renders a new fragment.
+    """
+    key = (index,) + tuple(market.get(field) for field in CARD_FIELDS)
+    card = _card_cache.get(key)
+
+    if card is None:
+        if len(_card_cache) >= CARD_CACHE_SIZE:
+            _card_cache.clear()
+        rank_label = RANK_LABELS[index] if index < len(RANK_LABELS) else DEFAULT_RANK_LABEL
+        card = _render_card(index + 1, rank_label, market)
+        _card_cache[key] = card
+
+    return card
+
+def render_summary(total_bet_amount: float, total_expected_profit: float, roi_percentage: Any) -> str:
+    """Render the portfolio summary that follows the cards"""
+    return f"""
         </div>
         
         <div class="summary-card">
@@ -485,30 +533,106 @@ def generate_html():
             </div>
         </div>
         
-        <div class="chat-prompt">
-            <div class="chat-title">Need More Analysis?</div>
-            <p class="chat-description">Chat with our AI analyst for deeper insights on these markets or to find custom opportunities tailored to your preferences.</p>
-            <button class="chat-button">
-                <span>💬</span>
-                Chat with PollyPicks AI
-            </button>
-        </div>
-    </div>
-    
-    <footer>
-        <p>PollyPicks © {datetime.datetime.now().year} | Real-time prediction market analytics</p>
-        <p><small>Not financial advice. Always do your own research before placing bets.</small></p>
-    </footer>
-</body>
-</html>
 """
-    
+
+def render_page(data: Dict[str, Any]) -> str:
+    """Assemble the page from the cached shell, cached cards and the summary"""
+    now = datetime.datetime.now()
+    top, bottom = render_shell(now.strftime("%B %d, %Y"), now.year)
+
+    parts = [top]
+    parts.extend(render_card(i, market) for i, market in enumerate(data["markets"]))
+    parts.append(render_summary(data["total_bet_amount"], data["total_expected_profit"], data["roi_percentage"]))
+    parts.append(bottom)
+    return "".join(parts)
+
+def generate_html(data=None, save=True):
+    """
+    Generate HTML using real Polymarket data
+
+    Args:
+        data: Dataset from fetch_polymarket_data; fetched when omitted
+        save: Also write the page to real_top5_picks.html
+    """
+    # Get the data
+    if data is None:
+        data = fetch_polymarket_data()
+
+    # Generate the HTML
+    html = render_page(data)
+
     # Save the HTML to a file
-    with open("real_top5_picks.html", "w") as f:
-        f.write(html)
-    
+    if save:
+        with open("real_top5_picks.html", "w") as f:
+            f.write(html)
+
     return html
 
+def benchmark(num_cards: int = 1000, rounds: int = 20, changed_per_round: int = 10, seed: int = 5) -> None:
+    """
+    Time rendering a page of ``num_cards`` cards
+
+    Compares formatting the shell and every card on each render with the
+    cached path, cold (empty caches) and warm (a few markets change between
+    renders, as between two refreshes).
+    """
+    rng = random.Random(seed)
+    markets = [
+        {
+            "icon": rng.choice(["📉", "📈", "🏀", "🗳️", "🌡️"]),
+            "name": f"Synthetic market {i}?",
+            "description": "This market resolves to 'Yes' if the synthetic event happens. " * 3,
+            "yes_odds": f"{rng.randint(1, 99)}%",
+            "no_odds": f"{rng.randint(1, 99)}%",
+            "recommendation": rng.choice(["YES", "NO"]),
+            "bet_amount": f"${rng.randint(50, 300)}",
+            "expected_profit": f"${rng.uniform(10, 200):.2f}",
+            "confidence": rng.choice(["High", "Medium", "Low"]),
+            "url": f"https://polymarket.com/event/synthetic-{i}",
+        }
+        for i in range(num_cards)
+    ]
+    data = {"markets": markets, "total_bet_amount": 1000.0, "total_expected_profit": 250.0, "roi_percentage": 25.0}
+
+    def render_uncached() -> str:
+        render_shell.cache_clear()
+        _card_cache.clear()
+        now = datetime.datetime.now()
+        top, bottom = render_shell(now.strftime("%B %d, %Y"), now.year)
+        cards = [
+            _render_card(i + 1, RANK_LABELS[i] if i < len(RANK_LABELS) else DEFAULT_RANK_LABEL, market)
+            for i, market in enumerate(markets)
+        ]
+        return top + "".join(cards) + render_summary(1000.0, 250.0, 25.0) + bottom
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        uncached = render_uncached()
+    uncached_elapsed = (time.perf_counter() - started) / rounds
+
+    started = time.perf_counter()
+    cold = render_page(data)
+    cold_elapsed = time.perf_counter() - started
+
+    warm_elapsed = 0.0
+    for _ in range(rounds):
+        # A refresh typically moves the odds of a handful of markets
+        for market in rng.sample(markets, changed_per_round):
+            market["yes_odds"] = f"{rng.randint(1, 99)}%"
+        started = time.perf_counter()
+        render_page(data)
+        warm_elapsed += (time.perf_counter() - started) / rounds
+
+    print(f"Cards: {num_cards:,}  Page size: {len(cold) / 1024:.0f} KB  Same output: {cold == uncached}")
+    print(f"Format everything: {uncached_elapsed * 1000:.2f} ms/page")
+    print(f"Cached, cold:      {cold_elapsed * 1000:.2f} ms/page")
+    print(f"Cached, warm:      {warm_elapsed * 1000:.2f} ms/page ({changed_per_round} changed cards per render)")
+
 if __name__ == "__main__":
-    generate_html()
-    print("HTML generated and saved to real_top5_picks.html") 
\ No newline at end of file
+    import sys
+
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        generate_html()
+        print("HTML generated and saved to real_top5_picks.html")
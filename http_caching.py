@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_SIZE = 1024  # Smaller bodies are sent uncompressed
+COMPRESSIBLE_TYPES = {"text/html", "text/plain", "text/css", "application/json", "application/javascript"}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSED_CACHE_SIZE = 64  # Compressed bodies kept, keyed by ETag and encoding
+DEFAULT_CACHE_CONTROL = "no-cache"  # Clients may store responses but must revalidate
+
+_compressed: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+_first_seen: Dict[Tuple[str, str], float] = {}
+_lock = threading.Lock()
+
+def body_etag(body: bytes) -> str:
+    """Content hash used as the ETag of a response body"""
+    return hashlib.sha1(body).hexdigest()
+
+def _last_modified_for(path: str, etag: str) -> float:
+    """When this path first served this ETag; stands in for Last-Modified of generated pages"""
+    key = (path, etag)
+    with _lock:
+        seen = _first_seen.get(key)
+        if seen is None:
+            if len(_first_seen) >= 4096:
+                _first_seen.clear()
+            seen = _first_seen[key] = time.time()
+        return seen
+
+def _pick_encoding() -> Optional[str]:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+def _compress(body: bytes, etag: str, encoding: str) -> bytes:
+    """Compress a body once per (ETag, encoding) and reuse the result"""
+    key = (etag, encoding)
+    with _lock:
+        cached = _compressed.get(key)
+        if cached is not None:
+            _compressed.move_to_end(key)
+            return cached
+
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    with _lock:
+        _compressed[key] = compressed
+        if len(_compressed) > COMPRESSED_CACHE_SIZE:
+            _compressed.popitem(last=False)
+    return compressed
+
+def _finalize(response: Response) -> Response:
+    """
+    Add validators, answer conditional requests with 304, and compress
+
+    Only successful, non-streamed GET/HEAD responses are touched. Routes can
+    set their own ETag and Last-Modified (e.g. from a file's mtime); otherwise
+    the ETag is a hash of the body and Last-Modified is when that body was
+    first served. ETags are weak because the same content may be sent with
+    different content encodings.
+    """
+    if request.method not in ("GET", "HEAD") or response.status_code != 200:
+        return response
+    if response.is_streamed or response.direct_passthrough:
+        return response
+
+    body = response.get_data()
+    etag, _ = response.get_etag()
+    if etag is None:
+        etag = body_etag(body)
+        response.set_etag(etag, weak=True)
+    if response.last_modified is None:
+        response.last_modified = _last_modified_for(request.path, etag)
+    if "Cache-Control" not in response.headers:
+        response.headers["Cache-Control"] = DEFAULT_CACHE_CONTROL
+
+    response.vary.add("Accept-Encoding")
+    response.make_conditional(request)
+    if response.status_code == 304:
+        return response
+
+    if response.mimetype in COMPRESSIBLE_TYPES and len(body) >= COMPRESS_MIN_SIZE:
+        encoding = _pick_encoding()
+        if encoding is not None:
+            response.set_data(_compress(body, etag, encoding))
+            response.headers["Content-Encoding"] = encoding
+
+    return response
+
+def init_http_caching(app: Flask) -> None:
+    """Apply ETag / Last-Modified, 304 handling and compression to every route of an app"""
+    app.after_request(_finalize)
+
+class FileCache:
+    """
+    In-memory copies of files, re-read only when their mtime or size changes
+
+    Each entry keeps the bytes, the mtime and an ETag, so routes can serve a
+    file-backed page with validators without touching the disk beyond a stat.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[int, int, bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[Tuple[bytes, float, str]]:
+        """
+        Returns:
+            Tuple of (content, mtime, etag), or None if the file does not exist
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                return entry[2], stat.st_mtime, entry[3]
+
+        with open(path, "rb") as f:
+            content = f.read()
+
+        etag = body_etag(content)
+        with self._lock:
+            self._files[path] = (stat.st_mtime_ns, stat.st_size, content, etag)
+        return content, stat.st_mtime, etag
+
+def check_http_caching() -> bool:
+    """Conditional requests, HEAD and content negotiation through the Flask test client, offline"""
+    body = "\n".join(f"Market {index}: 0.{index % 100:02d}" for index in range(200))
+    app = Flask(__name__)
+    init_http_caching(app)
+
+    @app.route("/page")
+    def page() -> Response:
+        return Response(body, mimetype="text/plain")
+
+    @app.route("/small")
+    def small() -> Response:
+        return Response("ok", mimetype="text/plain")
+
+    client = app.test_client()
+    checks = {}
+
+    # Step 1: A plain GET carries validators and is sent uncompressed
+    first = client.get("/page")
+    etag = first.headers.get("ETag")
+    last_modified = first.headers.get("Last-Modified")
+    checks["validators"] = first.status_code == 200 and bool(etag) and bool(last_modified)
+    checks["identity"] = "Content-Encoding" not in first.headers and first.get_data(as_text=True) == body
+    checks["vary"] = "Accept-Encoding" in first.headers.get("Vary", "")
+
+    # Step 2: Matching validators get an empty 304; a stale date gets the page again
+    not_modified = client.get("/page", headers={"If-None-Match": etag})
+    checks["if_none_match"] = not_modified.status_code == 304 and not not_modified.get_data()
+    checks["if_none_match_other"] = client.get("/page", headers={"If-None-Match": '"other"'}).status_code == 200
+    checks["if_modified_since"] = client.get("/page", headers={"If-Modified-Since": last_modified}).status_code == 304
+    old_date = "Mon, 01 Jan 2001 00:00:00 GMT"
+    checks["if_modified_since_old"] = client.get("/page", headers={"If-Modified-Since": old_date}).status_code == 200
+
+    # Step 3: HEAD sends the same validators and no body
+    head = client.head("/page")
+    checks["head"] = head.status_code == 200 and head.headers.get("ETag") == etag and not head.get_data()
+
+    # Step 4: Bodies are compressed with the best encoding the client accepts
+    gzipped = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    checks["gzip"] = (gzipped.headers.get("Content-Encoding") == "gzip"
+                      and gzip.decompress(gzipped.get_data()).decode() == body
+                      and gzipped.headers.get("ETag") == etag)
+    if brotli is not None:
+        brotlied = client.get("/page", headers={"Accept-Encoding": "gzip, br"})
+        checks["brotli"] = (brotlied.headers.get("Content-Encoding") == "br"
+                            and brotli.decompress(brotlied.get_data()).decode() == body)
+    small_response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    checks["small_identity"] = "Content-Encoding" not in small_response.headers
+
+    failed = [name for name, passed in checks.items() if not passed]
+    print(f"Ran {len(checks)} HTTP caching checks" + ("" if brotli is not None else " (brotli not installed)"))
+    print("HTTP caching works as expected" if not failed else f"HTTP caching checks FAILED: {failed}")
+    return not failed
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if check_http_caching() else 1)
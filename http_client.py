@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import requests
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10  # Seconds, used when a call does not pass its own timeout
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+}
+
+# Maximum concurrent requests per host; also sizes each host's keep-alive pool
+HOST_CONCURRENCY = {
+    "gamma-api.polymarket.com": 16,
+    "clob.polymarket.com": 16,
+    "polygon-rpc.com": 8,
+}
+DEFAULT_HOST_CONCURRENCY = 8
+
+_sessions: Dict[str, requests.Session] = {}
+_host_limits: Dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+def get_session(url: str) -> requests.Session:
+    """
+    Get the shared keep-alive session for the host of a URL
+
+    Each host gets one session whose connection pool is sized to that host's
+    concurrency limit, so repeated calls reuse warm TCP/TLS connections. The
+    session can also be handed to other clients, e.g.
+    ``Web3.HTTPProvider(url, session=get_session(url))``.
+    """
+    host = _host(url)
+
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            pool_size = HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            _sessions[host] = session
+            _host_limits[host] = threading.BoundedSemaphore(pool_size)
+
+    return session
+
+@contextmanager
+def _host_slot(url: str) -> Iterator[None]:
+    """Hold one of the host's concurrency slots for the duration of a request"""
+    get_session(url)
+    limit = _host_limits[_host(url)]
+    with limit:
+        yield
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """
+    Send a request through the shared session for the URL's host
+
+    Accepts the same keyword arguments as ``requests.request``. Headers are
+    merged over DEFAULT_HEADERS and ``timeout`` defaults to DEFAULT_TIMEOUT.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    session = get_session(url)
+
+    with _host_slot(url):
+        return session.request(method, url, **kwargs)
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """Send a GET request through the shared client"""
+    return request("GET", url, **kwargs)
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    """Send a POST request through the shared client"""
+    return request("POST", url, **kwargs)
+
+def close_all() -> None:
+    """Close every pooled session, e.g. before a process exits"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _host_limits.clear()
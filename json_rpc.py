@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+import itertools
+import os
+from typing import Any, Dict, List, Tuple, Union
+import http_client
+
+POLYGON_RPC_URL = os.getenv("POLYGON_RPC_URL", "https://polygon-rpc.com")
+
+# First 4 bytes of keccak256 of the ERC20 function signatures
+BALANCE_OF_SELECTOR = "0x70a08231"  # balanceOf(address)
+ALLOWANCE_SELECTOR = "0xdd62ed3e"  # allowance(address,address)
+
+# (method, params) of one JSON-RPC call
+RpcCall = Tuple[str, List[Any]]
+
+_ids = itertools.count(1)
+
+class JsonRpcError(Exception):
+    """Error object returned by the node for one call"""
+
+    def __init__(self, error: Dict[str, Any]):
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(f"{error.get('message', 'JSON-RPC error')} (code {self.code})")
+
+def encode_address(address: str) -> str:
+    """ABI-encode an address as a 32-byte word (hex, no 0x)"""
+    return address[2:].lower().zfill(64)
+
+def decode_uint(result: str) -> int:
+    """Decode a uint256 return value; an empty result ("0x") is 0"""
+    return int(result, 16) if result not in ("", "0x") else 0
+
+def eth_call(to: str, data: str, block: str = "latest") -> RpcCall:
+    return "eth_call", [{"to": to, "data": data}, block]
+
+def balance_of(token: str, owner: str, block: str = "latest") -> RpcCall:
+    """ERC20 balanceOf(owner) call"""
+    return eth_call(token, BALANCE_OF_SELECTOR + encode_address(owner), block)
+
+def allowance(token: str, owner: str, spender: str, block: str = "latest") -> RpcCall:
+    """ERC20 allowance(owner, spender) call"""
+    return eth_call(token, ALLOWANCE_SELECTOR + encode_address(owner) + encode_address(spender), block)
+
+def batch_call(calls: List[RpcCall], url: str = POLYGON_RPC_URL) -> List[Union[Any, JsonRpcError]]:
+    """
+    Send many JSON-RPC calls in a single batch request
+
+    Responses are matched back to calls by id, since nodes may answer a batch
+    in any order.
+
+    Returns:
+        One entry per call, in call order: the call's result, or a
+        JsonRpcError if the node returned an error for it
+
+    Raises:
+        JsonRpcError if the node rejected the whole batch
+    """
+    if not calls:
+        return []
+
+    ids = [next(_ids) for _ in calls]
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": call_id}
+        for call_id, (method, params) in zip(ids, calls)
+    ]
+
+    response = http_client.post(url, json=payload)
+    response.raise_for_status()
+    replies = response.json()
+
+    # A single error object means the batch itself was refused
+    if isinstance(replies, dict):
+        raise JsonRpcError(replies.get("error") or {"message": f"Unexpected batch reply: {replies}"})
+
+    by_id = {reply.get("id"): reply for reply in replies}
+    results = []
+    for call_id in ids:
+        reply = by_id.get(call_id)
+        if reply is None:
+            results.append(JsonRpcError({"message": "No reply for call in batch"}))
+        elif "error" in reply:
+            results.append(JsonRpcError(reply["error"]))
+        else:
+            results.append(reply.get("result"))
+    return results
+
+def request(method: str, params: List[Any], url: str = POLYGON_RPC_URL) -> Any:
+    """
+    Send one JSON-RPC call
+
+    Raises:
+        JsonRpcError if the node returned an error
+    """
+    response = http_client.post(url, json={"jsonrpc": "2.0", "method": method, "params": params, "id": next(_ids)})
+    response.raise_for_status()
+    reply = response.json()
+    if "error" in reply:
+        raise JsonRpcError(reply["error"])
+    return reply.get("result")
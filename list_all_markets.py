@@ -1,29 +1,30 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import datetime
+from market_store import load_local_markets
 
-def list_all_markets():
+def list_all_markets(local=False):
     """Fetch and display all active markets from Polymarket with end dates"""
     
-    # API endpoint for active markets
-    url = "https://gamma-api.polymarket.com/markets"
-    
-    # Parameters to get all active markets
-    params = {"limit": 100, "active": True}
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
-    }
-    
-    # Make the request
-    response = requests.get(url, params=params, headers=headers)
-    
-    if response.status_code != 200:
-        print(f"Error: Failed to fetch markets (Status code: {response.status_code})")
-        return
-    
-    # Parse markets
-    markets = response.json()
+    if local:
+        # Query the local market store after an incremental sync
+        markets = load_local_markets(active=True, closed=False)
+    else:
+        # API endpoint for active markets
+        url = "https://gamma-api.polymarket.com/markets"
+        
+        # Parameters to get all active markets
+        params = {"limit": 100, "active": True}
+        
+        # Make the request
+        response = http_client.get(url, params=params)
+        
+        if response.status_code != 200:
+            print(f"Error: Failed to fetch markets (Status code: {response.status_code})")
+            return
+        
+        # Parse markets
+        markets = response.json()
     
     # Print each market with end date
     print(f"Found {len(markets)} active markets on Polymarket:\n")
@@ -46,4 +47,5 @@ def list_all_markets():
         print()
 
 if __name__ == "__main__":
-    list_all_markets() 
\ No newline at end of file
+    import sys
+    list_all_markets(local="--local" in sys.argv) 
\ No newline at end of file
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+import asyncio
+import os
+import random
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import openai
+from openai.types.responses import Response
+from llm_cache import ResponseCache
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))  # OpenAI calls in flight at once
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "120"))  # Seconds per attempt
+LLM_MAX_RETRIES = 3  # Extra attempts after a rate limit, timeout or connection error
+NON_RETRYABLE_CODES = {"insufficient_quota"}  # 429s that waiting will not fix
+RETRY_BASE_DELAY = 2.0  # Seconds; doubled on every retry
+
+# One batch result: (label, response, served_from_cache, error)
+BatchResult = Tuple[str, Optional[Response], bool, Optional[BaseException]]
+
+def retry_delay(error: BaseException, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed call
+
+    Honours the Retry-After header of a 429 when OpenAI sends one; otherwise
+    backs off exponentially with a little jitter so parallel calls that were
+    throttled together do not retry together.
+    """
+    if isinstance(error, openai.RateLimitError):
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            pass
+    return RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, 1)
+
+async def create_with_retry(
+    client: openai.AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    request: Dict[str, Any],
+    timeout: float = LLM_CALL_TIMEOUT,
+    max_retries: int = LLM_MAX_RETRIES,
+    label: str = "request"
+) -> Response:
+    """
+    Run one responses.create call under the concurrency cap
+
+    Rate limits, timeouts and connection errors are retried; the slot is
+    released while waiting so other calls can use it. Any other error, a
+    429 for an exhausted quota, or the last failed attempt, is raised.
+    """
+    for attempt in range(max_retries + 1):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(client.responses.create(**request), timeout)
+            except (openai.RateLimitError, openai.APIConnectionError, asyncio.TimeoutError) as e:
+                if getattr(e, "code", None) in NON_RETRYABLE_CODES:
+                    raise
+                if attempt == max_retries:
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise TimeoutError(f"No response within {timeout:.0f}s after {max_retries + 1} attempts") from e
+                    raise
+                delay = retry_delay(e, attempt)
+                print(f"⏳ {label}: {type(e).__name__}, retrying in {delay:.1f}s (attempt {attempt + 2}/{max_retries + 1})")
+        await asyncio.sleep(delay)
+
+async def fan_out(
+    client: openai.AsyncOpenAI,
+    requests: List[Tuple[str, Dict[str, Any]]],
+    cache: Optional[ResponseCache] = None,
+    concurrency: int = LLM_CONCURRENCY,
+    timeout: float = LLM_CALL_TIMEOUT
+) -> AsyncIterator[BatchResult]:
+    """
+    Run labelled requests concurrently and yield each result as it completes
+
+    Cached responses are yielded first without a call. Failures are yielded
+    with their error rather than raised, so one bad query does not stop the
+    rest of the batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    # The SDK's own retries would hold a slot while sleeping; retries happen here instead
+    client = client.with_options(max_retries=0)
+
+    async def run(label: str, request: Dict[str, Any]) -> BatchResult:
+        try:
+            response = await create_with_retry(client, semaphore, request, timeout, label=label)
+        except Exception as e:
+            return label, None, False, e
+        if cache is not None:
+            cache.store(request, response)
+        return label, response, False, None
+
+    pending = []
+    for label, request in requests:
+        cached = cache.lookup(request) if cache is not None else None
+        if cached is not None:
+            yield label, cached, True, None
+        else:
+            pending.append(run(label, request))
+
+    for finished in asyncio.as_completed(pending):
+        yield await finished
+
+def run_batch(
+    requests: List[Tuple[str, Dict[str, Any]]],
+    on_result: Callable[[str, Optional[Response], bool, Optional[BaseException]], None],
+    cache: Optional[ResponseCache] = None,
+    api_key: Optional[str] = None,
+    concurrency: int = LLM_CONCURRENCY,
+    timeout: float = LLM_CALL_TIMEOUT
+) -> None:
+    """
+    Blocking entry point for scripts: fan out the requests and hand each
+    result to ``on_result`` in completion order
+    """
+    async def main() -> None:
+        client = openai.AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        try:
+            async for label, response, cached, error in fan_out(client, requests, cache, concurrency, timeout):
+                on_result(label, response, cached, error)
+        finally:
+            await client.close()
+
+    asyncio.run(main())
+
+def batch_queries(args: List[str]) -> Optional[List[str]]:
+    """
+    Parse ``--batch a, b, c`` from CLI args (``sys.argv[1:]``, without the program name)
+
+    Returns:
+        The comma-separated queries around --batch, or None without the flag
+
+    Raises:
+        SystemExit with a usage message if --batch is given no queries
+    """
+    if "--batch" not in args:
+        return None
+    words = [arg for arg in args if arg != "--batch"]
+    queries = [query.strip() for query in " ".join(words).split(",") if query.strip()]
+    if not queries:
+        raise SystemExit('--batch needs a comma-separated list of queries, e.g. --batch "crypto, NBA"')
+    return queries
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import datetime
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from openai.types.responses import Response
+from content_cache import ContentCache, cache_key
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "disk")  # disk, memory or off
+DAY_SECONDS = 24 * 60 * 60
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so re-indented copies of a prompt share a cache entry"""
+    return " ".join(prompt.split())
+
+def response_key(model: str, tools: Optional[List[Dict[str, Any]]], prompt: str, **options: Any) -> str:
+    """Cache key for a Responses API call: model, tools config, normalized prompt and any other options"""
+    return cache_key("openai", {
+        "model": model,
+        "tools": tools or [],
+        "input": normalize_prompt(prompt),
+        "options": options
+    })
+
+class MemoryBackend:
+    """In-process backend with the same get/set interface as ContentCache"""
+
+    def __init__(self):
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+
+def make_backend(kind: str = LLM_CACHE_BACKEND) -> Optional[Any]:
+    """
+    Build a cache backend by name
+
+    Returns:
+        A ContentCache for "disk", a MemoryBackend for "memory", None for "off"
+    """
+    if kind == "disk":
+        return ContentCache(LLM_CACHE_PATH, ttl=DAY_SECONDS)
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "off":
+        return None
+    raise ValueError(f"Unknown LLM cache backend {kind!r}")
+
+class ResponseCache:
+    """
+    Cache for ``client.responses.create`` calls
+
+    Responses are reused only on the day they were created: the prompts ask
+    about "today" and "tomorrow", so an answer from yesterday is stale even
+    when the prompt text is identical.
+    """
+
+    def __init__(self, client: Any, backend: Optional[Any] = None):
+        self.client = client
+        self.backend = backend
+
+    def lookup(self, request: Dict[str, Any]) -> Optional[Response]:
+        """Today's cached response for a request (the kwargs of responses.create), if any"""
+        if self.backend is None:
+            return None
+
+        cached = self.backend.get(response_key(**_key_fields(request)))
+        if cached is None or cached.get("day") != datetime.date.today().isoformat():
+            return None
+        try:
+            return Response.model_validate(cached["response"])
+        except Exception:
+            # Stored by an incompatible SDK version; fetch it again
+            return None
+
+    def store(self, request: Dict[str, Any], response: Response) -> None:
+        """Remember a fresh response for the rest of the day"""
+        if self.backend is None:
+            return
+        self.backend.set(
+            response_key(**_key_fields(request)),
+            {"day": datetime.date.today().isoformat(), "response": response.model_dump(mode="json")}
+        )
+
+    def create(self, **request: Any) -> Tuple[Response, bool]:
+        """
+        Create a response, or return today's cached one for the same call
+
+        Args:
+            request: Keyword arguments for client.responses.create
+
+        Returns:
+            Tuple of (response, served_from_cache)
+        """
+        cached = self.lookup(request)
+        if cached is not None:
+            return cached, True
+
+        response = self.client.responses.create(**request)
+        self.store(request, response)
+        return response, False
+
+def _key_fields(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Split responses.create kwargs into response_key arguments"""
+    options = dict(request)
+    return {
+        "model": options.pop("model"),
+        "tools": options.pop("tools", None),
+        "prompt": options.pop("input"),
+        **options
+    }
+
+def cache_flag(args: List[str]) -> Optional[Any]:
+    """
+    Pick the backend for a CLI run, removing --no-cache / --memory-cache from args
+    """
+    kind = LLM_CACHE_BACKEND
+    if "--no-cache" in args:
+        args.remove("--no-cache")
+        kind = "off"
+    if "--memory-cache" in args:
+        args.remove("--memory-cache")
+        kind = "memory"
+    return make_backend(kind)
+
+def print_cache_status(label: str, cached: bool) -> None:
+    """Tell the user whether a call was answered from the cache"""
+    if cached:
+        print(f"⚡ {label}: served from cache (today's response, no web search made)")
+    else:
+        print(f"🌐 {label}: fresh response from OpenAI")
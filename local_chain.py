@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+import copy
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+import rlp
+from eth_abi import encode, decode
+from eth_account import Account
+from eth_utils import keccak
+from web3.providers.base import BaseProvider
+from multicall import (
+    MULTICALL3_ADDRESS,
+    AGGREGATE3_SELECTOR,
+    GET_BLOCK_NUMBER_SELECTOR,
+    ERC20_BALANCE_OF_SELECTOR,
+    ERC20_ALLOWANCE_SELECTOR,
+    ERC1155_BALANCE_OF_SELECTOR,
+)
+
+LOCAL_CHAIN_ID = 137  # Polygon, so transactions signed for mainnet are accepted
+BLOCK_GAS_TARGET = 15_000_000  # Gas per block at which the base fee stays put
+BASE_FEE_CHANGE_DENOMINATOR = 8  # EIP-1559: the base fee moves at most 1/8 per block
+
+class Revert(Exception):
+    """A call that reverted on the local chain"""
+
+class RpcError(Exception):
+    """A JSON-RPC error returned by the local node, such as nonce too low"""
+
+    def __init__(self, message: str, code: int = -32000):
+        self.code = code
+        super().__init__(message)
+
+def decode_raw_transaction(raw: bytes) -> Dict[str, Any]:
+    """Sender, nonce, gas and fee fields of a signed legacy or EIP-1559 transaction"""
+    sender = Account.recover_transaction(raw)
+    if raw[0] == 2:
+        fields = rlp.decode(raw[1:])
+        nonce, priority_fee, max_fee, gas, to, value, data = fields[1:8]
+        fees = {"maxPriorityFeePerGas": _int(priority_fee), "maxFeePerGas": _int(max_fee)}
+    else:
+        nonce, gas_price, gas, to, value, data = rlp.decode(raw)[:6]
+        fees = {"gasPrice": _int(gas_price)}
+
+    return dict(
+        fees,
+        hash="0x" + keccak(raw).hex(),
+        sender=sender.lower(),
+        nonce=_int(nonce),
+        gas=_int(gas),
+        to="0x" + to.hex() if to else None,
+        data=bytes(data)
+    )
+
+def _int(value: bytes) -> int:
+    return int.from_bytes(value, "big")
+
+def intrinsic_gas(data: bytes) -> int:
+    """Gas a plain call uses before execution: 21000 plus calldata cost"""
+    return 21_000 + sum(16 if byte else 4 for byte in data)
+
+class LocalChain:
+    """
+    In-memory stand-in for Polygon's read path
+
+    Holds ERC20 balances and allowances and ERC1155 (Conditional Tokens)
+    position balances, snapshotted every time a block is mined, and answers
+    eth_call for those contracts and for Multicall3 (aggregate3 and
+    getBlockNumber) at any mined block. An instance is a multicall
+    Transport, so it can stand in for rpc_transport() or web3_transport().
+
+    Blocks also carry an EIP-1559 base fee that follows the gas their
+    transactions use, so eth_feeHistory and fee-capped inclusion behave
+    like the real network.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Dict[Tuple, int]] = {"erc20": {}, "allowance": {}, "erc1155": {}}
+        self._erc20_tokens = set()
+        self._erc1155_contracts = set()
+        # State at each mined block; block 0 is empty
+        self._blocks = [copy.deepcopy(self._pending)]
+        self.eth_calls = 0
+
+        # Transactions: confirmed nonce per sender, unmined pool, receipts and transactions by hash
+        self._nonces: Dict[str, int] = {}
+        self._mempool: List[Dict[str, Any]] = []
+        self._receipts: Dict[str, Dict[str, Any]] = {}
+        self._transactions: Dict[str, Dict[str, Any]] = {}
+        self._tx_lock = threading.Lock()
+        self.gas_used = intrinsic_gas  # tx data -> gas the transaction uses when mined
+
+        # Fees: base fee of the next block, and (base fee, gas used, priority fees paid) per mined block
+        self.base_fee = 30 * 10**9
+        self._fees: List[Tuple[int, int, List[int]]] = [(self.base_fee, 0, [])]
+
+    @property
+    def block_number(self) -> int:
+        return len(self._blocks) - 1
+
+    def set_erc20_balance(self, token: str, owner: str, amount: int) -> None:
+        self._erc20_tokens.add(token.lower())
+        self._pending["erc20"][(token.lower(), owner.lower())] = amount
+
+    def set_allowance(self, token: str, owner: str, spender: str, amount: int) -> None:
+        self._erc20_tokens.add(token.lower())
+        self._pending["allowance"][(token.lower(), owner.lower(), spender.lower())] = amount
+
+    def set_position_balance(self, contract: str, owner: str, position_id: int, amount: int) -> None:
+        self._erc1155_contracts.add(contract.lower())
+        self._pending["erc1155"][(contract.lower(), owner.lower(), int(position_id))] = amount
+
+    def mine(self) -> int:
+        """
+        Seal the pending state into a new block and return its number
+
+        Pooled transactions are included in nonce order for each sender, up
+        to the first gap; transactions after a gap, or whose fee cap is below
+        the block's base fee, wait for a later block. A transaction that
+        needs more gas than its limit is mined as failed.
+        """
+        with self._tx_lock:
+            number = self.block_number + 1
+            base_fee = self.base_fee
+            included, block_gas, priority_fees = [], 0, []
+            for tx in sorted(self._mempool, key=lambda tx: (tx["sender"], tx["nonce"])):
+                if tx["nonce"] != self._nonces.get(tx["sender"], 0):
+                    continue
+                fee_cap = tx.get("gasPrice") or tx["maxFeePerGas"]
+                if fee_cap < base_fee:
+                    continue
+                priority_fee = fee_cap - base_fee if "gasPrice" in tx else min(tx["maxPriorityFeePerGas"], fee_cap - base_fee)
+                needed = self.gas_used(tx["data"])
+
+                self._nonces[tx["sender"]] = tx["nonce"] + 1
+                included.append(tx)
+                block_gas += min(tx["gas"], needed)
+                priority_fees.append(priority_fee)
+                self._receipts[tx["hash"]] = {
+                    "transactionHash": tx["hash"],
+                    "blockNumber": number,
+                    "from": tx["sender"],
+                    "to": tx["to"],
+                    "nonce": tx["nonce"],
+                    "status": 1 if needed <= tx["gas"] else 0,
+                    "gasUsed": min(tx["gas"], needed),
+                    "effectiveGasPrice": base_fee + priority_fee,
+                }
+            mined = {tx["hash"] for tx in included}
+            self._mempool = [tx for tx in self._mempool if tx["hash"] not in mined]
+            self._blocks.append(copy.deepcopy(self._pending))
+
+            self._fees.append((base_fee, block_gas, sorted(priority_fees)))
+            delta = base_fee * (block_gas - BLOCK_GAS_TARGET) // BLOCK_GAS_TARGET // BASE_FEE_CHANGE_DENOMINATOR
+            self.base_fee = max(base_fee + delta, 1)
+            return self.block_number
+
+    def fee_history(self, block_count: int, newest_block: Union[int, str], percentiles: List[float]) -> Dict[str, Any]:
+        """
+        eth_feeHistory: base fees (plus the next block's), gas used ratios and
+        the priority fee at each percentile for the blocks up to newest_block
+        """
+        newest = self.block_number if newest_block in ("latest", "pending") else int(newest_block)
+        oldest = max(newest - block_count + 1, 0)
+        blocks = self._fees[oldest:newest + 1]
+        next_base_fee = self._fees[newest + 1][0] if newest < self.block_number else self.base_fee
+
+        def reward(tips: List[int]) -> List[int]:
+            if not tips:
+                return [0 for _ in percentiles]
+            return [tips[min(int(len(tips) * percentile / 100), len(tips) - 1)] for percentile in percentiles]
+
+        return {
+            "oldestBlock": oldest,
+            "baseFeePerGas": [base_fee for base_fee, _, _ in blocks] + [next_base_fee],
+            "gasUsedRatio": [gas / (2 * BLOCK_GAS_TARGET) for _, gas, _ in blocks],
+            "reward": [reward(tips) for _, _, tips in blocks],
+        }
+
+    def transaction_count(self, address: str, block: Union[int, str] = "latest") -> int:
+        """Nonce of an address; "pending" also counts its pooled transactions without a gap"""
+        with self._tx_lock:
+            count = self._nonces.get(address.lower(), 0)
+            if block == "pending":
+                pooled = {tx["nonce"] for tx in self._mempool if tx["sender"] == address.lower()}
+                while count in pooled:
+                    count += 1
+            return count
+
+    def send_raw_transaction(self, raw: bytes) -> str:
+        """
+        Add a signed transaction to the pool
+
+        Raises:
+            RpcError "nonce too low" if the nonce is already mined, or
+            "replacement transaction underpriced" if one is pooled with it
+        """
+        tx = decode_raw_transaction(bytes(raw))
+        with self._tx_lock:
+            if tx["nonce"] < self._nonces.get(tx["sender"], 0):
+                raise RpcError("nonce too low")
+            for pooled in self._mempool:
+                if pooled["sender"] == tx["sender"] and pooled["nonce"] == tx["nonce"]:
+                    raise RpcError("replacement transaction underpriced")
+            self._mempool.append(tx)
+            self._transactions[tx["hash"]] = tx
+        return tx["hash"]
+
+    def transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """A pooled or mined transaction, or None if the chain never received it"""
+        tx_hash = tx_hash if isinstance(tx_hash, str) else "0x" + bytes(tx_hash).hex()
+        with self._tx_lock:
+            return self._transactions.get(tx_hash.lower())
+
+    def receipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """Receipt of a mined transaction, or None while it is pending or unknown"""
+        return self._receipts.get(tx_hash.lower())
+
+    def handle(self, method: str, params: List[Any]) -> Any:
+        """
+        Answer one JSON-RPC call the way a node would (hex quantities)
+
+        Raises:
+            RpcError for failed calls and unsupported methods
+        """
+        if method == "eth_chainId":
+            return hex(LOCAL_CHAIN_ID)
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_gasPrice":
+            return hex(self.base_fee)
+        if method == "eth_feeHistory":
+            count, newest = params[0], params[1]
+            count = int(count, 16) if isinstance(count, str) else count
+            if isinstance(newest, str) and newest.startswith("0x"):
+                newest = int(newest, 16)
+            history = self.fee_history(count, newest, params[2] if len(params) > 2 else [])
+            return {
+                "oldestBlock": hex(history["oldestBlock"]),
+                "baseFeePerGas": [hex(fee) for fee in history["baseFeePerGas"]],
+                "gasUsedRatio": history["gasUsedRatio"],
+                "reward": [[hex(fee) for fee in fees] for fees in history["reward"]],
+            }
+        if method == "eth_estimateGas":
+            data = params[0].get("data") or params[0].get("input") or "0x"
+            try:
+                return hex(self.gas_used(bytes.fromhex(data[2:])))
+            except Revert as e:
+                raise RpcError(f"execution reverted: {e}", code=3)
+        if method == "eth_getTransactionCount":
+            return hex(self.transaction_count(params[0], params[1] if len(params) > 1 else "latest"))
+        if method == "eth_sendRawTransaction":
+            raw = params[0]
+            return self.send_raw_transaction(bytes.fromhex(raw[2:]) if isinstance(raw, str) else raw)
+        if method == "eth_getTransactionByHash":
+            tx = self.transaction(params[0])
+            if tx is None:
+                return None
+            return {
+                "hash": tx["hash"],
+                "from": tx["sender"],
+                "to": tx["to"],
+                "nonce": hex(tx["nonce"]),
+                "gas": hex(tx["gas"]),
+                "input": "0x" + tx["data"].hex(),
+                "value": "0x0",
+                "blockNumber": hex(self._receipts[tx["hash"]]["blockNumber"]) if tx["hash"] in self._receipts else None,
+            }
+        if method == "eth_getTransactionReceipt":
+            receipt = self.receipt(params[0])
+            if receipt is None:
+                return None
+            return {
+                key: hex(value) if isinstance(value, int) else value
+                for key, value in receipt.items()
+            }
+        if method == "eth_call":
+            call = params[0]
+            data = call.get("data") or call.get("input") or "0x"
+            block = params[1] if len(params) > 1 else "latest"
+            if isinstance(block, str) and block.startswith("0x"):
+                block = int(block, 16)
+            try:
+                return "0x" + self(call["to"], bytes.fromhex(data[2:]), block).hex()
+            except Revert as e:
+                raise RpcError(f"execution reverted: {e}", code=3)
+        raise RpcError(f"Method {method} not supported by the local chain", code=-32601)
+
+    def batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """json_rpc.batch_call stand-in: a result or RpcError per call, in order"""
+        results = []
+        for method, params in calls:
+            try:
+                results.append(self.handle(method, params))
+            except RpcError as e:
+                results.append(e)
+        return results
+
+    def provider(self) -> "LocalProvider":
+        """Web3 provider backed by this chain: ``Web3(chain.provider())``"""
+        return LocalProvider(self)
+
+    def __call__(self, to: str, data: bytes, block: Union[int, str] = "latest") -> bytes:
+        """eth_call at a mined block ("latest" or a block number)"""
+        self.eth_calls += 1
+        number = self.block_number if block == "latest" else int(block)
+        if not 0 <= number <= self.block_number:
+            raise Revert(f"Unknown block {block}")
+        return self._execute(to, bytes(data), self._blocks[number], number)
+
+    def _execute(self, to: str, data: bytes, state: Dict[str, Dict[Tuple, int]], number: int) -> bytes:
+        target = to.lower()
+        selector, args = data[:4], data[4:]
+
+        if target == MULTICALL3_ADDRESS.lower():
+            if selector == GET_BLOCK_NUMBER_SELECTOR:
+                return encode(["uint256"], [number])
+            if selector == AGGREGATE3_SELECTOR:
+                return self._aggregate3(args, state, number)
+            raise Revert("Unsupported Multicall3 function")
+
+        if target in self._erc20_tokens:
+            if selector == ERC20_BALANCE_OF_SELECTOR:
+                (owner,) = decode(["address"], args)
+                return encode(["uint256"], [state["erc20"].get((target, owner.lower()), 0)])
+            if selector == ERC20_ALLOWANCE_SELECTOR:
+                owner, spender = decode(["address", "address"], args)
+                return encode(["uint256"], [state["allowance"].get((target, owner.lower(), spender.lower()), 0)])
+            raise Revert("Unsupported ERC20 function")
+
+        if target in self._erc1155_contracts:
+            if selector == ERC1155_BALANCE_OF_SELECTOR:
+                owner, position_id = decode(["address", "uint256"], args)
+                return encode(["uint256"], [state["erc1155"].get((target, owner.lower(), position_id), 0)])
+            raise Revert("Unsupported ERC1155 function")
+
+        # Calls to an address without code succeed and return nothing
+        return b""
+
+    def _aggregate3(self, args: bytes, state: Dict[str, Dict[Tuple, int]], number: int) -> bytes:
+        (calls,) = decode(["(address,bool,bytes)[]"], args)
+        results: List[Tuple[bool, Any]] = []
+        for target, allow_failure, call_data in calls:
+            try:
+                results.append((True, self._execute(target, call_data, state, number)))
+            except Revert:
+                if not allow_failure:
+                    raise Revert("Multicall3: call failed")
+                results.append((False, b""))
+        return encode(["(bool,bytes)[]"], [results])
+
+class LocalProvider(BaseProvider):
+    """Web3 provider that answers every request from a LocalChain"""
+
+    def __init__(self, chain: LocalChain):
+        super().__init__()
+        self.chain = chain
+        self.requests = 0
+
+    def make_request(self, method: str, params: Any) -> Dict[str, Any]:
+        self.requests += 1
+        try:
+            return {"jsonrpc": "2.0", "id": self.requests, "result": self.chain.handle(method, list(params))}
+        except RpcError as e:
+            return {"jsonrpc": "2.0", "id": self.requests, "error": {"code": e.code, "message": str(e)}}
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
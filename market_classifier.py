@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import random
+import time
+from typing import Dict, Iterable, Iterator, FrozenSet, Tuple, List
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+class KeywordMatcher:
+    """
+    Multi-pattern substring matcher compiled from named keyword groups
+
+    All keywords go into one Aho-Corasick automaton (pyahocorasick), so a
+    single pass over the text reports every keyword occurrence, overlapping
+    ones included, and the labels of the groups they belong to.
+
+    Without pyahocorasick each distinct keyword is looked up once with
+    ``str.find``. The results are the same; the keywords shared between
+    groups are still only searched for once per text.
+
+    Matching is plain substring matching, the same as ``keyword in text``.
+    Keywords are expected to be lowercase and callers should lowercase text.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        keyword_labels: Dict[str, set] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                keyword_labels.setdefault(keyword, set()).add(label)
+
+        self.labels = frozenset(groups)
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, labels in keyword_labels.items():
+                self._automaton.add_word(keyword, (len(keyword), frozenset(labels)))
+            self._automaton.make_automaton()
+            return
+
+        self._automaton = None
+        self._keywords = [(keyword, frozenset(labels)) for keyword, labels in keyword_labels.items()]
+
+    def _matches(self, text: str) -> Iterator[Tuple[int, FrozenSet[str]]]:
+        """Yield (start index, labels) covering at least the first occurrence of each keyword"""
+        if self._automaton is not None:
+            if not self._automaton:  # An automaton without keywords cannot be iterated
+                return
+            for end, (length, labels) in self._automaton.iter(text):
+                yield end - length + 1, labels
+        else:
+            # The first occurrence is enough to tell which field a keyword is in
+            for keyword, labels in self._keywords:
+                start = text.find(keyword)
+                if start != -1:
+                    yield start, labels
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Return the labels of every group with a keyword in the text"""
+        hits = set()
+        for _, labels in self._matches(text):
+            hits |= labels
+        return frozenset(hits)
+
+    def scan_fields(self, primary: str, secondary: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Scan two text fields in one pass
+
+        Returns:
+            Tuple of (labels hit in the primary field, labels hit in either field)
+        """
+        boundary = len(primary)
+        primary_hits = set()
+        all_hits = set()
+
+        # A newline cannot be part of any keyword, so no match spans both fields
+        for start, labels in self._matches(primary + "\n" + secondary):
+            all_hits |= labels
+            if start < boundary:
+                primary_hits |= labels
+
+        return frozenset(primary_hits), frozenset(all_hits)
+
+def first_label(hits: FrozenSet[str], order: Iterable[str], default: str) -> str:
+    """Return the first label in priority order that was hit"""
+    for label in order:
+        if label in hits:
+            return label
+    return default
+
+def benchmark(groups: Dict[str, List[str]], num_markets: int = 100_000, seed: int = 7) -> None:
+    """
+    Compare the compiled matcher against per-keyword ``in`` checks
+
+    Builds synthetic markets with a question and a description, then times
+    the label scan both ways and checks that the results are identical.
+    """
+    rng = random.Random(seed)
+    keywords = sorted({keyword for group in groups.values() for keyword in group})
+    filler = ["will", "the", "before", "after", "price", "election", "reach", "by", "end", "of",
+              "season", "market", "resolve", "yes", "no", "team", "city", "record", "total"]
+
+    def sentence(length: int) -> str:
+        words = [rng.choice(keywords) if rng.random() < 0.08 else rng.choice(filler) for _ in range(length)]
+        return " ".join(words)
+
+    markets = [(sentence(12), sentence(40)) for _ in range(num_markets)]
+    matcher = KeywordMatcher(groups)
+    keyword_lists = list(groups.items())
+
+    started = time.perf_counter()
+    baseline = []
+    for question, description in markets:
+        baseline.append(frozenset(
+            label for label, group in keyword_lists
+            if any(keyword in question or keyword in description for keyword in group)
+        ))
+    baseline_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = [matcher.scan_fields(question, description)[1] for question, description in markets]
+    compiled_elapsed = time.perf_counter() - started
+
+    mismatches = sum(1 for expected, actual in zip(baseline, compiled) if expected != actual)
+
+    backend = "pyahocorasick" if ahocorasick is not None else "str.find"
+    print(f"Markets: {num_markets:,}  Keywords: {len(keywords)}  Groups: {len(groups)}  Backend: {backend}")
+    print(f"Per-keyword scan: {baseline_elapsed:.2f}s ({num_markets / baseline_elapsed:,.0f} markets/sec)")
+    print(f"Compiled matcher: {compiled_elapsed:.2f}s ({num_markets / compiled_elapsed:,.0f} markets/sec)")
+    print(f"Speedup: {baseline_elapsed / compiled_elapsed:.1f}x  Mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    from nba_markets import SPORTS_KEYWORD_GROUPS
+    benchmark(SPORTS_KEYWORD_GROUPS)
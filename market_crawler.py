@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import requests
+import http_client
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Callable, Iterator
+
+GAMMA_MARKETS_URL = "https://gamma-api.polymarket.com/markets"
+GAMMA_PAGE_SIZE = 500  # Rows per offset page
+GAMMA_MAX_WORKERS = 8  # Pages in flight at once
+
+class IncompleteCrawlError(Exception):
+    """A page of the listing could not be fetched, so the crawl does not cover everything before the stop"""
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        super().__init__(f"Market page at offset {offset} failed; the crawl is incomplete")
+
+def fetch_market_page(offset: int, limit: int, params: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch a single offset page of markets from the Gamma API
+
+    Returns:
+        The list of markets on the page, or None if the request failed
+    """
+    page_params = dict(params or {})
+    page_params["limit"] = limit
+    page_params["offset"] = offset
+
+    try:
+        response = http_client.get(GAMMA_MARKETS_URL, params=page_params, timeout=10)
+
+        if response.status_code != 200:
+            print(f"Failed to fetch markets page at offset {offset}: {response.status_code}")
+            return None
+
+        page = response.json()
+
+        if not isinstance(page, list):
+            print(f"Unexpected API response format at offset {offset}")
+            return None
+
+        return page
+
+    except requests.exceptions.RequestException as e:
+        print(f"Network error fetching markets page at offset {offset}: {str(e)}")
+        return None
+
+def iter_market_pages(
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = GAMMA_PAGE_SIZE,
+    max_workers: int = GAMMA_MAX_WORKERS,
+    max_pages: Optional[int] = None,
+    stop_after: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
+    strict: bool = False
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Crawl every offset page of the Gamma markets listing concurrently
+
+    Up to ``max_workers`` pages are kept in flight. Pages are yielded as soon
+    as they arrive, so callers can filter while the crawl is still running;
+    they are therefore not guaranteed to come back in offset order.
+
+    The crawl ends at the first short page (the end of the listing), at the
+    first page for which ``stop_after(page)`` returns True, or after
+    ``max_pages`` pages. Pages before the stopping point that are still in
+    flight are drained and yielded; pages after it that have not arrived yet
+    are discarded.
+
+    Markets can shift between offset pages while they are fetched
+    concurrently, so a market already yielded (by ``id``) is dropped from
+    later pages.
+
+    A failed page ends the crawl, since there is no telling whether rows
+    exist past it. By default the pages received so far are still yielded
+    and the crawl ends quietly; with ``strict=True`` it raises
+    IncompleteCrawlError instead, for callers that must not mistake a
+    partial crawl for a complete one.
+
+    Args:
+        params: Extra Gamma query parameters (filters, ordering)
+        page_size: Number of markets requested per page
+        max_workers: Maximum number of concurrent page requests
+        max_pages: Optional cap on the number of pages to request
+        stop_after: Optional predicate marking a page as the last one needed
+        strict: Raise IncompleteCrawlError when a page fails
+
+    Yields:
+        Lists of market dicts, one per non-empty page
+
+    Raises:
+        IncompleteCrawlError if a page fails and ``strict`` is set
+    """
+    end_offset = max_pages * page_size if max_pages is not None else None
+    next_offset = 0
+    in_flight = {}
+    seen_ids = set()
+
+    pages = 0
+    rows = 0
+    started = time.perf_counter()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def fill() -> None:
+        nonlocal next_offset
+        while len(in_flight) < max_workers and (end_offset is None or next_offset < end_offset):
+            future = executor.submit(fetch_market_page, next_offset, page_size, params)
+            in_flight[future] = next_offset
+            next_offset += page_size
+
+    try:
+        fill()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                offset = in_flight.pop(future)
+
+                # A later page may already have moved the end of the crawl
+                if end_offset is not None and offset >= end_offset:
+                    continue
+
+                page = future.result()
+                pages += 1
+
+                if page is None:
+                    # We cannot tell whether more rows exist past a failed page
+                    if strict:
+                        raise IncompleteCrawlError(offset)
+                    print(f"Stopping crawl at offset {offset} after a failed page")
+                    end_offset = offset if end_offset is None else min(end_offset, offset)
+                    continue
+
+                if len(page) < page_size or (stop_after and stop_after(page)):
+                    end_offset = offset + page_size if end_offset is None else min(end_offset, offset + page_size)
+
+                # Drop markets that shifted onto this page from one already yielded
+                unique = []
+                for market in page:
+                    market_id = market.get("id")
+                    if market_id is not None:
+                        if market_id in seen_ids:
+                            continue
+                        seen_ids.add(market_id)
+                    unique.append(market)
+                page = unique
+
+                if page:
+                    rows += len(page)
+                    yield page
+
+            # Drop requests for pages past the end of the listing
+            if end_offset is not None:
+                for future, offset in list(in_flight.items()):
+                    if offset >= end_offset:
+                        future.cancel()
+                        del in_flight[future]
+
+            fill()
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        elapsed = time.perf_counter() - started
+        rate = pages / elapsed if elapsed > 0 else 0.0
+        print(f"Crawled {pages} pages ({rows} markets) in {elapsed:.2f}s - {rate:.1f} pages/sec")
+
+def crawl_markets(params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    Crawl the full Gamma market listing and return every market in one list
+    """
+    markets = []
+    for page in iter_market_pages(params, **kwargs):
+        markets.extend(page)
+    return markets
+
+if __name__ == "__main__":
+    all_markets = crawl_markets({"active": True, "closed": False})
+    print(f"Total active markets: {len(all_markets)}")
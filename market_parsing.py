@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import ast
+import json
+from datetime import date, datetime, timezone
+from typing import List, Dict, Any, Tuple, Optional
+
+MAX_CACHED_FIELDS = 100_000  # Parsed fields kept before the cache is reset
+
+# (market id, updatedAt, field name) -> parsed values
+_parsed_fields: Dict[Tuple[str, str, str], Tuple[str, ...]] = {}
+
+def parse_list_field(value: Any) -> List[str]:
+    """
+    Parse a Gamma list field that may arrive as a list or a stringified list
+
+    Gamma returns fields like ``clobTokenIds`` and ``outcomes`` as JSON
+    strings (e.g. '["Yes", "No"]'). JSON is tried first; Python literal
+    syntax and plain bracket splitting are only used for malformed values.
+    """
+    if isinstance(value, list):
+        return [str(item) for item in value]
+
+    if not isinstance(value, str) or not value:
+        return []
+
+    try:
+        parsed = json.loads(value)
+        if isinstance(parsed, list):
+            return [str(item) for item in parsed]
+    except ValueError:
+        try:
+            parsed = ast.literal_eval(value)
+            if isinstance(parsed, list):
+                return [str(item) for item in parsed]
+        except (ValueError, SyntaxError):
+            pass
+
+    # Try simple bracket parsing
+    if value.startswith("[") and value.endswith("]"):
+        items = value[1:-1].split(",")
+        return [item.strip(' "\'') for item in items if item.strip()]
+
+    # If no parsing works, return as single item
+    return [value]
+
+def _parse_cached(market: Dict[str, Any], field: str) -> List[str]:
+    """Parse a list field, reusing the result for the same market version"""
+    market_id = market.get("id")
+    if market_id is None:
+        return parse_list_field(market.get(field))
+
+    key = (str(market_id), str(market.get("updatedAt", "")), field)
+    parsed = _parsed_fields.get(key)
+
+    if parsed is None:
+        if len(_parsed_fields) >= MAX_CACHED_FIELDS:
+            _parsed_fields.clear()
+        parsed = tuple(parse_list_field(market.get(field)))
+        _parsed_fields[key] = parsed
+
+    # Hand out a fresh list so callers cannot mutate the cached value
+    return list(parsed)
+
+def parse_token_ids(market: Dict[str, Any]) -> List[str]:
+    """
+    Parse token IDs from market data
+    """
+    return _parse_cached(market, "clobTokenIds")
+
+def parse_outcomes(market: Dict[str, Any]) -> List[str]:
+    """
+    Parse outcomes from market data
+    """
+    return _parse_cached(market, "outcomes")
+
+def parse_outcome_prices(market: Dict[str, Any]) -> List[str]:
+    """
+    Parse outcome prices from market data
+    """
+    return _parse_cached(market, "outcomePrices")
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Parse a Gamma ISO date string (e.g. "2025-06-01T12:00:00Z") to epoch seconds
+
+    Date-only values are read as midnight UTC. Returns None when the value is
+    missing or cannot be parsed.
+    """
+    if not isinstance(value, str) or not value:
+        return None
+
+    # Date only, e.g. "2025-01-31"; parsed on its own so it never depends on the datetime parser
+    if len(value) == 10:
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            return None
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()
+
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed.timestamp()
+
+def ingest_market(market: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse a market's list fields once when it is first loaded
+
+    Later calls to parse_token_ids / parse_outcomes for the same market id
+    and updatedAt are served from the cache.
+    """
+    parse_token_ids(market)
+    parse_outcomes(market)
+    parse_outcome_prices(market)
+    return market
+
+def clear_parse_cache() -> None:
+    """Drop all cached parse results"""
+    _parsed_fields.clear()
+
+def check_parse_timestamp() -> bool:
+    """Formats Gamma sends, including date-only endDate values, must keep parsing"""
+    cases = {
+        "2025-01-31": 1738281600.0,
+        "2025-01-31T00:00:00Z": 1738281600.0,
+        "2025-01-31T12:00:00Z": 1738324800.0,
+        "2025-01-31T12:00:00.500Z": 1738324800.5,
+        "2025-01-31T12:00:00+00:00": 1738324800.0,
+        "2025-01-31T12:00:00": 1738324800.0,
+        "": None,
+        "soon": None,
+        "2025-13-01": None,
+    }
+    failures = {value: parse_timestamp(value) for value, expected in cases.items() if parse_timestamp(value) != expected}
+    print("Timestamps parse as expected" if not failures else f"Timestamp parsing FAILED: {failures}")
+    return not failures
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if check_parse_timestamp() else 1)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+import json
+import os
+import sqlite3
+import time
+from typing import List, Dict, Any, Optional, Iterable
+from market_crawler import iter_market_pages, IncompleteCrawlError
+from market_classifier import first_label
+from market_parsing import parse_timestamp
+from nba_markets import SPORTS_MATCHER, CATEGORY_ORDER
+
+MARKET_STORE_PATH = os.getenv("MARKET_STORE_PATH", "markets.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    id TEXT PRIMARY KEY,
+    question TEXT,
+    end_ts REAL,
+    volume24hr REAL,
+    liquidity REAL,
+    active INTEGER,
+    closed INTEGER,
+    category TEXT,
+    updated_ts REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_markets_end_ts ON markets (end_ts);
+CREATE INDEX IF NOT EXISTS idx_markets_volume24hr ON markets (volume24hr);
+CREATE INDEX IF NOT EXISTS idx_markets_active ON markets (active, end_ts);
+CREATE INDEX IF NOT EXISTS idx_markets_category ON markets (category);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+ORDER_COLUMNS = {"end_ts", "volume24hr", "liquidity", "updated_ts"}
+
+def open_store(path: str = MARKET_STORE_PATH) -> sqlite3.Connection:
+    """
+    Open (and create if needed) the local market snapshot database
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def market_category(market: Dict[str, Any]) -> str:
+    """
+    Pick the stored category for a market
+
+    Sports markets get their sport from the keyword classifier; everything
+    else keeps Gamma's own category field.
+    """
+    question = (market.get("question") or "").lower()
+    sport = first_label(SPORTS_MATCHER.scan(question), CATEGORY_ORDER, "")
+    return sport or market.get("category") or "Other"
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _market_row(market: Dict[str, Any]) -> tuple:
+    return (
+        str(market.get("id")),
+        market.get("question"),
+        parse_timestamp(market.get("endDate")),
+        _to_float(market.get("volume24hr")),
+        _to_float(market.get("liquidity")),
+        1 if market.get("active") else 0,
+        1 if market.get("closed") else 0,
+        market_category(market),
+        parse_timestamp(market.get("updatedAt")),
+        json.dumps(market),
+    )
+
+def upsert_markets(conn: sqlite3.Connection, markets: Iterable[Dict[str, Any]]) -> int:
+    """
+    Insert or replace markets in the store
+
+    Returns:
+        Number of markets written
+    """
+    rows = [_market_row(market) for market in markets if market.get("id") is not None]
+    conn.executemany(
+        "INSERT OR REPLACE INTO markets "
+        "(id, question, end_ts, volume24hr, liquidity, active, closed, category, updated_ts, data) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    return len(rows)
+
+def get_watermark(conn: sqlite3.Connection) -> float:
+    """Return the newest updatedAt (epoch seconds) seen by the last sync"""
+    row = conn.execute("SELECT value FROM sync_state WHERE key = 'updated_watermark'").fetchone()
+    return float(row[0]) if row else 0.0
+
+def sync_markets(conn: sqlite3.Connection, full: bool = False) -> int:
+    """
+    Bring the local store up to date with Gamma
+
+    Markets are crawled newest-``updatedAt`` first, and the crawl stops at the
+    first page that holds nothing newer than the stored watermark, so a sync
+    only downloads what changed since the previous one. ``full=True`` ignores
+    the watermark and re-crawls the whole listing.
+
+    Markets from an incomplete crawl (a page failed) are still stored, but
+    the watermark is left where it was: markets on or past the failed page
+    were never seen, and the next sync must fetch them again.
+
+    Returns:
+        Number of markets inserted or updated
+    """
+    watermark = 0.0 if full else get_watermark(conn)
+    newest = watermark
+    written = 0
+
+    def is_stale(market: Dict[str, Any]) -> bool:
+        updated = parse_timestamp(market.get("updatedAt"))
+        return updated is not None and updated <= watermark
+
+    params = {"order": "updatedAt", "ascending": False}
+    stop_after = (lambda page: all(is_stale(market) for market in page)) if watermark else None
+
+    started = time.perf_counter()
+
+    try:
+        for page in iter_market_pages(params, stop_after=stop_after, strict=True):
+            fresh = [market for market in page if not is_stale(market)]
+            written += upsert_markets(conn, fresh)
+
+            for market in fresh:
+                updated = parse_timestamp(market.get("updatedAt"))
+                if updated is not None and updated > newest:
+                    newest = updated
+    except IncompleteCrawlError as e:
+        conn.commit()
+        print(f"Sync incomplete ({e}); keeping the previous watermark so the next sync fetches the rest")
+        return written
+
+    conn.execute(
+        "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('updated_watermark', ?)",
+        (str(newest),)
+    )
+    conn.commit()
+
+    print(f"Synced {written} changed markets in {time.perf_counter() - started:.2f}s")
+    return written
+
+def query_markets(
+    conn: sqlite3.Connection,
+    active: Optional[bool] = None,
+    closed: Optional[bool] = None,
+    category: Optional[str] = None,
+    end_after: Optional[float] = None,
+    end_before: Optional[float] = None,
+    min_volume: Optional[float] = None,
+    order_by: str = "volume24hr",
+    descending: bool = True,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Query stored markets using the indexed columns
+
+    Args:
+        active: Only active (True) or inactive (False) markets
+        closed: Only closed (True) or open (False) markets
+        category: Exact category match (see market_category)
+        end_after: Only markets ending at or after this epoch time
+        end_before: Only markets ending before this epoch time
+        min_volume: Minimum 24h volume
+        order_by: One of end_ts, volume24hr, liquidity, updated_ts
+        descending: Sort direction
+        limit: Maximum number of markets to return
+
+    Returns:
+        List of market dicts as last returned by Gamma
+    """
+    if order_by not in ORDER_COLUMNS:
+        raise ValueError(f"Cannot order markets by {order_by!r}")
+
+    clauses = []
+    args: List[Any] = []
+
+    if active is not None:
+        clauses.append("active = ?")
+        args.append(1 if active else 0)
+    if closed is not None:
+        clauses.append("closed = ?")
+        args.append(1 if closed else 0)
+    if category is not None:
+        clauses.append("category = ?")
+        args.append(category)
+    if end_after is not None:
+        clauses.append("end_ts >= ?")
+        args.append(end_after)
+    if end_before is not None:
+        clauses.append("end_ts < ?")
+        args.append(end_before)
+    if min_volume is not None:
+        clauses.append("volume24hr >= ?")
+        args.append(min_volume)
+
+    sql = "SELECT data FROM markets"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        args.append(limit)
+
+    return [json.loads(row[0]) for row in conn.execute(sql, args)]
+
+def load_local_markets(**filters: Any) -> List[Dict[str, Any]]:
+    """
+    Sync the default store and return the markets matching the filters
+    """
+    conn = open_store()
+    try:
+        sync_markets(conn)
+        return query_markets(conn, **filters)
+    finally:
+        conn.close()
+
+def check_failed_page_sync() -> bool:
+    """
+    Sync from a fake Gamma listing where one page fails, offline
+
+    A failed page during the first full sync and during an incremental
+    sync must not advance the watermark; the next sync must then store
+    every market from the failed page and after it.
+    """
+    import market_crawler
+
+    page_size = market_crawler.GAMMA_PAGE_SIZE
+    listing = [
+        {"id": str(index), "question": f"Market {index}", "updatedAt": f"2025-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z"}
+        for index in range(3 * page_size)
+    ]
+    failing = {"offset": None}
+
+    def fake_page(offset: int, limit: int, params: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        if offset == failing["offset"]:
+            return None
+        newest_first = sorted(listing, key=lambda market: market["updatedAt"], reverse=True)
+        return newest_first[offset:offset + limit]
+
+    def stored_versions(conn: sqlite3.Connection) -> Dict[str, str]:
+        return {row[0]: json.loads(row[1])["updatedAt"] for row in conn.execute("SELECT id, data FROM markets")}
+
+    original_fetch = market_crawler.fetch_market_page
+    market_crawler.fetch_market_page = fake_page
+    conn = open_store(":memory:")
+    try:
+        # Step 1: First full sync with page 2 failing, then a clean sync
+        failing["offset"] = page_size
+        sync_markets(conn)
+        truncated_watermark = get_watermark(conn)
+        failing["offset"] = None
+        sync_markets(conn)
+        complete = len(stored_versions(conn)) == len(listing)
+
+        # Step 2: Every market changes; an incremental sync fails on page 2, then a clean one runs
+        watermark = get_watermark(conn)
+        for index, market in enumerate(listing):
+            market["updatedAt"] = f"2025-02-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z"
+        failing["offset"] = page_size
+        sync_markets(conn)
+        kept_watermark = get_watermark(conn)
+        failing["offset"] = None
+        sync_markets(conn)
+        current = stored_versions(conn) == {market["id"]: market["updatedAt"] for market in listing}
+    finally:
+        market_crawler.fetch_market_page = original_fetch
+        conn.close()
+
+    checks = [truncated_watermark == 0.0, complete, kept_watermark == watermark, current]
+    print("Failed pages are fetched again by the next sync" if all(checks) else f"Failed page sync WRONG: {checks}")
+    return all(checks)
+
+if __name__ == "__main__":
+    import sys
+
+    if "--check" in sys.argv:
+        sys.exit(0 if check_failed_page_sync() else 1)
+
+    store = open_store()
+    sync_markets(store, full="--full" in sys.argv)
+    total = store.execute("SELECT COUNT(*) FROM markets").fetchone()[0]
+    active_count = store.execute("SELECT COUNT(*) FROM markets WHERE active = 1").fetchone()[0]
+    print(f"Local store {MARKET_STORE_PATH}: {total} markets ({active_count} active)")
+    store.close()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import time
+import numpy as np
+from typing import List, Dict, Any, Optional, Iterable
+from market_classifier import KeywordMatcher, first_label
+from market_parsing import parse_timestamp, parse_token_ids
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+class MarketTable:
+    """
+    Columnar, in-memory view of a market universe
+
+    Every market is parsed once when the table is built: end dates become
+    epoch seconds, volume and liquidity become floats, and (when a keyword
+    matcher is given) each keyword group becomes a boolean column filled from
+    one scan of the question and description. Filters are then boolean masks
+    over whole columns and can be combined with ``&`` / ``|`` / ``~`` before
+    selecting the matching rows.
+
+    Missing or unparseable numbers and dates are stored as NaN.
+    """
+
+    def __init__(
+        self,
+        markets: Iterable[Dict[str, Any]],
+        matcher: Optional[KeywordMatcher] = None,
+        category_order: Optional[List[str]] = None,
+        default_category: str = "Other Sports"
+    ):
+        self.markets = list(markets)
+        count = len(self.markets)
+
+        self.end_ts = np.full(count, np.nan)
+        self.volume24hr = np.full(count, np.nan)
+        self.liquidity = np.full(count, np.nan)
+        self.active = np.zeros(count, dtype=bool)
+        self.closed = np.zeros(count, dtype=bool)
+        self.has_tokens = np.zeros(count, dtype=bool)
+
+        labels = sorted(matcher.labels) if matcher is not None else []
+        self.keyword_flags = {label: np.zeros(count, dtype=bool) for label in labels}
+
+        self.categories = list(category_order or []) + [default_category]
+        self.category_codes = np.full(count, len(self.categories) - 1, dtype=np.int16)
+        category_index = {category: code for code, category in enumerate(self.categories)}
+
+        for row, market in enumerate(self.markets):
+            end_ts = parse_timestamp(market.get("endDate"))
+            if end_ts is not None:
+                self.end_ts[row] = end_ts
+            self.volume24hr[row] = _to_float(market.get("volume24hr"))
+            self.liquidity[row] = _to_float(market.get("liquidity"))
+            self.active[row] = bool(market.get("active"))
+            self.closed[row] = bool(market.get("closed"))
+            self.has_tokens[row] = bool(parse_token_ids(market))
+
+            if matcher is not None:
+                question = (market.get("question") or "").lower()
+                description = (market.get("description") or "").lower()
+                question_hits, all_hits = matcher.scan_fields(question, description)
+
+                for label in all_hits:
+                    self.keyword_flags[label][row] = True
+
+                category = first_label(question_hits, category_order or [], default_category)
+                self.category_codes[row] = category_index[category]
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def expiry_mask(self, now: Optional[float] = None) -> np.ndarray:
+        """Markets that have not ended yet; markets without an end date are kept"""
+        now = time.time() if now is None else now
+        return np.isnan(self.end_ts) | (self.end_ts > now)
+
+    def end_between_mask(self, start: float, end: float) -> np.ndarray:
+        """Markets ending in [start, end)"""
+        return (self.end_ts >= start) & (self.end_ts < end)
+
+    def volume_mask(self, min_volume: float) -> np.ndarray:
+        """Markets with at least this much 24h volume"""
+        return self.volume24hr >= min_volume
+
+    def liquidity_mask(self, min_liquidity: float) -> np.ndarray:
+        """Markets with at least this much liquidity"""
+        return self.liquidity >= min_liquidity
+
+    def keyword_mask(self, *labels: str) -> np.ndarray:
+        """Markets that hit every one of the given keyword groups"""
+        mask = np.ones(len(self.markets), dtype=bool)
+        for label in labels:
+            mask &= self.keyword_flags[label]
+        return mask
+
+    def category_mask(self, *categories: str) -> np.ndarray:
+        """Markets classified into any of the given categories"""
+        codes = [self.categories.index(category) for category in categories if category in self.categories]
+        return np.isin(self.category_codes, codes)
+
+    def select(self, mask: np.ndarray) -> List[Dict[str, Any]]:
+        """Return the market dicts for the rows where the mask is True, in table order"""
+        return [self.markets[row] for row in np.flatnonzero(mask)]
@@ -2,6 +2,26 @@
 import openai
 from datetime import datetime, timedelta
 import os
+import sys
+
+if "--local" in sys.argv:
+    # Answer from the local market store instead of asking the model
+    from end_date_index import load_local_index
+    
+    tomorrow_start = (datetime.now() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow_end = tomorrow_start + timedelta(days=1)
+    
+    index = load_local_index(closed=False)
+    local_markets = index.ending_between(tomorrow_start.timestamp(), tomorrow_end.timestamp())
+    
+    print(f"POLYMARKET MARKETS ENDING TOMORROW ({tomorrow_start.strftime('%Y-%m-%d')})")
+    print("=" * 70)
+    for i, market in enumerate(local_markets, 1):
+        print(f"{i}. {market.get('question', 'Unknown')}")
+        print(f"   End Date: {market.get('endDate', 'Unknown')}")
+    print(f"\nFound {len(local_markets)} markets ending tomorrow")
+    print(f"{len(index.ended_unresolved())} markets have ended but are not resolved yet")
+    sys.exit(0)
 
 # Initialize OpenAI client with API key
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+from collections import namedtuple
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Union
+from eth_abi import encode, decode
+from web3 import Web3
+import json_rpc
+from json_rpc import POLYGON_RPC_URL
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"  # Same address on every chain
+CTF_CONTRACT = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"  # Conditional Tokens (ERC1155 positions) on Polygon
+MAX_CALLS_PER_MULTICALL = 500  # Larger batches are split, every chunk pinned to the same block
+
+# First 4 bytes of keccak256 of the function signatures
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")  # aggregate3((address,bool,bytes)[])
+GET_BLOCK_NUMBER_SELECTOR = bytes.fromhex("42cbb15c")  # getBlockNumber()
+ERC20_BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")  # balanceOf(address)
+ERC20_ALLOWANCE_SELECTOR = bytes.fromhex("dd62ed3e")  # allowance(address,address)
+ERC1155_BALANCE_OF_SELECTOR = bytes.fromhex("00fdd58e")  # balanceOf(address,uint256)
+
+# One read: the key its value is returned under, the contract, calldata and the ABI return type
+ReadCall = namedtuple("ReadCall", ["key", "target", "data", "output_type"])
+
+# Values of one aggregated read, all from the same block; None where a call reverted
+MulticallResult = namedtuple("MulticallResult", ["block_number", "values"])
+
+# eth_call transport: (to, calldata, block) -> return data
+Transport = Callable[[str, bytes, Union[int, str]], bytes]
+
+def erc20_balance(token: str, owner: str) -> ReadCall:
+    """ERC20 balanceOf(owner), keyed ("balance", token, owner)"""
+    data = ERC20_BALANCE_OF_SELECTOR + encode(["address"], [owner])
+    return ReadCall(("balance", token, owner), token, data, "uint256")
+
+def erc20_allowance(token: str, owner: str, spender: str) -> ReadCall:
+    """ERC20 allowance(owner, spender), keyed ("allowance", token, owner, spender)"""
+    data = ERC20_ALLOWANCE_SELECTOR + encode(["address", "address"], [owner, spender])
+    return ReadCall(("allowance", token, owner, spender), token, data, "uint256")
+
+def ctf_balance(owner: str, position_id: int, ctf: str = CTF_CONTRACT) -> ReadCall:
+    """Conditional Tokens position balance (ERC1155 balanceOf), keyed ("position", position_id, owner)"""
+    data = ERC1155_BALANCE_OF_SELECTOR + encode(["address", "uint256"], [owner, int(position_id)])
+    return ReadCall(("position", int(position_id), owner), ctf, data, "uint256")
+
+def wallet_reads(
+    wallets: Iterable[str],
+    tokens: Iterable[str] = (),
+    spender: Optional[str] = None,
+    position_ids: Iterable[int] = ()
+) -> List[ReadCall]:
+    """
+    Every balance, allowance and position read for a set of wallets
+
+    Args:
+        wallets: Wallet addresses
+        tokens: ERC20 contracts whose balance (and allowance, with a spender) is read
+        spender: Contract whose allowance is read, e.g. the Polymarket exchange
+        position_ids: CTF position (token) IDs whose balances are read
+    """
+    tokens, position_ids = list(tokens), list(position_ids)
+    calls = []
+    for wallet in wallets:
+        for token in tokens:
+            calls.append(erc20_balance(token, wallet))
+            if spender is not None:
+                calls.append(erc20_allowance(token, wallet, spender))
+        for position_id in position_ids:
+            calls.append(ctf_balance(wallet, position_id))
+    return calls
+
+def rpc_transport(url: str = POLYGON_RPC_URL) -> Transport:
+    """eth_call over the shared JSON-RPC client"""
+    def call(to: str, data: bytes, block: Union[int, str]) -> bytes:
+        block_param = hex(block) if isinstance(block, int) else block
+        result = json_rpc.request("eth_call", [{"to": to, "data": "0x" + data.hex()}, block_param], url)
+        return bytes.fromhex(result[2:])
+    return call
+
+def web3_transport(w3: Web3) -> Transport:
+    """eth_call through an existing Web3 connection"""
+    def call(to: str, data: bytes, block: Union[int, str]) -> bytes:
+        return bytes(w3.eth.call({"to": to, "data": data}, block))
+    return call
+
+def _aggregate3(calls: List[ReadCall], transport: Transport, block: Union[int, str]) -> List[Any]:
+    """
+    One aggregate3 eth_call; getBlockNumber() is read first in the same call
+
+    Returns:
+        [block number, value or None per call]
+    """
+    batch = [(MULTICALL3_ADDRESS, False, GET_BLOCK_NUMBER_SELECTOR)]
+    batch.extend((call.target, True, call.data) for call in calls)
+
+    data = AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [batch])
+    (results,) = decode(["(bool,bytes)[]"], transport(MULTICALL3_ADDRESS, data, block))
+
+    (block_number,) = decode(["uint256"], results[0][1])
+    values = [block_number]
+    for call, (success, output) in zip(calls, results[1:]):
+        # A reverted call, or a non-contract target returning nothing, reads as None
+        if not success or len(output) < 32:
+            values.append(None)
+        else:
+            values.append(decode([call.output_type], output)[0])
+    return values
+
+def aggregate(
+    calls: List[ReadCall],
+    transport: Transport,
+    block: Union[int, str] = "latest",
+    max_calls: int = MAX_CALLS_PER_MULTICALL
+) -> MulticallResult:
+    """
+    Run many read calls through Multicall3 aggregate3, all at one block
+
+    Up to ``max_calls`` reads go out as a single eth_call. Larger sets are
+    split, and every chunk after the first is pinned to the block the first
+    one read, so the result is always one consistent view of the chain.
+    Individual calls may fail (allowFailure) without failing the rest.
+
+    Args:
+        calls: Reads to perform, e.g. from wallet_reads
+        transport: rpc_transport(), web3_transport(w3) or a LocalChain
+        block: Block number to read at, or "latest"
+
+    Returns:
+        MulticallResult with the block number read and a dict of call key -> value
+    """
+    values: Dict[Hashable, Any] = {}
+    block_number = None
+
+    for start in range(0, max(len(calls), 1), max_calls):
+        chunk = calls[start:start + max_calls]
+        chunk_values = _aggregate3(chunk, transport, block if block_number is None else block_number)
+        block_number = chunk_values[0]
+        values.update((call.key, value) for call, value in zip(chunk, chunk_values[1:]))
+
+    return MulticallResult(block_number, values)
+
+def read_balance_and_allowance(
+    transport: Transport,
+    token: str,
+    owner: str,
+    spender: str,
+    block: Union[int, str] = "latest"
+) -> MulticallResult:
+    """
+    An ERC20 balance and allowance read together in one eth_call
+
+    Returns:
+        MulticallResult whose values are (balance, allowance) in base units
+
+    Raises:
+        ValueError if either read reverted
+    """
+    balance_call, allowance_call = erc20_balance(token, owner), erc20_allowance(token, owner, spender)
+    result = aggregate([balance_call, allowance_call], transport, block)
+    balance, allowance = result.values[balance_call.key], result.values[allowance_call.key]
+    if balance is None or allowance is None:
+        raise ValueError(f"Reading balance and allowance from {token} failed at block {result.block_number}")
+    return MulticallResult(result.block_number, (balance, allowance))
+
+def check_against_local_chain() -> bool:
+    """
+    Read balances, allowances and positions from a LocalChain, offline
+
+    State changes after the first read; reading again pinned to the first
+    block must return the old values, and a latest read the new ones.
+    """
+    from local_chain import LocalChain
+
+    usdc = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"
+    exchange = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
+    wallets = [Web3.to_checksum_address(f"0x{index:040x}") for index in range(1, 201)]
+    position_ids = [2**200 + 1, 2**200 + 2]
+
+    chain = LocalChain()
+    for index, wallet in enumerate(wallets):
+        chain.set_erc20_balance(usdc, wallet, index * 1_000_000)
+        chain.set_allowance(usdc, wallet, exchange, 2**256 - 1 if index % 2 else 0)
+        chain.set_position_balance(CTF_CONTRACT, wallet, position_ids[0], index)
+    first_block = chain.mine()
+
+    chain.set_erc20_balance(usdc, wallets[5], 0)
+    chain.mine()
+
+    calls = wallet_reads(wallets, [usdc], exchange, position_ids)
+    calls.append(erc20_balance("0x000000000000000000000000000000000000dEaD", wallets[0]))
+
+    pinned = aggregate(calls, chain, block=first_block, max_calls=250)
+    latest = aggregate(calls, chain)
+
+    checks = [
+        pinned.block_number == first_block,
+        latest.block_number == first_block + 1,
+        pinned.values[("balance", usdc, wallets[5])] == 5_000_000,
+        latest.values[("balance", usdc, wallets[5])] == 0,
+        pinned.values[("allowance", usdc, wallets[1], exchange)] == 2**256 - 1,
+        pinned.values[("position", position_ids[0], wallets[7])] == 7,
+        pinned.values[("position", position_ids[1], wallets[7])] == 0,
+        latest.values[("balance", "0x000000000000000000000000000000000000dEaD", wallets[0])] is None,
+    ]
+
+    print(f"{len(calls)} reads for {len(wallets)} wallets in {chain.eth_calls} eth_calls "
+          f"(pinned to block {pinned.block_number}, latest {latest.block_number})")
+    print("Multicall reads match the local chain" if all(checks) else "Multicall reads DO NOT match the local chain")
+    return all(checks)
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if check_against_local_chain() else 1)
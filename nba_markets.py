@@ -1,9 +1,79 @@
 #!/usr/bin/env python3
 import requests
-import datetime
+import http_client
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional, Union
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from market_crawler import iter_market_pages
+from market_classifier import KeywordMatcher, first_label
+from market_parsing import parse_token_ids, parse_outcomes, ingest_market
+from market_table import MarketTable
+from order_book import OrderBook
+
+ORDER_BOOK_PROBE_CONCURRENCY = 16  # Order book requests in flight during a scan
+MAX_BOOKS_PER_REQUEST = 500  # Server-side cap on token IDs per POST /books call
+
+# Keyword groups for every sports classification stage, matched in a single scan
+SPORTS_KEYWORD_GROUPS = {
+    # Categories used by classify_market, checked in CATEGORY_ORDER
+    "Basketball": ["nba", "basketball", "lakers", "celtics", "warriors", "nets", "knicks", "heat", "bucks"],
+    "Baseball": ["mlb", "baseball", "yankees", "dodgers", "red sox", "cubs", "cardinals", "braves"],
+    "Football": ["nfl", "football", "super bowl", "chiefs", "49ers", "cowboys", "packers", "eagles"],
+    "Soccer": ["soccer", "premier league", "uefa", "fifa", "manchester", "liverpool", "barcelona", "real madrid"],
+    "Tennis": ["tennis", "atp", "wta", "grand slam", "wimbledon"],
+    
+    # Sports filter used by get_active_sports_markets
+    "scan_sports": [
+        # NBA terms
+        "nba", "basketball", "lakers", "celtics", "warriors", "knicks", "heat", "bucks",
+        
+        # MLB terms
+        "mlb", "baseball", "yankees", "dodgers", "astros", "braves",
+        
+        # NFL terms
+        "nfl", "football", "chiefs", "49ers", "cowboys", "eagles",
+        
+        # Soccer terms
+        "soccer", "premier league", "uefa", "champions league", "fifa", "world cup",
+        "manchester united", "liverpool", "barcelona", "real madrid", "bayern",
+        
+        # Tennis terms
+        "tennis", "atp", "wta", "grand slam", "wimbledon", "us open", "australian open",
+        
+        # General sports terms
+        "sports", "game", "match", "playoff", "finals", "champion", "tournament"
+    ],
+    "scan_game": ["win", "game", "vs", "score", "defeat", "champion", "match"],
+    
+    # Sports filter used by get_sports_markets_simplified
+    "simplified_sports": [
+        # Basketball terms
+        "nba", "basketball", "lakers", "celtics", "warriors", "knicks", "heat", "bucks", "mvp",
+        
+        # Baseball terms
+        "mlb", "baseball", "yankees", "dodgers", "astros", "braves", "world series",
+        
+        # Football terms
+        "nfl", "football", "chiefs", "49ers", "cowboys", "eagles", "super bowl", "quarterback",
+        
+        # Soccer terms
+        "soccer", "premier league", "uefa", "champions league", "fifa", "world cup",
+        "manchester united", "liverpool", "barcelona", "real madrid", "bayern", "messi", "ronaldo",
+        
+        # Tennis terms
+        "tennis", "atp", "wta", "grand slam", "wimbledon", "us open", "australian open", "french open",
+        
+        # Basketball players
+        "lebron", "curry", "durant", "giannis", "luka", "embiid", "jokic", "tatum",
+        
+        # General sports terms
+        "sports", "game", "match", "playoff", "finals", "champion", "tournament", "season", "draft"
+    ],
+    "simplified_game": ["win", "game", "vs", "score", "defeat", "champion", "match", "beat", "against", "over", "under"],
+}
+CATEGORY_ORDER = ["Basketball", "Baseball", "Football", "Soccer", "Tennis"]
+SPORTS_MATCHER = KeywordMatcher(SPORTS_KEYWORD_GROUPS)
 
 def get_active_sports_markets() -> List[Dict[str, Any]]:
     """
@@ -11,107 +81,41 @@ def get_active_sports_markets() -> List[Dict[str, Any]]:
     """
     print("Fetching active sports markets...")
     
-    # Step 1: Get all active markets
-    markets_url = "https://gamma-api.polymarket.com/markets"
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
-    }
-    
+    # Step 1: Crawl every page of active markets, filtering each page as it arrives
     params = {
-        "limit": 100,  # Get up to 100 markets
         "active": True,  # Only get active markets
         "order": "volume24hr",  # Order by recent volume
         "ascending": False  # Most active first
     }
     
-    # Try adding date filters to get more recent markets
-    recent_date = (datetime.now(timezone.utc) - timedelta(days=30)).strftime('%Y-%m-%d')
-    
-    # Try multiple API calls with different parameters to find current markets
-    api_attempts = [
-        # Attempt 1: Basic active markets
-        {"limit": 100, "active": True, "order": "volume24hr", "ascending": False},
-        
-        # Attempt 2: Try with date filtering
-        {"limit": 100, "active": True, "order": "endDate", "ascending": False},
-        
-        # Attempt 3: All markets, we'll filter client-side
-        {"limit": 200, "order": "volume24hr", "ascending": False}
-    ]
-    
     try:
-        response = requests.get(markets_url, params=params, headers=headers)
-        
-        if response.status_code != 200:
-            print(f"Failed to fetch markets: {response.status_code}")
-            return []
-        
-        all_markets = response.json()
-        
-        if not isinstance(all_markets, list):
-            print("Unexpected API response format")
-            return []
-        
-        print(f"Retrieved {len(all_markets)} active markets from Polymarket")
-        
-        # Step 2: Filter for tradable markets (with CLOB token IDs)
-        tradable_markets = [
-            market for market in all_markets 
-            if market.get("clobTokenIds") and len(market.get("clobTokenIds", [])) > 0
-        ]
+        total_markets = 0
+        sports_markets = []
         
-        # Step 3: Filter for sports-related markets
-        sports_keywords = [
-            # NBA terms
-            "nba", "basketball", "lakers", "celtics", "warriors", "knicks", "heat", "bucks",
-            
-            # MLB terms
-            "mlb", "baseball", "yankees", "dodgers", "astros", "braves",
+        for page in iter_market_pages(params):
+            total_markets += len(page)
             
-            # NFL terms
-            "nfl", "football", "chiefs", "49ers", "cowboys", "eagles",
+            # Step 2: Filter for tradable markets (with CLOB token IDs)
+            tradable_markets = [market for market in page if parse_token_ids(market)]
             
-            # Soccer terms
-            "soccer", "football", "premier league", "uefa", "champions league", "fifa", "world cup",
-            "manchester united", "liverpool", "barcelona", "real madrid", "bayern",
-            
-            # Tennis terms
-            "tennis", "atp", "wta", "grand slam", "wimbledon", "us open", "australian open",
-            
-            # General sports terms
-            "sports", "game", "match", "playoff", "finals", "champion", "tournament"
-        ]
+            # Step 3: Filter for sports-related markets
+            for market in tradable_markets:
+                question = market.get("question", "").lower()
+                description = market.get("description", "").lower()
+                
+                # One scan finds the sports keywords and the game-related terms
+                _, hits = SPORTS_MATCHER.scan_fields(question, description)
+                if "scan_sports" in hits and "scan_game" in hits:
+                    sports_markets.append(ingest_market(market))
         
-        sports_markets = []
-        for market in tradable_markets:
-            question = market.get("question", "").lower()
-            description = market.get("description", "").lower()
-            
-            # Check if any sports keyword is in the market text
-            if any(keyword in question or keyword in description for keyword in sports_keywords):
-                # Validate with game-related terms
-                if any(term in question or term in description for term in ["win", "game", "vs", "score", "defeat", "champion", "match"]):
-                    sports_markets.append(market)
+        # Pages complete out of order, so restore the volume ordering
+        sports_markets.sort(key=lambda market: float(market.get("volume24hr") or 0), reverse=True)
         
+        print(f"Retrieved {total_markets} active markets from Polymarket")
         print(f"Found {len(sports_markets)} sports-related markets")
         
         # Step 4: Check for active order books
-        active_markets = []
-        for market in sports_markets:
-            # Get token IDs
-            token_ids = parse_token_ids(market)
-            
-            # Check if any token ID has an active order book
-            has_active_book = False
-            for token_id in token_ids:
-                book = get_order_book(token_id)
-                if book and (book.get("asks") or book.get("bids")):
-                    has_active_book = True
-                    break
-            
-            if has_active_book:
-                active_markets.append(market)
+        active_markets = probe_active_markets(sports_markets)
         
         print(f"Found {len(active_markets)} sports markets with active order books")
         return active_markets
@@ -120,72 +124,55 @@ def get_active_sports_markets() -> List[Dict[str, Any]]:
         print(f"Error fetching markets: {e}")
         return []
 
-def parse_token_ids(market: Dict[str, Any]) -> List[str]:
-    """
-    Parse token IDs from market data
+def probe_active_markets(
+    markets: List[Dict[str, Any]],
+    max_workers: int = ORDER_BOOK_PROBE_CONCURRENCY
+) -> List[Dict[str, Any]]:
     """
-    token_ids = market.get("clobTokenIds", [])
+    Probe the order books of many markets in parallel
     
-    # If token_ids is a string, try to parse it
-    if isinstance(token_ids, str):
-        try:
-            # Try to parse as JSON
-            import ast
-            parsed = ast.literal_eval(token_ids)
-            if isinstance(parsed, list):
-                return parsed
-        except:
-            # Try simple bracket parsing
-            if token_ids.startswith("[") and token_ids.endswith("]"):
-                # Remove brackets and split by comma
-                tokens = token_ids[1:-1].split(",")
-                # Clean up each token
-                return [t.strip(' "\'') for t in tokens if t.strip()]
-            
-            # If no parsing works, return as single item
-            return [token_ids]
-    
-    # If it's already a list, return it
-    elif isinstance(token_ids, list):
-        # Make sure all items are strings
-        return [str(token_id) for token_id in token_ids]
+    Every token of every market is queued on a shared thread pool. As soon as
+    one token of a market shows bids or asks, the market is marked active and
+    its sibling probes that have not started yet are cancelled.
     
-    # Return empty list if we couldn't parse token IDs
-    return []
-
-def parse_outcomes(market: Dict[str, Any]) -> List[str]:
-    """
-    Parse outcomes from market data
+    Args:
+        markets: Markets to probe
+        max_workers: Maximum number of order book requests in flight
+        
+    Returns:
+        The markets with at least one active order book, in input order
     """
-    outcomes = market.get("outcomes", [])
+    if not markets:
+        return []
     
-    # If outcomes is already parsed, return it
-    if isinstance(outcomes, list):
-        return outcomes
+    active = [False] * len(markets)
+    market_index = {}
+    siblings = {}
     
-    # If outcomes is a string, try to parse it
-    if isinstance(outcomes, str):
-        try:
-            # Try to parse as JSON
-            import ast
-            parsed = ast.literal_eval(outcomes)
-            if isinstance(parsed, list):
-                return parsed
-        except:
-            # Try simple parsing
-            if outcomes.startswith("[") and outcomes.endswith("]"):
-                # Remove brackets and split by comma
-                outcomes_list = outcomes[1:-1].split(",")
-                # Clean up each outcome
-                return [o.strip(' "\'') for o in outcomes_list if o.strip()]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for index, market in enumerate(markets):
+            siblings[index] = []
+            for token_id in parse_token_ids(market):
+                future = executor.submit(get_order_book, token_id)
+                market_index[future] = index
+                siblings[index].append(future)
+        
+        for future in as_completed(market_index):
+            index = market_index[future]
             
-            # If no parsing works, return as single item
-            return [outcomes]
+            # Skip probes for markets that are already known to be active
+            if active[index] or future.cancelled():
+                continue
+            
+            book = future.result()
+            if book is not None and not book.is_empty():
+                active[index] = True
+                for sibling in siblings[index]:
+                    sibling.cancel()
     
-    # Return empty list if we couldn't parse outcomes
-    return []
+    return [market for market, is_active in zip(markets, active) if is_active]
 
-def get_order_book(token_id: str) -> Optional[Dict[str, Any]]:
+def get_order_book(token_id: str) -> Optional[OrderBook]:
     """
     Get the order book for a specific token from the CLOB API
     """
@@ -196,28 +183,27 @@ def get_order_book(token_id: str) -> Optional[Dict[str, Any]]:
         
         headers = {
             "Accept": "application/json",
-            "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+            "Content-Type": "application/json"
         }
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_client.get(url, params=params, headers=headers, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
             # Handle both single book and array responses
             if isinstance(data, list) and len(data) > 0:
-                return data[0]
+                return OrderBook.from_json(data[0])
             elif isinstance(data, dict):
-                return data
+                return OrderBook.from_json(data)
             else:
                 return None
         else:
             # Try alternative endpoint structure
             alt_url = f"https://clob.polymarket.com/book/{token_id}"
-            alt_response = requests.get(alt_url, headers=headers, timeout=10)
+            alt_response = http_client.get(alt_url, headers=headers, timeout=10)
             
             if alt_response.status_code == 200:
-                return alt_response.json()
+                return OrderBook.from_json(alt_response.json())
             else:
                 # Only log specific errors for debugging
                 if response.status_code == 404:
@@ -232,42 +218,72 @@ def get_order_book(token_id: str) -> Optional[Dict[str, Any]]:
         print(f"Error fetching order book: {str(e)}")
         return None
 
+def get_order_books(token_ids: List[str]) -> Dict[str, OrderBook]:
+    """
+    Get the order books for many tokens through the CLOB multi-book endpoint
+    
+    Token IDs are sent in chunks of MAX_BOOKS_PER_REQUEST per POST /books
+    call. If a chunk request fails, the tokens in that chunk fall back to
+    get_order_book one at a time.
+    
+    Args:
+        token_ids: Token IDs to fetch books for (duplicates are ignored)
+        
+    Returns:
+        Dict mapping token_id to its order book; tokens without a book are omitted
+    """
+    url = "https://clob.polymarket.com/books"
+    
+    headers = {
+        "Accept": "application/json",
+        "Content-Type": "application/json"
+    }
+    
+    unique_ids = list(dict.fromkeys(str(token_id) for token_id in token_ids))
+    books = {}
+    
+    for start in range(0, len(unique_ids), MAX_BOOKS_PER_REQUEST):
+        chunk = unique_ids[start:start + MAX_BOOKS_PER_REQUEST]
+        payload = [{"token_id": token_id} for token_id in chunk]
+        
+        try:
+            response = http_client.post(url, json=payload, headers=headers, timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                if isinstance(data, list):
+                    for book in data:
+                        if isinstance(book, dict) and book.get("asset_id"):
+                            books[str(book["asset_id"])] = OrderBook.from_json(book)
+                    continue
+            
+            print(f"Bulk order book request failed ({response.status_code}), fetching {len(chunk)} books individually")
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Network error fetching order books: {str(e)}")
+        
+        for token_id in chunk:
+            book = get_order_book(token_id)
+            if book is not None:
+                books[token_id] = book
+    
+    return books
+
 def classify_market(question: str) -> str:
     """
     Classify a market into a sports category
     """
-    question = question.lower()
-    
-    # NBA related
-    if any(term in question for term in ["nba", "basketball", "lakers", "celtics", 
-                                        "warriors", "nets", "knicks", "heat", "bucks"]):
-        return "Basketball"
-    
-    # MLB related
-    elif any(term in question for term in ["mlb", "baseball", "yankees", "dodgers", 
-                                          "red sox", "cubs", "cardinals", "braves"]):
-        return "Baseball"
-    
-    # NFL related
-    elif any(term in question for term in ["nfl", "football", "super bowl", "chiefs", 
-                                          "49ers", "cowboys", "packers", "eagles"]):
-        return "Football"
-    
-    # Soccer related
-    elif any(term in question for term in ["soccer", "premier league", "uefa", "fifa", 
-                                        "manchester", "liverpool", "barcelona", "real madrid"]):
-        return "Soccer"
-    
-    # Tennis related
-    elif any(term in question for term in ["tennis", "atp", "wta", "grand slam", "wimbledon"]):
-        return "Tennis"
-    
-    # General sports
-    return "Other Sports"
+    hits = SPORTS_MATCHER.scan(question.lower())
+    return first_label(hits, CATEGORY_ORDER, "Other Sports")
 
-def display_market(market: Dict[str, Any]) -> None:
+def display_market(market: Dict[str, Any], books: Optional[Dict[str, OrderBook]] = None) -> None:
     """
     Display detailed information about a market and its order books
+    
+    Args:
+        market: The market to display
+        books: Optional prefetched order books keyed by token ID; fetched in
+            one batch for this market when omitted
     """
     # Get market details
     question = market.get("question", "Unknown Market")
@@ -295,38 +311,37 @@ def display_market(market: Dict[str, Any]) -> None:
     print(f"End Date: {end_date}")
     print("=" * 70)
     
-    # Get order books for each token ID
+    # Get order books for all token IDs in one request
+    if books is None:
+        books = get_order_books(token_ids)
+    
     for i, (outcome, token_id) in enumerate(zip(outcomes, token_ids)):
-        # Get order book for this token
-        order_book = get_order_book(token_id)
+        # Look up the order book for this token
+        order_book = books.get(token_id)
         
         # Display outcome header
         token_short = f"{token_id[:10]}...{token_id[-10:]}" if len(token_id) > 20 else token_id
         print(f"\nOUTCOME: {outcome}")
         print(f"Token ID: {token_short}")
         
-        if order_book and (order_book.get("bids") or order_book.get("asks")):
-            # Display bid and ask data
-            bids = order_book.get("bids", [])
-            asks = order_book.get("asks", [])
-            
+        if order_book is not None and not order_book.is_empty():
             # Best bid and ask
-            best_bid = f"{float(bids[0]['price']):.3f}" if bids else "None"
-            best_ask = f"{float(asks[0]['price']):.3f}" if asks else "None"
+            best_bid = f"{order_book.best_bid:.3f}" if order_book.bids else "None"
+            best_ask = f"{order_book.best_ask:.3f}" if order_book.asks else "None"
             
             print(f"Best Bid: {best_bid}")
             print(f"Best Ask: {best_ask}")
             
             # Show order depth (up to 3 levels)
-            if bids:
+            if order_book.bids:
                 print("\nBid Depth:")
-                for j, bid in enumerate(bids[:3]):
-                    print(f"  {float(bid['price']):.3f} - Size: {float(bid['size']):.1f}")
+                for price, size in order_book.bid_levels(3):
+                    print(f"  {price:.3f} - Size: {size:.1f}")
             
-            if asks:
+            if order_book.asks:
                 print("\nAsk Depth:")
-                for j, ask in enumerate(asks[:3]):
-                    print(f"  {float(ask['price']):.3f} - Size: {float(ask['size']):.1f}")
+                for price, size in order_book.ask_levels(3):
+                    print(f"  {price:.3f} - Size: {size:.1f}")
         else:
             print("No active order book available")
         
@@ -360,9 +375,13 @@ def main() -> None:
     for category, markets in market_categories.items():
         print(f"- {category}: {len(markets)} markets")
     
+    # Fetch the order books for every market in a few bulk requests
+    all_token_ids = [token_id for market in sports_markets for token_id in parse_token_ids(market)]
+    books = get_order_books(all_token_ids)
+    
     # Display each market
     for market in sports_markets:
-        display_market(market)
+        display_market(market, books)
     
     # Summary
     print("\n" + "=" * 70)
@@ -378,10 +397,6 @@ def get_sports_markets_simplified() -> List[Dict[str, Any]]:
     # Step 1: Try multiple API approaches to get current markets
     markets_url = "https://gamma-api.polymarket.com/markets"
     
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
-    }
-    
     # Try multiple API parameter combinations
     api_attempts = [
         # Attempt 1: Order by end date descending (most recent first)
@@ -402,7 +417,7 @@ def get_sports_markets_simplified() -> List[Dict[str, Any]]:
     for i, params in enumerate(api_attempts):
         try:
             print(f"API Attempt {i+1}: {params}")
-            response = requests.get(markets_url, params=params, headers=headers)
+            response = http_client.get(markets_url, params=params)
             
             if response.status_code == 200:
                 markets = response.json()
@@ -451,83 +466,31 @@ def get_sports_markets_simplified() -> List[Dict[str, Any]]:
     try:
         print(f"Processing {len(all_markets)} total markets...")
         
-        # Step 2: Filter out expired markets (API seems to return old markets as "active")
-        current_time = datetime.now(timezone.utc)
-        current_markets = []
-        expired_count = 0
-        
-        for market in all_markets:
-            end_date_str = market.get("endDate")
-            if end_date_str:
-                try:
-                    # Parse the end date
-                    end_date = datetime.fromisoformat(end_date_str.replace("Z", "+00:00"))
-                    
-                    # Only include markets that haven't ended yet (with some buffer)
-                    if end_date > current_time:
-                        current_markets.append(market)
-                    else:
-                        expired_count += 1
-                except Exception as e:
-                    # If we can't parse the date, include the market anyway
-                    current_markets.append(market)
-            else:
-                # If no end date, include the market
-                current_markets.append(market)
+        # Step 2: Load the markets into a columnar table (each field parsed once)
+        table = MarketTable(all_markets, SPORTS_MATCHER, CATEGORY_ORDER)
         
-        print(f"After filtering: {len(current_markets)} current markets, {expired_count} expired markets filtered out")
+        # Step 3: Filter out expired markets (API seems to return old markets as "active")
+        # Markets without a parseable end date are kept
+        current = table.expiry_mask(time.time())
+        expired_count = len(table) - int(current.sum())
         
-        # Step 3: Filter for tradable markets (with CLOB token IDs)
-        tradable_markets = [
-            market for market in current_markets 
-            if market.get("clobTokenIds") and len(market.get("clobTokenIds", [])) > 0
-        ]
+        print(f"After filtering: {int(current.sum())} current markets, {expired_count} expired markets filtered out")
         
-        print(f"Tradable markets with token IDs: {len(tradable_markets)}")
+        # Step 4: Filter for tradable markets (with CLOB token IDs)
+        tradable = current & table.has_tokens
         
-        # Step 4: Filter for sports-related markets
-        sports_keywords = [
-            # Basketball terms
-            "nba", "basketball", "lakers", "celtics", "warriors", "knicks", "heat", "bucks", "mvp",
-            
-            # Baseball terms
-            "mlb", "baseball", "yankees", "dodgers", "astros", "braves", "world series",
-            
-            # Football terms
-            "nfl", "football", "chiefs", "49ers", "cowboys", "eagles", "super bowl", "quarterback",
-            
-            # Soccer terms
-            "soccer", "football", "premier league", "uefa", "champions league", "fifa", "world cup",
-            "manchester united", "liverpool", "barcelona", "real madrid", "bayern", "messi", "ronaldo",
-            
-            # Tennis terms
-            "tennis", "atp", "wta", "grand slam", "wimbledon", "us open", "australian open", "french open",
-            
-            # Basketball players
-            "lebron", "curry", "durant", "giannis", "luka", "embiid", "jokic", "tatum",
-            
-            # General sports terms
-            "sports", "game", "match", "playoff", "finals", "champion", "tournament", "season", "draft"
-        ]
+        print(f"Tradable markets with token IDs: {int(tradable.sum())}")
         
-        sports_markets = []
-        for market in tradable_markets:
-            question = market.get("question", "").lower()
-            description = market.get("description", "").lower()
-            
-            # Check if any sports keyword is in the market text
-            if any(keyword in question or keyword in description for keyword in sports_keywords):
-                # Validate with game-related terms for better filtering
-                game_terms = ["win", "game", "vs", "score", "defeat", "champion", "match", "beat", "against", "over", "under"]
-                if any(term in question or term in description for term in game_terms):
-                    sports_markets.append(market)
+        # Step 5: Filter for sports-related markets (sports keyword and game-related term)
+        sports = tradable & table.keyword_mask("simplified_sports", "simplified_game")
+        sports_markets = [ingest_market(market) for market in table.select(sports)]
         
         print(f"Found {len(sports_markets)} current sports-related markets")
         
         # If no sports markets found, show some sample current markets for debugging
-        if len(sports_markets) == 0 and len(current_markets) > 0:
+        if len(sports_markets) == 0 and current.any():
             print("\n🔍 No sports markets found. Sample current markets:")
-            for i, market in enumerate(current_markets[:5]):
+            for i, market in enumerate(table.select(current)[:5]):
                 question = market.get("question", "Unknown")
                 end_date = market.get("endDate", "Unknown")
                 print(f"  {i+1}. {question} (ends: {end_date})")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+import threading
+from typing import Any, Dict, List, Optional, Set
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TransactionNotFound, Web3RPCError
+
+# Node error messages meaning the nonce is already mined, so the local counter is behind
+STALE_NONCE_ERRORS = ("nonce too low",)
+# Another transaction with the same nonce is still waiting in the pool
+NONCE_IN_FLIGHT_ERRORS = ("replacement transaction underpriced",)
+MAX_NONCE_RETRIES = 3
+
+def is_stale_nonce_error(error: BaseException) -> bool:
+    message = str(error).lower()
+    return any(text in message for text in STALE_NONCE_ERRORS)
+
+def is_nonce_in_flight_error(error: BaseException) -> bool:
+    message = str(error).lower()
+    return any(text in message for text in NONCE_IN_FLIGHT_ERRORS)
+
+class NonceManager:
+    """
+    Hand out nonces for one wallet locally, without a round trip per send
+
+    The first allocation syncs from the wallet's ``pending`` transaction
+    count; after that nonces come from a local counter under a lock, so
+    several threads can sign and send back-to-back without waiting for each
+    other's transactions to be mined. When the node answers "nonce too low"
+    (a transaction was sent from this wallet elsewhere), the counter is
+    moved up to the node's pending count and the send retried with a fresh
+    nonce. The counter never moves backwards, since nonces handed to other
+    threads may not have reached the node yet.
+
+    "replacement transaction underpriced" is not a stale nonce: another
+    transaction with that nonce is still pending. The error is raised
+    without reconciling, and the nonce is not handed out again.
+    """
+
+    def __init__(self, w3: Web3, address: str):
+        self.w3 = w3
+        self.address = Web3.to_checksum_address(address)
+        self._next: Optional[int] = None
+        self._highest_allocated: Optional[int] = None
+        self._released: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def _pending_count(self) -> int:
+        return self.w3.eth.get_transaction_count(self.address, "pending")
+
+    def reconcile(self) -> int:
+        """
+        Catch up with the node after a stale nonce
+
+        The counter moves to the node's pending count or just past the
+        highest nonce handed out here, whichever is higher; nonces allocated
+        but not yet sent are not in the node's count.
+
+        Returns:
+            The next nonce that will be handed out
+        """
+        pending = self._pending_count()
+        with self._lock:
+            allocated_next = -1 if self._highest_allocated is None else self._highest_allocated + 1
+            self._next = max(pending, allocated_next, self._next or 0)
+            self._released = {nonce for nonce in self._released if nonce >= pending}
+            return min(self._released, default=self._next)
+
+    def allocate(self) -> int:
+        """Reserve the next nonce; asks the node only on first use"""
+        with self._lock:
+            if self._released:
+                nonce = min(self._released)
+                self._released.remove(nonce)
+                return nonce
+
+        if self._next is None:
+            pending = self._pending_count()
+            with self._lock:
+                if self._next is None:
+                    self._next = pending
+
+        with self._lock:
+            nonce = self._next
+            self._next += 1
+            self._highest_allocated = nonce if self._highest_allocated is None else max(self._highest_allocated, nonce)
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        """
+        Give back a nonce whose transaction was never broadcast, so it is reused before a gap forms
+
+        Only call this when the node is known not to hold the transaction:
+        a reused nonce with a higher fee would replace it.
+        """
+        with self._lock:
+            self._released.add(nonce)
+
+    def _known_to_node(self, tx_hash: bytes) -> Optional[bool]:
+        """Whether the node has a transaction, or None if it cannot be asked"""
+        try:
+            self.w3.eth.get_transaction(tx_hash)
+            return True
+        except TransactionNotFound:
+            return False
+        except Exception:
+            return None
+
+    def send_transaction(self, tx: Dict[str, Any], private_key: str) -> HexBytes:
+        """
+        Fill in the nonce, sign and broadcast a transaction without waiting for it
+
+        Returns:
+            Transaction hash
+
+        Raises:
+            The node's error if the send fails for any reason other than a
+            stale nonce, or still fails after MAX_NONCE_RETRIES reconciles.
+            For "replacement transaction underpriced" the nonce stays taken,
+            so the next send moves on to the following one. After a
+            transport error (timeout, dropped connection) the node may have
+            accepted the transaction anyway: the hash is looked up, and the
+            nonce is only given back if the node says it does not have it.
+        """
+        for attempt in range(MAX_NONCE_RETRIES + 1):
+            nonce = self.allocate()
+            signed = self.w3.eth.account.sign_transaction(dict(tx, nonce=nonce), private_key)
+            try:
+                return self.w3.eth.send_raw_transaction(signed.raw_transaction)
+            except Web3RPCError as e:
+                # The node answered and rejected the transaction
+                if "already known" in str(e).lower():
+                    # This exact transaction is already in the pool
+                    return HexBytes(signed.hash)
+                if is_nonce_in_flight_error(e):
+                    # Someone else's pending transaction holds this nonce; reusing it would fail again
+                    raise
+                if not is_stale_nonce_error(e) or attempt == MAX_NONCE_RETRIES:
+                    self.release(nonce)
+                    raise
+                print(f"Nonce {nonce} is stale ({e}); reconciling with the node")
+                self.reconcile()
+            except Exception:
+                # No answer: the transaction may or may not have reached the pool
+                known = self._known_to_node(signed.hash)
+                if known:
+                    return HexBytes(signed.hash)
+                if known is False:
+                    self.release(nonce)
+                else:
+                    print(f"Cannot tell whether the transaction with nonce {nonce} was sent; keeping the nonce taken")
+                raise
+
+_managers: Dict[str, NonceManager] = {}
+_managers_lock = threading.Lock()
+
+def nonce_manager_for(w3: Web3, address: str) -> NonceManager:
+    """The shared NonceManager for a wallet, so every sender in the process uses one counter"""
+    key = address.lower()
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = NonceManager(w3, address)
+        return manager
+
+def check_against_local_chain(threads: int = 4, per_thread: int = 5) -> bool:
+    """
+    Pipeline transactions from several threads through one manager, offline
+
+    Before the threads start, a transaction is sent from the same wallet outside the
+    manager, so the manager has to recover from "nonce too low". Every
+    transaction must then be mined, with no nonce gaps or duplicates.
+    Then an outside transaction is left pending on the manager's next
+    nonce: that send must fail as underpriced without moving the counter
+    back, and the following send must use the next nonce. Finally sends
+    time out after reaching the node (the hash counts as sent) and before
+    reaching it (the nonce is reused by the next send).
+    """
+    from eth_account import Account
+    from local_chain import LocalChain, LOCAL_CHAIN_ID
+
+    chain = LocalChain()
+    w3 = Web3(chain.provider())
+    account = Account.create()
+    manager = NonceManager(w3, account.address)
+
+    def tx_for(index: int) -> Dict[str, Any]:
+        return {
+            "to": "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E",
+            "value": 0,
+            "data": "0x" + f"{index:064x}",
+            "gas": 100_000,
+            "gasPrice": w3.to_wei(50, "gwei"),
+            "chainId": LOCAL_CHAIN_ID,
+        }
+
+    hashes = []
+    hashes_lock = threading.Lock()
+
+    def sender(offset: int) -> None:
+        for index in range(per_thread):
+            tx_hash = manager.send_transaction(tx_for(offset + index), account.key)
+            with hashes_lock:
+                hashes.append(tx_hash)
+
+    # Let the manager sync, then send and mine one transaction behind its back
+    manager.allocate()
+    manager.release(0)
+    outside = Account.sign_transaction(dict(tx_for(999), nonce=0), account.key)
+    chain.send_raw_transaction(outside.raw_transaction)
+    chain.mine()
+
+    workers = [threading.Thread(target=sender, args=(n * per_thread,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    chain.mine()
+
+    # A pending outside transaction holds the manager's next nonce
+    in_flight_nonce = threads * per_thread + 1
+    outside = Account.sign_transaction(dict(tx_for(998), nonce=in_flight_nonce), account.key)
+    chain.send_raw_transaction(outside.raw_transaction)
+    try:
+        manager.send_transaction(tx_for(997), account.key)
+        underpriced_raised = False
+    except Exception as e:
+        underpriced_raised = is_nonce_in_flight_error(e)
+    hashes.append(manager.send_transaction(tx_for(996), account.key))
+
+    # Transport errors: the node's answer is lost after, or before, it sees the transaction
+    original_handle = chain.handle
+
+    def lost_reply(method: str, params: List[Any]) -> Any:
+        if method == "eth_sendRawTransaction":
+            original_handle(method, params)
+            raise TimeoutError("read timed out")
+        return original_handle(method, params)
+
+    def lost_request(method: str, params: List[Any]) -> Any:
+        if method == "eth_sendRawTransaction":
+            raise TimeoutError("connection dropped")
+        return original_handle(method, params)
+
+    chain.handle = lost_reply
+    hashes.append(manager.send_transaction(tx_for(995), account.key))
+    chain.handle = lost_request
+    try:
+        manager.send_transaction(tx_for(994), account.key)
+        dropped_raised = False
+    except TimeoutError:
+        dropped_raised = True
+    chain.handle = original_handle
+    hashes.append(manager.send_transaction(tx_for(993), account.key))
+    chain.mine()
+
+    receipts = [chain.receipt("0x" + bytes(tx_hash).hex()) for tx_hash in hashes]
+    nonces = sorted(receipt["nonce"] for receipt in receipts if receipt is not None)
+    expected = [nonce for nonce in range(1, in_flight_nonce + 4) if nonce != in_flight_nonce]
+
+    print(f"Sent {len(hashes)} transactions from {threads} threads; "
+          f"mined nonces {nonces[0] if nonces else '-'}..{nonces[-1] if nonces else '-'}")
+    ok = (
+        nonces == expected
+        and underpriced_raised
+        and dropped_raised
+        and chain.transaction_count(account.address) == in_flight_nonce + 4
+    )
+    print("Nonces are gap-free and unique" if ok else "Nonce allocation FAILED")
+    return ok
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if check_against_local_chain() else 1)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+from array import array
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Tuple
+
+TICK_SCALE = 10_000  # Integer ticks per 1.0 of price (finest CLOB tick is 0.0001)
+EMPTY_SIDE_KEY = 2 ** 62  # Best key written by BookSide.append_top for a side with no levels
+
+_EMPTY_KEY = array("q", [EMPTY_SIDE_KEY])
+_ZERO_SIZES = array("d", [0.0]) * 64  # Shared padding for the usual depths; deeper rows build their own
+
+def price_to_ticks(price: Any) -> int:
+    """Convert a price (float or decimal string) to integer ticks"""
+    return int(round(float(price) * TICK_SCALE))
+
+def ticks_to_price(ticks: int) -> float:
+    """Convert integer ticks back to a price"""
+    return ticks / TICK_SCALE
+
+class BookSide:
+    """
+    One side of an L2 book as two parallel arrays: sort keys and sizes
+
+    Keys are integer ticks, negated on the ask side, and kept ascending so the
+    best level is always the last element. That makes the best price O(1),
+    level lookups O(log n), and removing the top of the book a pop from the end.
+    """
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys = array("q")
+        self._sizes = array("d")
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, ticks: int) -> int:
+        return ticks if self.is_bid else -ticks
+
+    def _ticks(self, key: int) -> int:
+        return key if self.is_bid else -key
+
+    def set_level(self, ticks: int, size: float) -> None:
+        """Set the size at a price level; a size of zero removes the level"""
+        key = self._key(ticks)
+        position = bisect_left(self._keys, key)
+        exists = position < len(self._keys) and self._keys[position] == key
+
+        if size <= 0:
+            if exists:
+                del self._keys[position]
+                del self._sizes[position]
+        elif exists:
+            self._sizes[position] = size
+        else:
+            self._keys.insert(position, key)
+            self._sizes.insert(position, size)
+
+    def load(self, levels: List[Tuple[int, float]]) -> None:
+        """Replace every level at once from (ticks, size) pairs in any order"""
+        merged = {}
+        for ticks, size in levels:
+            if size > 0:
+                merged[self._key(ticks)] = size
+        keys = sorted(merged)
+        self._keys = array("q", keys)
+        self._sizes = array("d", (merged[key] for key in keys))
+
+    def best(self) -> Optional[Tuple[int, float]]:
+        """(ticks, size) of the best level, or None when the side is empty"""
+        if not self._keys:
+            return None
+        return self._ticks(self._keys[-1]), self._sizes[-1]
+
+    def levels(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        """(price, size) pairs from the best level outwards"""
+        count = len(self._keys) if depth is None else min(depth, len(self._keys))
+        return [
+            (ticks_to_price(self._ticks(self._keys[-1 - i])), self._sizes[-1 - i])
+            for i in range(count)
+        ]
+
+    def size_at(self, ticks: int) -> float:
+        """Resting size at exactly this price level"""
+        key = self._key(ticks)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._sizes[position]
+        return 0.0
+
+    def top_sizes(self, levels: int) -> array:
+        """Sizes of the best ``levels`` levels, ordered from the furthest of them to the best"""
+        return self._sizes[len(self._sizes) - min(levels, len(self._sizes)):]
+
+    def depth(self, levels: int) -> float:
+        """Total size over the best ``levels`` price levels"""
+        return sum(self.top_sizes(levels))
+
+    def depth_through(self, ticks: int) -> float:
+        """Total size at prices as good as or better than ``ticks``"""
+        position = bisect_left(self._keys, self._key(ticks))
+        return sum(self._sizes[position:])
+
+    def levels_through(self, ticks: int) -> int:
+        """Number of levels at prices as good as or better than ``ticks``"""
+        return len(self._keys) - bisect_left(self._keys, self._key(ticks))
+
+    def append_top(self, levels: int, keys_out: array, sizes_out: array) -> None:
+        """
+        Append this side's best key and its top ``levels`` sizes to flat arrays
+
+        Used to stack many books into matrices without per-level Python work.
+        Sizes are zero-padded in front to exactly ``levels`` values (best level
+        last); an empty side appends EMPTY_SIDE_KEY as its key. Keys are
+        negated ticks on the ask side.
+        """
+        sizes = self._sizes[len(self._sizes) - min(levels, len(self._sizes)):]
+        padding = levels - len(sizes)
+        sizes_out.extend(_ZERO_SIZES[:padding] if padding <= len(_ZERO_SIZES) else array("d", [0.0]) * padding)
+        sizes_out.extend(sizes)
+        keys_out.extend(self._keys[-1:] or _EMPTY_KEY)
+
+    def copy(self) -> "BookSide":
+        side = BookSide(self.is_bid)
+        side._keys = array("q", self._keys)
+        side._sizes = array("d", self._sizes)
+        return side
+
+class OrderBook:
+    """
+    L2 order book for one CLOB token
+
+    Prices are held as integer ticks (see TICK_SCALE) and sizes as floats, so
+    the wire strings are parsed once in ``from_json``. Levels are always kept
+    in price order whatever order the API sent them in, with the best bid and
+    best ask available in O(1).
+    """
+
+    def __init__(
+        self,
+        asset_id: Optional[str] = None,
+        market: Optional[str] = None,
+        timestamp: Optional[str] = None,
+        book_hash: Optional[str] = None,
+        tick_size: Optional[float] = None
+    ):
+        self.asset_id = asset_id
+        self.market = market
+        self.timestamp = timestamp
+        self.hash = book_hash
+        self.tick_size = tick_size
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "OrderBook":
+        """
+        Build a book from a CLOB ``/book`` or ``/books`` response entry
+
+        Args:
+            data: Dict with ``bids`` and ``asks`` lists of {"price": str, "size": str}
+        """
+        tick_size = data.get("tick_size")
+        book = cls(
+            asset_id=str(data["asset_id"]) if data.get("asset_id") is not None else None,
+            market=data.get("market"),
+            timestamp=data.get("timestamp"),
+            book_hash=data.get("hash"),
+            tick_size=float(tick_size) if tick_size is not None else None
+        )
+        book.bids.load(_parse_levels(data.get("bids")))
+        book.asks.load(_parse_levels(data.get("asks")))
+        return book
+
+    def side(self, side: str) -> BookSide:
+        """Return the bid side for "BUY"/"bids" and the ask side for "SELL"/"asks" """
+        key = side.upper()
+        if key in ("BUY", "BID", "BIDS"):
+            return self.bids
+        if key in ("SELL", "ASK", "ASKS"):
+            return self.asks
+        raise ValueError(f"Unknown book side {side!r}")
+
+    def update_level(self, side: str, price: Any, size: Any) -> None:
+        """Apply one price-level change; size 0 removes the level"""
+        self.side(side).set_level(price_to_ticks(price), float(size))
+
+    def is_empty(self) -> bool:
+        """True when the book has no bids and no asks"""
+        return not self.bids and not self.asks
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return ticks_to_price(best[0]) if best else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return ticks_to_price(best[0]) if best else None
+
+    @property
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    @property
+    def spread(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def bid_levels(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        """(price, size) bids, best (highest) first"""
+        return self.bids.levels(depth)
+
+    def ask_levels(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        """(price, size) asks, best (lowest) first"""
+        return self.asks.levels(depth)
+
+    def depth_to_price(self, side: str, price: Any) -> float:
+        """
+        Cumulative size on one side from the best level up to a limit price
+
+        For asks this is the size a buy limited at ``price`` could take; for
+        bids, the size a sell limited at ``price`` could hit.
+        """
+        return self.side(side).depth_through(price_to_ticks(price))
+
+    def snapshot(self) -> "OrderBook":
+        """Independent copy of the book (array copies, no re-parsing)"""
+        book = OrderBook(self.asset_id, self.market, self.timestamp, self.hash, self.tick_size)
+        book.bids = self.bids.copy()
+        book.asks = self.asks.copy()
+        return book
+
+    def to_json(self) -> Dict[str, Any]:
+        """Serialize back to the CLOB wire format, best levels first"""
+        return {
+            "asset_id": self.asset_id,
+            "market": self.market,
+            "timestamp": self.timestamp,
+            "hash": self.hash,
+            "tick_size": str(self.tick_size) if self.tick_size is not None else None,
+            "bids": [{"price": str(price), "size": str(size)} for price, size in self.bid_levels()],
+            "asks": [{"price": str(price), "size": str(size)} for price, size in self.ask_levels()],
+        }
+
+def _parse_levels(levels: Any) -> List[Tuple[int, float]]:
+    parsed = []
+    for level in levels or []:
+        try:
+            parsed.append((price_to_ticks(level["price"]), float(level["size"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return parsed
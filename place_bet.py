@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import datetime
 import os
 from dotenv import load_dotenv
+from market_parsing import parse_token_ids
+from order_book import OrderBook
 
 # Safely load environment variables - RECOMMENDED APPROACH
 load_dotenv()
@@ -21,7 +23,7 @@ def get_nba_markets():
         "start_date_min": min_date
     }
     
-    resp = requests.get(url, params=params, headers={"User-Agent": "Mozilla/5.0"})
+    resp = http_client.get(url, params=params)
     if resp.status_code != 200:
         print(f"API request failed with status {resp.status_code}")
         return []
@@ -40,29 +42,6 @@ def get_nba_markets():
     
     return nba_markets
 
-def parse_token_ids(market):
-    """Parse token IDs from market data"""
-    token_ids = market.get("clobTokenIds", [])
-    
-    if isinstance(token_ids, list):
-        return [str(t) for t in token_ids]
-    
-    if isinstance(token_ids, str):
-        try:
-            import ast
-            parsed = ast.literal_eval(token_ids)
-            if isinstance(parsed, list):
-                return parsed
-        except:
-            # Try simple parsing
-            if token_ids.startswith("[") and token_ids.endswith("]"):
-                tokens = token_ids[1:-1].split(",")
-                return [t.strip(' "\'') for t in tokens if t.strip()]
-            
-            return [token_ids]
-    
-    return []
-
 def place_bet(market, amount=1.0, bet_side="BUY"):
     """Place a bet on a specific market"""
     # IMPORTANT: Use environment variables for private keys
@@ -124,15 +103,14 @@ def place_bet(market, amount=1.0, bet_side="BUY"):
         # Get current market price
         book_url = "https://clob.polymarket.com/book"
         book_params = {"token_id": token_id}
-        book_resp = requests.get(book_url, params=book_params)
+        book_resp = http_client.get(book_url, params=book_params)
         
         price = 0.5  # Default to 50% if we can't get the price
         if book_resp.status_code == 200:
-            book_data = book_resp.json()
-            asks = book_data.get("asks", [])
-            if asks:
+            book = OrderBook.from_json(book_resp.json())
+            if book.asks:
                 # Use the best ask price if available
-                price = float(asks[0]["price"])
+                price = book.best_ask
         
         print(f"Creating order for {amount} USDC on {question} at price {price}...")
         
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
-import requests
-import json
+import http_client
 import os
 import time
 from typing import Dict, Any, Optional, List, Tuple
 from dotenv import load_dotenv
 from web3 import Web3
 from eth_account import Account
+from multicall import read_balance_and_allowance, web3_transport
+from nonce_manager import nonce_manager_for
+from tx_tracker import TxTracker, TxOutcome, rpc_batch, print_outcome
+from gas_fees import GasOracle
 from nba_markets import get_active_sports_markets, get_sports_markets_simplified, parse_token_ids, parse_outcomes, classify_market
 
 # Load environment variables
@@ -18,6 +21,17 @@ USDC_CONTRACT = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"  # Native USDC on P
 RPC_URL = "https://polygon-rpc.com"
 CLOB_API_URL = "https://clob.polymarket.com"
 
+# Confirms settlement transactions in the background with batched receipt polls
+settlement_tracker = TxTracker(rpc_batch(RPC_URL))
+
+# EIP-1559 fees from recent fee history and gas limits from eth_estimateGas
+gas_oracle = GasOracle(rpc_batch(RPC_URL))
+
+def report_settlement(outcome: TxOutcome) -> None:
+    """Tracker callback: the settlement's outcome and its gas use against the estimate"""
+    print_outcome(outcome)
+    gas_oracle.report.observe(outcome)
+
 def get_wallet_info() -> Tuple[str, str, Web3]:
     """
     Get wallet address and web3 connection from private key
@@ -33,7 +47,8 @@ def get_wallet_info() -> Tuple[str, str, Web3]:
         private_key = "0x" + private_key
     
     # Connect to Polygon network
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    # Reuse the pooled keep-alive session for RPC calls
+    w3 = Web3(Web3.HTTPProvider(RPC_URL, session=http_client.get_session(RPC_URL)))
     
     if not w3.is_connected():
         raise ConnectionError("Failed to connect to Polygon network")
@@ -51,36 +66,9 @@ def check_usdc_approval(wallet_address: str, w3: Web3) -> bool:
     """
     Check if USDC is approved for spending by Polymarket
     """
-    # USDC contract ABI (for balanceOf and allowance functions)
-    usdc_abi = json.loads('''[
-        {
-            "constant": true,
-            "inputs": [{"name": "account", "type": "address"}],
-            "name": "balanceOf",
-            "outputs": [{"name": "", "type": "uint256"}],
-            "payable": false,
-            "stateMutability": "view",
-            "type": "function"
-        },
-        {
-            "constant": true,
-            "inputs": [
-                {"name": "owner", "type": "address"},
-                {"name": "spender", "type": "address"}
-            ],
-            "name": "allowance",
-            "outputs": [{"name": "", "type": "uint256"}],
-            "payable": false,
-            "stateMutability": "view",
-            "type": "function"
-        }
-    ]''')
-    
-    # Create contract instance
-    usdc_contract = w3.eth.contract(address=USDC_CONTRACT, abi=usdc_abi)
-    
-    # Check USDC balance
-    balance = usdc_contract.functions.balanceOf(wallet_address).call()
+    # Balance and allowance in one Multicall3 eth_call, read at the same block
+    reads = read_balance_and_allowance(web3_transport(w3), USDC_CONTRACT, wallet_address, POLYMARKET_EXCHANGE)
+    balance, current_allowance = reads.values
     balance_usdc = balance / 10**6  # USDC has 6 decimals
     
     print(f"USDC balance: {balance_usdc} USDC")
@@ -89,11 +77,6 @@ def check_usdc_approval(wallet_address: str, w3: Web3) -> bool:
         print("You don't have any USDC in your wallet.")
         return False
     
-    # Check current allowance
-    current_allowance = usdc_contract.functions.allowance(
-        wallet_address, 
-        POLYMARKET_EXCHANGE
-    ).call()
     current_allowance_usdc = current_allowance / 10**6
     
     print(f"Current Polymarket allowance: {current_allowance_usdc} USDC")
@@ -107,7 +90,8 @@ def place_market_order(
     size: float, 
     wallet_address: str, 
     private_key: str,
-    w3: Web3
+    w3: Web3,
+    wait: bool = True
 ) -> Optional[str]:
     """
     Place a market order on Polymarket
@@ -119,6 +103,8 @@ def place_market_order(
         wallet_address: The wallet address
         private_key: The private key for signing
         w3: Web3 instance
+        wait: Wait for the settlement transaction to confirm; when False the
+            hash is returned once sent and settlement_tracker reports the outcome
         
     Returns:
         Optional transaction hash if successful
@@ -140,11 +126,10 @@ def place_market_order(
         
         headers = {
             "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": "Mozilla/5.0"
+            "Accept": "application/json"
         }
         
-        response = requests.post(signature_url, headers=headers, json=order)
+        response = http_client.post(signature_url, headers=headers, json=order)
         
         if response.status_code != 200:
             print(f"Failed to get order signature: {response.status_code}")
@@ -178,7 +163,7 @@ def place_market_order(
         # Step 4: Submit the order
         order_url = f"{CLOB_API_URL}/orders"
         
-        order_response = requests.post(order_url, headers=headers, json=signed_order)
+        order_response = http_client.post(order_url, headers=headers, json=signed_order)
         
         if order_response.status_code != 200:
             print(f"Failed to place order: {order_response.status_code}")
@@ -197,28 +182,38 @@ def place_market_order(
                 'to': tx_data.get("to"),
                 'data': tx_data.get("data"),
                 'value': w3.to_wei(0, 'ether'),  # No ETH value
-                'gas': 500000,  # Gas limit
-                'gasPrice': w3.to_wei('50', 'gwei'),
-                'nonce': w3.eth.get_transaction_count(wallet_address),
             }
             
-            # Sign and send transaction
-            signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            # Gas limit from an estimate plus margin, fees to be included within GAS_TARGET_BLOCKS
+            tx, gas_estimate, fee_quote = gas_oracle.fill_transaction(tx)
+            print(gas_oracle.describe(fee_quote, gas_estimate))
+            
+            # Sign and send transaction; the nonce comes from the wallet's local counter
+            tx_hash = nonce_manager_for(w3, wallet_address).send_transaction(tx, private_key)
+            gas_oracle.report.record(tx_hash, gas_estimate, fee_quote)
             
             print(f"Settlement transaction sent! Hash: {tx_hash.hex()}")
             print(f"View on PolygonScan: https://polygonscan.com/tx/{tx_hash.hex()}")
             
+            if not wait:
+                # Keep going; the tracker reports the outcome when it settles
+                settlement_tracker.track(tx_hash, callback=report_settlement)
+                return tx_hash.hex()
+            
             # Wait for transaction to be mined
             print("Waiting for transaction to be confirmed...")
-            tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            outcome = settlement_tracker.track(tx_hash).result()
+            gas_oracle.report.observe(outcome)
             
-            if tx_receipt['status'] == 1:
+            if outcome.status == "confirmed":
                 print("✅ Transaction confirmed!")
                 return tx_hash.hex()
-            else:
+            elif outcome.status == "failed":
                 print("❌ Transaction failed. Please check PolygonScan for details.")
                 return None
+            else:
+                print_outcome(outcome)
+                return None
         else:
             print("Order placed successfully!")
             return "success"
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
-import requests
-import json
+import http_client
 import os
 import sys
 import time
@@ -8,7 +7,12 @@ from typing import Dict, Any, Optional, List, Tuple
 from dotenv import load_dotenv
 from web3 import Web3
 from eth_account import Account
-from nba_markets import get_active_sports_markets, parse_token_ids, parse_outcomes, get_order_book
+from multicall import read_balance_and_allowance, web3_transport
+from nonce_manager import nonce_manager_for
+from tx_tracker import TxTracker, TxOutcome, rpc_batch, print_outcome
+from gas_fees import GasOracle
+from nba_markets import get_active_sports_markets, parse_token_ids, parse_outcomes, get_order_books
+from liquidity_ranking import liquidity_scores, top_candidates
 
 # Load environment variables
 load_dotenv()
@@ -20,6 +24,17 @@ RPC_URL = "https://polygon-rpc.com"
 CLOB_API_URL = "https://clob.polymarket.com"
 BET_AMOUNT = 1.0  # Fixed bet amount in USDC
 
+# Confirms settlement transactions in the background with batched receipt polls
+settlement_tracker = TxTracker(rpc_batch(RPC_URL))
+
+# EIP-1559 fees from recent fee history and gas limits from eth_estimateGas
+gas_oracle = GasOracle(rpc_batch(RPC_URL))
+
+def report_settlement(outcome: TxOutcome) -> None:
+    """Tracker callback: the settlement's outcome and its gas use against the estimate"""
+    print_outcome(outcome)
+    gas_oracle.report.observe(outcome)
+
 def get_wallet_info() -> Tuple[str, str, Web3]:
     """
     Get wallet address and web3 connection from private key
@@ -35,7 +50,8 @@ def get_wallet_info() -> Tuple[str, str, Web3]:
         private_key = "0x" + private_key
     
     # Connect to Polygon network
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    # Reuse the pooled keep-alive session for RPC calls
+    w3 = Web3(Web3.HTTPProvider(RPC_URL, session=http_client.get_session(RPC_URL)))
     
     if not w3.is_connected():
         raise ConnectionError("Failed to connect to Polygon network")
@@ -53,36 +69,9 @@ def check_usdc_approval(wallet_address: str, w3: Web3) -> bool:
     """
     Check if USDC is approved for spending by Polymarket
     """
-    # USDC contract ABI (for balanceOf and allowance functions)
-    usdc_abi = json.loads('''[
-        {
-            "constant": true,
-            "inputs": [{"name": "account", "type": "address"}],
-            "name": "balanceOf",
-            "outputs": [{"name": "", "type": "uint256"}],
-            "payable": false,
-            "stateMutability": "view",
-            "type": "function"
-        },
-        {
-            "constant": true,
-            "inputs": [
-                {"name": "owner", "type": "address"},
-                {"name": "spender", "type": "address"}
-            ],
-            "name": "allowance",
-            "outputs": [{"name": "", "type": "uint256"}],
-            "payable": false,
-            "stateMutability": "view",
-            "type": "function"
-        }
-    ]''')
-    
-    # Create contract instance
-    usdc_contract = w3.eth.contract(address=USDC_CONTRACT, abi=usdc_abi)
-    
-    # Check USDC balance
-    balance = usdc_contract.functions.balanceOf(wallet_address).call()
+    # Balance and allowance in one Multicall3 eth_call, read at the same block
+    reads = read_balance_and_allowance(web3_transport(w3), USDC_CONTRACT, wallet_address, POLYMARKET_EXCHANGE)
+    balance, current_allowance = reads.values
     balance_usdc = balance / 10**6  # USDC has 6 decimals
     
     print(f"USDC balance: {balance_usdc} USDC")
@@ -91,11 +80,6 @@ def check_usdc_approval(wallet_address: str, w3: Web3) -> bool:
         print("Insufficient USDC balance (need at least 1 USDC)")
         return False
     
-    # Check current allowance
-    current_allowance = usdc_contract.functions.allowance(
-        wallet_address, 
-        POLYMARKET_EXCHANGE
-    ).call()
     current_allowance_usdc = current_allowance / 10**6
     
     print(f"Current Polymarket allowance: {current_allowance_usdc} USDC")
@@ -109,7 +93,8 @@ def place_market_order(
     size: float, 
     wallet_address: str, 
     private_key: str,
-    w3: Web3
+    w3: Web3,
+    wait: bool = True
 ) -> Optional[str]:
     """
     Place a market order on Polymarket
@@ -121,6 +106,8 @@ def place_market_order(
         wallet_address: The wallet address
         private_key: The private key for signing
         w3: Web3 instance
+        wait: Wait for the settlement transaction to confirm; when False the
+            hash is returned once sent and settlement_tracker reports the outcome
         
     Returns:
         Optional transaction hash if successful
@@ -142,11 +129,10 @@ def place_market_order(
         
         headers = {
             "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": "Mozilla/5.0"
+            "Accept": "application/json"
         }
         
-        response = requests.post(signature_url, headers=headers, json=order)
+        response = http_client.post(signature_url, headers=headers, json=order)
         
         if response.status_code != 200:
             print(f"Failed to get order signature: {response.status_code}")
@@ -180,7 +166,7 @@ def place_market_order(
         # Step 4: Submit the order
         order_url = f"{CLOB_API_URL}/orders"
         
-        order_response = requests.post(order_url, headers=headers, json=signed_order)
+        order_response = http_client.post(order_url, headers=headers, json=signed_order)
         
         if order_response.status_code != 200:
             print(f"Failed to place order: {order_response.status_code}")
@@ -199,28 +185,38 @@ def place_market_order(
                 'to': tx_data.get("to"),
                 'data': tx_data.get("data"),
                 'value': w3.to_wei(0, 'ether'),  # No ETH value
-                'gas': 500000,  # Gas limit
-                'gasPrice': w3.to_wei('50', 'gwei'),
-                'nonce': w3.eth.get_transaction_count(wallet_address),
             }
             
-            # Sign and send transaction
-            signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # Gas limit from an estimate plus margin, fees to be included within GAS_TARGET_BLOCKS
+            tx, gas_estimate, fee_quote = gas_oracle.fill_transaction(tx)
+            print(gas_oracle.describe(fee_quote, gas_estimate))
+            
+            # Sign and send transaction; the nonce comes from the wallet's local counter
+            tx_hash = nonce_manager_for(w3, wallet_address).send_transaction(tx, private_key)
+            gas_oracle.report.record(tx_hash, gas_estimate, fee_quote)
             
             print(f"Settlement transaction sent! Hash: {tx_hash.hex()}")
             print(f"View on PolygonScan: https://polygonscan.com/tx/{tx_hash.hex()}")
             
+            if not wait:
+                # Keep going; the tracker reports the outcome when it settles
+                settlement_tracker.track(tx_hash, callback=report_settlement)
+                return tx_hash.hex()
+            
             # Wait for transaction to be mined
             print("Waiting for transaction to be confirmed...")
-            tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            outcome = settlement_tracker.track(tx_hash).result()
+            gas_oracle.report.observe(outcome)
             
-            if tx_receipt['status'] == 1:
+            if outcome.status == "confirmed":
                 print("✅ Transaction confirmed!")
                 return tx_hash.hex()
-            else:
+            elif outcome.status == "failed":
                 print("❌ Transaction failed. Please check PolygonScan for details.")
                 return None
+            else:
+                print_outcome(outcome)
+                return None
         else:
             print("Order placed successfully!")
             return "success"
@@ -259,12 +255,13 @@ def find_best_market() -> Tuple[Optional[Dict[str, Any]], Optional[str], Optiona
         print(f"Found {len(nba_markets)} NBA markets")
         filtered_markets = nba_markets
     
-    # Find the market with the most liquid order book
-    best_market = None
-    best_liquidity = 0
-    best_outcome = None
-    best_token_id = None
+    # Fetch every candidate token's order book in a few bulk requests
+    all_token_ids = [token_id for market in filtered_markets for token_id in parse_token_ids(market)]
+    books = get_order_books(all_token_ids)
     
+    # Gather every (market, outcome, token) that has an order book
+    candidates = []
+    candidate_books = []
     for market in filtered_markets:
         token_ids = parse_token_ids(market)
         outcomes = parse_outcomes(market)
@@ -272,45 +269,32 @@ def find_best_market() -> Tuple[Optional[Dict[str, Any]], Optional[str], Optiona
         if not token_ids or not outcomes or len(token_ids) != len(outcomes):
             continue
         
-        for i, token_id in enumerate(token_ids):
-            order_book = get_order_book(token_id)
-            
-            if not order_book:
-                continue
-                
-            # Check for bids and asks
-            bids = order_book.get("bids", [])
-            asks = order_book.get("asks", [])
-            
-            if not bids or not asks:
-                continue
-            
-            # Calculate liquidity score based on depth and tightness of spread
-            try:
-                best_bid = float(bids[0]["price"])
-                best_ask = float(asks[0]["price"])
-                
-                # Calculate bid-ask spread
-                spread = best_ask - best_bid
-                
-                # Calculate total volume in order book (up to 3 levels)
-                bid_volume = sum(float(bid["size"]) for bid in bids[:3])
-                ask_volume = sum(float(ask["size"]) for ask in asks[:3])
-                
-                # Liquidity score: higher volume and tighter spread = better
-                if spread > 0:
-                    liquidity_score = (bid_volume + ask_volume) / spread
-                else:
-                    liquidity_score = 0
-                
-                # Update best market if this one has better liquidity
-                if liquidity_score > best_liquidity:
-                    best_liquidity = liquidity_score
-                    best_market = market
-                    best_outcome = outcomes[i]
-                    best_token_id = token_id
-            except (IndexError, ValueError, KeyError):
-                continue
+        for outcome, token_id in zip(outcomes, token_ids):
+            order_book = books.get(token_id)
+            if order_book is not None:
+                candidates.append((market, outcome, token_id))
+                candidate_books.append(order_book)
+    
+    # Score every book at once: higher top-3 depth and tighter spread = better
+    # Books without both bids and asks, or with no spread, score 0
+    scores = liquidity_scores(candidate_books, depth=3)
+    top = top_candidates(scores, 5)
+    
+    best_market = None
+    best_liquidity = 0
+    best_outcome = None
+    best_token_id = None
+    
+    if len(top) > 0 and scores[top[0]] > 0:
+        print("Top candidates by liquidity score:")
+        for rank, index in enumerate(top, 1):
+            if scores[index] <= 0:
+                break
+            market, outcome, _ = candidates[index]
+            print(f"  {rank}. {market.get('question')} [{outcome}] - {scores[index]:.2f}")
+        
+        best_market, best_outcome, best_token_id = candidates[top[0]]
+        best_liquidity = float(scores[top[0]])
     
     if best_market:
         print(f"Best market found: {best_market.get('question')}")
@@ -340,8 +324,8 @@ def place_bet_on_best_market(wallet_address: str, private_key: str, w3: Web3) ->
     print(f"MARKET: {market_question}")
     print("=" * 70)
     
-    # Place the order
-    tx_hash = place_market_order(token_id, "buy", BET_AMOUNT, wallet_address, private_key, w3)
+    # Place the order; its settlement confirms in the background
+    tx_hash = place_market_order(token_id, "buy", BET_AMOUNT, wallet_address, private_key, w3, wait=False)
     
     if tx_hash:
         print("\n" + "=" * 70)
@@ -350,7 +334,7 @@ def place_bet_on_best_market(wallet_address: str, private_key: str, w3: Web3) ->
         print(f"Market: {market_question}")
         print(f"Outcome: {outcome}")
         if tx_hash != "success":
-            print(f"Transaction: https://polygonscan.com/tx/{tx_hash}")
+            print(f"Transaction: https://polygonscan.com/tx/{tx_hash} (confirming)")
         print("=" * 70)
     else:
         print("\n" + "=" * 70)
@@ -377,6 +361,13 @@ def main() -> None:
         # Step 3: Place bet on best market
         place_bet_on_best_market(wallet_address, private_key, w3)
         
+        # Step 4: Report settlements still confirming, then gas use against the estimates
+        if settlement_tracker.pending_count:
+            print(f"\nWaiting for {settlement_tracker.pending_count} settlement(s) to confirm...")
+            for outcome in settlement_tracker.wait_all():
+                gas_oracle.report.observe(outcome)
+        print(gas_oracle.report.summary())
+        
     except Exception as e:
         print(f"Error: {str(e)}")
         
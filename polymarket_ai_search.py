@@ -3,12 +3,15 @@ import openai
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from llm_cache import ResponseCache, make_backend, cache_flag, print_cache_status
+from llm_batch import run_batch, batch_queries, LLM_CONCURRENCY
 
 # Load environment variables
 load_dotenv()
 
 # Set OpenAI API key
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+response_cache = ResponseCache(client, make_backend())
 
 def search_polymarket_markets():
     """
@@ -18,7 +21,7 @@ def search_polymarket_markets():
         print("Searching for current Polymarket markets...")
         
         # Create a response with web search enabled
-        response = client.responses.create(
+        response, cached = response_cache.create(
             model="gpt-4.1",
             tools=[{
                 "type": "web_search_preview",
@@ -44,6 +47,7 @@ def search_polymarket_markets():
             
             Format as a numbered list with clear categories."""
         )
+        print_cache_status("Market search", cached)
         
         # Extract and display the results
         print(f"\nPOLYMARKET ACTIVE MARKETS ({datetime.now().strftime('%Y-%m-%d %H:%M')})")
@@ -83,20 +87,17 @@ def search_polymarket_markets():
         print("2. Ensure you have access to GPT-4.1 and web search")
         print("3. Check your OpenAI usage limits")
 
-def search_specific_market(query):
+def specific_market_request(query):
     """
-    Search for a specific type of market or question
+    Build the responses.create arguments for a specific market search
     """
-    try:
-        print(f"Searching for specific market: {query}")
-        
-        response = client.responses.create(
-            model="gpt-4.1",
-            tools=[{
-                "type": "web_search_preview",
-                "search_context_size": "high"  # More context for specific searches
-            }],
-            input=f"""Search Polymarket.com for prediction markets related to: {query}
+    return {
+        "model": "gpt-4.1",
+        "tools": [{
+            "type": "web_search_preview",
+            "search_context_size": "high"  # More context for specific searches
+        }],
+        "input": f"""Search Polymarket.com for prediction markets related to: {query}
             
             Provide detailed information including:
             - Current odds/prices
@@ -104,28 +105,68 @@ def search_specific_market(query):
             - End dates
             - Recent price movements
             - Any relevant news affecting the market"""
-        )
+    }
+
+def print_specific_results(query, response):
+    """
+    Print the text of a specific market search response
+    """
+    print(f"\nSPECIFIC MARKET SEARCH: {query}")
+    print("=" * 70)
+    
+    for item in response.output:
+        if item.type == "message":
+            for content in item.content:
+                if content.type == "output_text":
+                    print(content.text)
+
+def search_specific_market(query):
+    """
+    Search for a specific type of market or question
+    """
+    try:
+        print(f"Searching for specific market: {query}")
         
-        print(f"\nSPECIFIC MARKET SEARCH: {query}")
-        print("=" * 70)
+        response, cached = response_cache.create(**specific_market_request(query))
+        print_cache_status(f"Search for {query}", cached)
         
-        for item in response.output:
-            if item.type == "message":
-                for content in item.content:
-                    if content.type == "output_text":
-                        print(content.text)
+        print_specific_results(query, response)
         
     except Exception as e:
         print(f"❌ Error searching for specific market: {str(e)}")
 
+def search_specific_markets_batch(queries):
+    """
+    Run several specific market searches concurrently, printing each as soon as it completes
+    """
+    print(f"Searching for {len(queries)} markets, up to {LLM_CONCURRENCY} at a time...")
+    
+    def on_result(query, response, cached, error):
+        if error is not None:
+            print(f"❌ Error searching for specific market {query}: {str(error)}")
+            return
+        print_cache_status(f"Search for {query}", cached)
+        print_specific_results(query, response)
+    
+    requests = [(query, specific_market_request(query)) for query in queries]
+    run_batch(requests, on_result, cache=response_cache)
+
 if __name__ == "__main__":
     # Check for command line arguments for specific searches
     import sys
     
-    if len(sys.argv) > 1:
+    # --no-cache always calls OpenAI; --memory-cache keeps responses for this run only
+    response_cache.backend = cache_flag(sys.argv)
+    
+    # --batch "bitcoin price, fed rates" runs every search concurrently
+    queries = batch_queries(sys.argv[1:])
+    
+    if queries is not None:
+        search_specific_markets_batch(queries)
+    elif len(sys.argv) > 1:
         # Search for specific market
         search_query = " ".join(sys.argv[1:])
         search_specific_market(search_query)
     else:
         # General market search
-        search_polymarket_markets() 
\ No newline at end of file
+        search_polymarket_markets()
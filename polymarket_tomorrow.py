@@ -2,6 +2,31 @@
 import openai
 from datetime import datetime, timedelta
 import os
+import sys
+
+if "--local" in sys.argv:
+    # List tomorrow's markets from the local market store instead of asking the model
+    from end_date_index import load_local_index
+    from market_parsing import parse_outcomes, parse_outcome_prices
+    
+    tomorrow_start = (datetime.now() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow_end = tomorrow_start + timedelta(days=1)
+    
+    index = load_local_index(closed=False)
+    local_markets = index.ending_between(tomorrow_start.timestamp(), tomorrow_end.timestamp())
+    
+    print(f"POLYMARKET MARKETS ENDING TOMORROW ({tomorrow_start.strftime('%Y-%m-%d')})")
+    print("=" * 80)
+    for i, market in enumerate(local_markets, 1):
+        odds = ", ".join(
+            f"{outcome}: {price}"
+            for outcome, price in zip(parse_outcomes(market), parse_outcome_prices(market))
+        )
+        print(f"{i}. {market.get('question', 'Unknown')}")
+        print(f"   End Date: {market.get('endDate', 'Unknown')}")
+        print(f"   Odds: {odds or 'N/A'}")
+    print(f"\nFound {len(local_markets)} markets ending tomorrow")
+    sys.exit(0)
 
 # Initialize OpenAI client
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -1,24 +1,65 @@
 #!/usr/bin/env python3
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 import os
 import datetime
+import time
+from collections import namedtuple
 from generate_html import generate_html
 from fetch_polymarket_data import fetch_polymarket_data
+from content_cache import content_cache
+from data_cache import PeriodicRefresher
+from http_caching import init_http_caching, body_etag
+
+PAGE_REFRESH_INTERVAL = float(os.getenv("PAGE_REFRESH_INTERVAL", "600"))  # Seconds between rebuilds
 
 app = Flask(__name__)
+init_http_caching(app)
+
+# One refresh's output, pre-rendered so requests only hand out bytes
+PrebuiltPage = namedtuple("PrebuiltPage", ["html", "data_json", "html_etag", "data_etag", "built_at"])
+
+def build_page() -> PrebuiltPage:
+    """Fetch the dataset once and render both the page and its JSON"""
+    data = fetch_polymarket_data()
+    html = generate_html(data)
+    html = html.encode("utf-8")
+    data_json = (app.json.dumps(data) + "\n").encode("utf-8")
+    return PrebuiltPage(html, data_json, body_etag(html), body_etag(data_json), time.time())
+
+page_refresher = PeriodicRefresher(build_page, interval=PAGE_REFRESH_INTERVAL, name="Polymarket page")
+
+def latest_page():
+    """The latest prebuilt page, or a 503 response while the first build runs"""
+    page_refresher.start()
+    page = page_refresher.latest()
+    if page is None:
+        loading = Response("Market data is loading, please retry shortly.", status=503, mimetype="text/plain")
+        loading.headers["Retry-After"] = "5"
+        return None, loading
+    return page, None
+
+def prebuilt_response(body: bytes, mimetype: str, etag: str, built_at: float) -> Response:
+    """Response for a prebuilt artifact with its precomputed validators"""
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag, weak=True)
+    response.last_modified = built_at
+    return response
 
 @app.route('/')
 def home():
-    """Generate and serve the real-time Polymarket data HTML page"""
-    # Generate the HTML with real data
-    html_content = generate_html()
-    return html_content
+    """Serve the latest pre-rendered Polymarket data HTML page"""
+    page, loading = latest_page()
+    if page is None:
+        return loading
+    return prebuilt_response(page.html, "text/html", page.html_etag, page.built_at)
 
 @app.route('/data')
 def data():
     """API endpoint to get the raw data as JSON"""
-    data = fetch_polymarket_data()
-    return jsonify(data)
+    page, loading = latest_page()
+    if page is None:
+        return loading
+    return prebuilt_response(page.data_json, "application/json", page.data_etag, page.built_at)
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -40,4 +81,9 @@ if __name__ == "__main__":
     # Use a different port to avoid conflicts
     port = 5001
     print(f"Starting server on http://127.0.0.1:{port}")
+    
+    # Build in the serving process only, not in the debug reloader's watcher
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        print(f"Loaded {content_cache.warm()} cached Exa/Firecrawl responses")
+        page_refresher.start()
     app.run(debug=True, port=port) 
\ No newline at end of file
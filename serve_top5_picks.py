@@ -1,18 +1,25 @@
 #!/usr/bin/env python3
-from flask import Flask, render_template, jsonify, request
-import os
+from flask import Flask, render_template, jsonify, request, Response
 from datetime import datetime
+from http_caching import init_http_caching, FileCache
 
 app = Flask(__name__)
+init_http_caching(app)
+
+# top5_picks.html is kept in memory and re-read only when the file changes
+page_files = FileCache()
 
 @app.route('/')
 def home():
     """Serve the Top 5 Picks HTML page"""
     # Check if the file exists
-    if os.path.exists("top5_picks.html"):
-        with open("top5_picks.html", "r") as f:
-            html_content = f.read()
-        return html_content
+    cached = page_files.get("top5_picks.html")
+    if cached is not None:
+        html_content, modified, etag = cached
+        response = Response(html_content, mimetype="text/html")
+        response.set_etag(etag, weak=True)
+        response.last_modified = modified
+        return response
     else:
         return "Error: top5_picks.html file not found"
 
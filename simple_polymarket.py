@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import datetime
 
 def get_polymarket_markets():
@@ -22,7 +22,7 @@ def get_polymarket_markets():
             "start_date_min": min_date  # Only get current markets
         }
         
-        resp = requests.get(endpoint, params=params, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(endpoint, params=params)
         if resp.status_code != 200:
             print(f"Failed with status code: {resp.status_code}")
             continue
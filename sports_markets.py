@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import datetime
+import time
 from typing import List, Dict, Any, Optional, Union
+from market_parsing import parse_outcomes, parse_outcome_prices, ingest_market
+from market_store import load_local_markets
 
-def get_sports_markets():
+def fetch_sports_markets():
+    """Fetch today's active markets from the Gamma API"""
     url = "https://gamma-api.polymarket.com/markets"
     
     # Current date for filtering
@@ -18,15 +22,26 @@ def get_sports_markets():
     }
     
     # Make request
-    resp = requests.get(url, params=params, headers={"User-Agent": "Mozilla/5.0"})
+    resp = http_client.get(url, params=params)
     if resp.status_code != 200:
         print(f"API request failed with status code: {resp.status_code}")
-        return []
+        return None
         
     markets = resp.json()
     if not isinstance(markets, list):
         print(f"Unexpected response format: {type(markets)}")
-        return []
+        return None
+    
+    return markets
+
+def get_sports_markets(local=False):
+    if local:
+        # Query the local market store for markets that have not ended yet
+        markets = load_local_markets(active=True, closed=False, end_after=time.time())
+    else:
+        markets = fetch_sports_markets()
+        if markets is None:
+            return []
     
     # Group markets by type
     nba_markets = []
@@ -36,14 +51,8 @@ def get_sports_markets():
     for market in markets:
         question = market.get('question', '').lower()
         
-        # Parse outcomes
-        outcomes = market.get('outcomes', [])
-        if isinstance(outcomes, str):
-            try:
-                import ast
-                outcomes = ast.literal_eval(outcomes)
-            except:
-                outcomes = [outcomes]
+        # Parse list fields once so display reuses the cached values
+        ingest_market(market)
         
         # Identify market type
         if any(team in question for team in ['mavericks', 'nets', 'lakers', 'celtics', 'knicks', 'over ']):
@@ -87,8 +96,8 @@ def display_markets(markets_by_type):
             print(f"End Date: {end_date}")
             
             # Show outcomes and probabilities
-            outcomes = market.get('outcomes', [])
-            prices = market.get('outcomePrices', [])
+            outcomes = parse_outcomes(market)
+            prices = parse_outcome_prices(market)
             
             if outcomes and prices and len(outcomes) == len(prices):
                 for i, (outcome, price) in enumerate(zip(outcomes, prices)):
@@ -127,7 +136,8 @@ def display_markets(markets_by_type):
         print("\nNo other sports markets found")
 
 def main():
-    markets_by_type = get_sports_markets()
+    import sys
+    markets_by_type = get_sports_markets(local="--local" in sys.argv)
     
     total_markets = len(markets_by_type['nba']) + len(markets_by_type['nfl']) + len(markets_by_type['other'])
     if total_markets == 0:
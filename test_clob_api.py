@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import requests
+import http_client
 import json
 from typing import Dict, Any, Optional
 
@@ -25,8 +25,7 @@ def test_clob_endpoints():
     ]
     
     headers = {
-        "Accept": "application/json",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        "Accept": "application/json"
     }
     
     print("\n1. Testing CLOB API Base Endpoints:")
@@ -37,7 +36,7 @@ def test_clob_endpoints():
             url = f"{base_url}{endpoint}"
             print(f"Testing: {url}")
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             print(f"  Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -62,7 +61,7 @@ def test_clob_endpoints():
         gamma_url = "https://gamma-api.polymarket.com/markets"
         params = {"limit": 5, "active": True}
         
-        response = requests.get(gamma_url, params=params, headers=headers)
+        response = http_client.get(gamma_url, params=params, headers=headers)
         
         if response.status_code == 200:
             markets = response.json()
@@ -114,14 +113,13 @@ def test_order_book_for_token(token_id: str):
     ]
     
     headers = {
-        "Accept": "application/json",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        "Accept": "application/json"
     }
     
     for url in endpoints_to_test:
         try:
             print(f"  Trying: {url}")
-            response = requests.get(url, headers=headers, timeout=5)
+            response = http_client.get(url, headers=headers, timeout=5)
             print(f"    Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -154,14 +152,13 @@ def test_polymarket_web_api():
     ]
     
     headers = {
-        "Accept": "application/json",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        "Accept": "application/json"
     }
     
     for url in web_endpoints:
         try:
             print(f"Testing: {url}")
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             print(f"  Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Union
+from hexbytes import HexBytes
+from web3 import Web3
+import json_rpc
+from json_rpc import RpcCall, POLYGON_RPC_URL
+
+POLL_INTERVAL = 2.0  # Seconds between receipt polls; about one Polygon block
+CONFIRM_TIMEOUT = 180  # Seconds before a transaction is reported as timed out
+MAX_RECEIPTS_PER_BATCH = 100  # Receipt lookups per JSON-RPC batch request
+RECEIPT_QUANTITIES = ("blockNumber", "status", "gasUsed", "cumulativeGasUsed", "effectiveGasPrice", "nonce")
+
+# Final state of a tracked transaction: status is "confirmed", "failed" or "timeout"
+TxOutcome = namedtuple("TxOutcome", ["tx_hash", "status", "receipt", "elapsed"])
+
+# JSON-RPC batch transport: calls -> result or JsonRpcError per call
+BatchTransport = Callable[[List[RpcCall]], List[Any]]
+
+def rpc_batch(url: str = POLYGON_RPC_URL) -> BatchTransport:
+    """Batch transport over the shared JSON-RPC client"""
+    return lambda calls: json_rpc.batch_call(calls, url)
+
+def _decode_receipt(receipt: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn the hex quantities of a raw receipt into ints"""
+    return {
+        key: int(value, 16) if key in RECEIPT_QUANTITIES and isinstance(value, str) else value
+        for key, value in receipt.items()
+    }
+
+class _Pending:
+    __slots__ = ("future", "started", "deadline")
+
+    def __init__(self, future: Future, timeout: float):
+        self.future = future
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout
+
+class TxTracker:
+    """
+    Watch submitted transactions without blocking the caller
+
+    ``track`` returns a Future straight away. A background thread polls the
+    receipts of every pending transaction in one JSON-RPC batch per
+    interval, and resolves each Future with a TxOutcome once its receipt
+    arrives (confirmed or failed) or its timeout passes. Callbacks run on
+    the tracker thread, so they should be quick.
+    """
+
+    def __init__(
+        self,
+        batch: Optional[BatchTransport] = None,
+        poll_interval: float = POLL_INTERVAL,
+        timeout: float = CONFIRM_TIMEOUT
+    ):
+        self.batch = batch or rpc_batch()
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.polls = 0
+
+        self._pending: Dict[str, _Pending] = {}
+        self._wake = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @property
+    def pending_count(self) -> int:
+        with self._wake:
+            return len(self._pending)
+
+    def track(
+        self,
+        tx_hash: Union[str, bytes],
+        callback: Optional[Callable[[TxOutcome], None]] = None,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Start watching a transaction
+
+        Args:
+            tx_hash: Hash returned by send_raw_transaction
+            callback: Called with the TxOutcome when the transaction settles or times out
+            timeout: Seconds to wait before giving up (defaults to the tracker's)
+
+        Returns:
+            Future resolving to the TxOutcome
+        """
+        tx_hash = Web3.to_hex(HexBytes(tx_hash)).lower()
+        with self._wake:
+            entry = self._pending.get(tx_hash)
+            if entry is None:
+                entry = self._pending[tx_hash] = _Pending(Future(), self.timeout if timeout is None else timeout)
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="tx-tracker", daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+        if callback is not None:
+            entry.future.add_done_callback(lambda future: callback(future.result()))
+        return entry.future
+
+    def wait_all(self, timeout: Optional[float] = None) -> List[TxOutcome]:
+        """Block until every transaction tracked so far has settled or timed out"""
+        with self._wake:
+            futures = [entry.future for entry in self._pending.values()]
+        return [future.result(timeout) for future in futures]
+
+    def stop(self) -> None:
+        with self._wake:
+            self._stopped = True
+            self._wake.notify()
+
+    def poll(self) -> int:
+        """
+        Look up every pending receipt once and resolve the settled transactions
+
+        Returns:
+            Number of transactions resolved
+        """
+        with self._wake:
+            pending = dict(self._pending)
+        if not pending:
+            return 0
+
+        hashes = list(pending)
+        results: List[Any] = []
+        try:
+            for start in range(0, len(hashes), MAX_RECEIPTS_PER_BATCH):
+                chunk = hashes[start:start + MAX_RECEIPTS_PER_BATCH]
+                results.extend(self.batch([("eth_getTransactionReceipt", [tx_hash]) for tx_hash in chunk]))
+        except Exception as e:
+            # Keep everything pending and try again next interval (timeouts still apply)
+            print(f"Receipt poll failed: {e}")
+        self.polls += 1
+
+        now = time.monotonic()
+        resolved = 0
+        for index, tx_hash in enumerate(hashes):
+            entry = pending[tx_hash]
+            receipt = results[index] if index < len(results) else None
+            if isinstance(receipt, Exception):
+                receipt = None
+
+            if receipt is not None:
+                receipt = _decode_receipt(receipt)
+                status = "confirmed" if receipt.get("status") == 1 else "failed"
+            elif now >= entry.deadline:
+                status = "timeout"
+            else:
+                continue
+
+            with self._wake:
+                self._pending.pop(tx_hash, None)
+            entry.future.set_result(TxOutcome(tx_hash, status, receipt, now - entry.started))
+            resolved += 1
+
+        return resolved
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                while not self._pending and not self._stopped:
+                    self._wake.wait()
+                if self._stopped:
+                    self._thread = None
+                    return
+
+            self.poll()
+
+            with self._wake:
+                if self._pending and not self._stopped:
+                    self._wake.wait(self.poll_interval)
+
+def print_outcome(outcome: TxOutcome) -> None:
+    """Report a settled transaction the way the trading scripts do"""
+    if outcome.status == "confirmed":
+        print(f"✅ Transaction {outcome.tx_hash} confirmed in block {outcome.receipt['blockNumber']} "
+              f"after {outcome.elapsed:.1f}s")
+    elif outcome.status == "failed":
+        print(f"❌ Transaction {outcome.tx_hash} failed. Please check PolygonScan for details.")
+    else:
+        print(f"⌛ Transaction {outcome.tx_hash} not confirmed after {outcome.elapsed:.0f}s; "
+              f"check https://polygonscan.com/tx/{outcome.tx_hash}")
+
+def check_against_local_chain(count: int = 100) -> bool:
+    """
+    Track many transactions against a LocalChain, offline
+
+    All but one are mined over a few blocks while the caller keeps working;
+    the unmined one (its nonce leaves a gap) must time out.
+    """
+    from eth_account import Account
+    from local_chain import LocalChain, LOCAL_CHAIN_ID
+
+    chain = LocalChain()
+    account = Account.create()
+    tracker = TxTracker(chain.batch, poll_interval=0.05, timeout=3.0)
+
+    def send(nonce: int) -> str:
+        tx = {"to": account.address, "value": 0, "gas": 21_000, "gasPrice": 50 * 10**9, "nonce": nonce, "chainId": LOCAL_CHAIN_ID}
+        return chain.send_raw_transaction(Account.sign_transaction(tx, account.key).raw_transaction)
+
+    outcomes: List[TxOutcome] = []
+    futures = [tracker.track(send(nonce), callback=outcomes.append) for nonce in range(count)]
+    stuck = tracker.track(send(count + 1))
+
+    # The caller is free while transactions confirm in the background
+    for _ in range(5):
+        time.sleep(0.1)
+        chain.mine()
+
+    results = [future.result(5) for future in futures]
+    stuck_outcome = stuck.result(5)
+    tracker.stop()
+
+    ok = (
+        all(outcome.status == "confirmed" for outcome in results)
+        and stuck_outcome.status == "timeout"
+        and len(outcomes) == count
+    )
+    print(f"Tracked {count + 1} transactions with {tracker.polls} batched receipt polls; "
+          f"{sum(outcome.status == 'confirmed' for outcome in results)} confirmed, stuck one: {stuck_outcome.status}")
+    print("Tracker outcomes are correct" if ok else "Tracker outcomes are WRONG")
+    return ok
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if check_against_local_chain() else 1)
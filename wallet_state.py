@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+from collections import namedtuple
+from typing import Dict, List, Optional
+import json_rpc
+from json_rpc import JsonRpcError, POLYGON_RPC_URL
+
+POLYMARKET_EXCHANGE = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
+USDC_DECIMALS = 6
+MATIC_DECIMALS = 18
+
+# USDC contract addresses on Polygon that we track
+USDC_CONTRACTS = {
+    "USDC (PoS)": "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",  # Most common
+    "USDC.e (Bridged)": "0xA0b86a33E6441c8C4D86Fc4DebFd8B4cE3d80b7B",  # Bridged from Ethereum
+    "Native USDC": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"   # Native Circle USDC
+}
+
+# Balance and allowance of one token; None where the call failed
+TokenState = namedtuple("TokenState", ["name", "contract", "balance", "allowance"])
+
+# Everything a wallet check needs, read in one round trip
+WalletSnapshot = namedtuple("WalletSnapshot", ["address", "block_number", "matic", "tokens", "errors"])
+
+def read_wallet_state(
+    wallet_address: str,
+    tokens: Optional[Dict[str, str]] = None,
+    spender: str = POLYMARKET_EXCHANGE,
+    rpc_url: str = POLYGON_RPC_URL
+) -> WalletSnapshot:
+    """
+    Read MATIC, and each token's balance and allowance, in one JSON-RPC batch
+
+    Amounts are in whole units (USDC with 6 decimals, MATIC with 18). A call
+    that fails leaves its field as None and adds a message to ``errors``
+    instead of failing the whole snapshot.
+
+    Args:
+        wallet_address: Wallet to check
+        tokens: Dict of name -> USDC-style token contract (defaults to USDC_CONTRACTS)
+        spender: Contract whose allowance is read (the Polymarket exchange)
+        rpc_url: Polygon JSON-RPC endpoint
+
+    Returns:
+        WalletSnapshot with one TokenState per token, in the given order
+    """
+    tokens = USDC_CONTRACTS if tokens is None else tokens
+
+    # Step 1: Build every call: block number, MATIC, then balance + allowance per token
+    calls = [("eth_blockNumber", []), ("eth_getBalance", [wallet_address, "latest"])]
+    for contract in tokens.values():
+        calls.append(json_rpc.balance_of(contract, wallet_address))
+        calls.append(json_rpc.allowance(contract, wallet_address, spender))
+
+    # Step 2: One round trip
+    results = json_rpc.batch_call(calls, rpc_url)
+
+    # Step 3: Decode everything together
+    errors: List[str] = []
+
+    def decode(result, label: str, decimals: int) -> Optional[float]:
+        if isinstance(result, JsonRpcError):
+            errors.append(f"{label}: {result}")
+            return None
+        return json_rpc.decode_uint(result) / 10**decimals
+
+    block_number = None if isinstance(results[0], JsonRpcError) else json_rpc.decode_uint(results[0])
+    matic = decode(results[1], "MATIC balance", MATIC_DECIMALS)
+
+    states = []
+    for index, (name, contract) in enumerate(tokens.items()):
+        balance_result, allowance_result = results[2 + 2 * index], results[3 + 2 * index]
+        states.append(TokenState(
+            name,
+            contract,
+            decode(balance_result, f"{name} balance", USDC_DECIMALS),
+            decode(allowance_result, f"{name} allowance", USDC_DECIMALS)
+        ))
+
+    return WalletSnapshot(wallet_address, block_number, matic, states, errors)